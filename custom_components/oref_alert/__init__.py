@@ -55,16 +55,22 @@ from .const import (
     ADD_AREAS,
     ADD_SENSOR_ACTION,
     AREAS_STATUS_ACTION,
+    CAPTURE_ACTION,
     CATEGORY_FIELD,
+    CHANNELS_RACE_ACTION,
     CONF_AREA,
     CONF_AREAS,
     CONF_DURATION,
+    CONF_ENTRIES,
+    CONF_REFRESHES,
+    CONF_SAVE,
     CONF_SENSORS,
     DOMAIN,
     EDIT_SENSOR_ACTION,
     LAST_UPDATE_ACTION,
     LOGGER,
     MANUAL_EVENT_END_ACTION,
+    PROFILE_ACTION,
     REMOVE_AREAS,
     REMOVE_SENSOR_ACTION,
     SYNTHETIC_ALERT_ACTION,
@@ -75,6 +81,7 @@ from .const import (
 )
 from .coordinator import OrefAlertDataUpdateCoordinator
 from .metadata.areas import AREAS
+from .profiler import PROFILE_TOP_ENTRIES
 
 CONFIG_SCHEMA: Final = cv.config_entry_only_config_schema(DOMAIN)
 
@@ -144,6 +151,29 @@ MANUAL_EVENT_END_SCHEMA: Final = vol.Schema(
 
 AREAS_STATUS_SCHEMA: Final = vol.Schema({}, extra=vol.ALLOW_EXTRA)
 
+CAPTURE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(CONF_DURATION, default=60): vol.All(
+            cv.positive_int, vol.Range(max=3600)
+        ),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+PROFILE_SCHEMA: Final = vol.Schema(
+    {
+        vol.Required(CONF_DURATION, default=30): vol.All(
+            cv.positive_int, vol.Range(max=600)
+        ),
+        vol.Optional(CONF_REFRESHES): cv.positive_int,
+        vol.Required(CONF_ENTRIES, default=PROFILE_TOP_ENTRIES): vol.All(
+            cv.positive_int, vol.Range(max=200)
+        ),
+        vol.Required(CONF_SAVE, default=False): cv.boolean,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 @dataclass
 class OrefAlertRuntimeData:
@@ -335,6 +365,55 @@ async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:  # noqa
         MANUAL_EVENT_END_SCHEMA,
     )
 
+    async def capture(service_call: ServiceCall) -> ServiceResponse:
+        """Capture the channels' traffic (for replaying it)."""
+        path = get_config_entry(hass).runtime_data.coordinator.start_capture(
+            service_call.data[CONF_DURATION]
+        )
+        return {"path": str(path)}
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        CAPTURE_ACTION,
+        capture,
+        CAPTURE_SCHEMA,
+        SupportsResponse.OPTIONAL,
+    )
+
+    async def channels_race(_: ServiceCall) -> ServiceResponse:
+        """Return which channels delivered the alerts first, and the others' lag."""
+        try:
+            return get_config_entry(hass).runtime_data.coordinator.race.as_dict()
+        except IntegrationError:
+            return {}
+
+    hass.services.async_register(
+        DOMAIN,
+        CHANNELS_RACE_ACTION,
+        channels_race,
+        schema=AREAS_STATUS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def profile(service_call: ServiceCall) -> ServiceResponse:
+        """Profile the refresh pipeline, and return the top entries."""
+        return await get_config_entry(hass).runtime_data.coordinator.async_profile(
+            service_call.data[CONF_DURATION],
+            service_call.data.get(CONF_REFRESHES),
+            entries=service_call.data[CONF_ENTRIES],
+            save=service_call.data[CONF_SAVE],
+        )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        PROFILE_ACTION,
+        profile,
+        PROFILE_SCHEMA,
+        SupportsResponse.ONLY,
+    )
+
     return True
 
 
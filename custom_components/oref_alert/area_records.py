@@ -0,0 +1,315 @@
+"""Area to record mapping with incrementally maintained secondary indexes."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from bisect import bisect_left, insort
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime
+from typing import TYPE_CHECKING, Final
+
+from .const import IST
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from .const import Record, RecordAndMetadata, RecordType
+
+type _IndexEntry = tuple[int, str, int, RecordAndMetadata]
+
+BUCKET_SIZE: Final = 32
+
+
+class AreaRecordsSnapshot(Mapping[str, "RecordAndMetadata"]):
+    """
+    Immutable snapshot of the area records.
+
+    Snapshots share the buckets (and the type indexes) which were not modified
+    in between, so taking a snapshot copies only the modified parts.
+    """
+
+    __slots__ = ("_bucket_of", "_buckets", "_index", "_length")
+
+    def __init__(
+        self,
+        bucket_of: Mapping[str, int],
+        buckets: tuple[Mapping[str, RecordAndMetadata], ...],
+        index: Mapping[RecordType | None, Sequence[_IndexEntry]],
+        length: int,
+    ) -> None:
+        """Initialize the snapshot (areas are only added to `bucket_of`)."""
+        self._bucket_of = bucket_of
+        self._buckets = buckets
+        self._index = index
+        self._length = length
+
+    def __getitem__(self, area: str) -> RecordAndMetadata:
+        """Return the record of an area."""
+        if (bucket := self._bucket_of.get(area)) is None or bucket >= len(
+            self._buckets
+        ):
+            raise KeyError(area)
+        return self._buckets[bucket][area]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the areas."""
+        return itertools.chain.from_iterable(self._buckets)
+
+    def __len__(self) -> int:
+        """Return the number of areas."""
+        return self._length
+
+    def ordered(
+        self,
+        areas: Iterable[str] | None,
+        record_types: Iterable[RecordType | None] | None,
+        earliest: datetime | None,
+        newer_first: bool,  # noqa: FBT001
+    ) -> list[RecordAndMetadata]:
+        """
+        Return unique records ordered by time (and then by the record's area).
+
+        Without an areas filter, only the relevant slices of the type indexes
+        are visited, so the cost is proportional to the size of the result.
+        """
+        if areas is not None:
+            return self._ordered_areas(areas, record_types, earliest, newer_first)
+
+        slices = []
+        for record_type in (
+            self._index.keys() if record_types is None else set(record_types)
+        ):
+            entries = self._index.get(record_type, ())
+            start = (
+                bisect_left(entries, (earliest.timestamp(),))
+                if earliest is not None
+                else 0
+            )
+            slices.append(itertools.islice(entries, start, None))
+
+        records = [entry[-1] for entry in heapq.merge(*slices)]
+        if not newer_first:
+            return records
+
+        # Newer first, while keeping records of the same time ordered by area.
+        return [
+            record
+            for _, group in reversed(
+                [
+                    (time, list(group))
+                    for time, group in itertools.groupby(
+                        records, key=lambda record: record.timestamp
+                    )
+                ]
+            )
+            for record in group
+        ]
+
+    def _ordered_areas(
+        self,
+        areas: Iterable[str],
+        record_types: Iterable[RecordType | None] | None,
+        earliest: datetime | None,
+        newer_first: bool,  # noqa: FBT001
+    ) -> list[RecordAndMetadata]:
+        """Return unique records of the given areas, ordered by time and area."""
+        if record_types is not None:
+            record_types = set(record_types)
+        timestamp = earliest.timestamp() if earliest is not None else None
+        return sorted(
+            sorted(
+                {
+                    record
+                    for area in areas
+                    if (record := self.get(area)) is not None
+                    and (record_types is None or record.record_type in record_types)
+                    and (timestamp is None or record.timestamp >= timestamp)
+                },
+                key=lambda record: record.raw.data,
+            ),
+            key=lambda record: record.timestamp,
+            reverse=newer_first,
+        )
+
+
+class AreaRecords(MutableMapping[str, "RecordAndMetadata"]):
+    """
+    Map each area to its latest record.
+
+    Records are also indexed by their type, ordered by time (and then by the
+    record's area). "All areas" records are stored under every area, but are
+    indexed once, so ordered queries return each record only once. Expiring
+    records are kept in a min-heap, so expired areas are found without a scan.
+    Areas touched since the last call to `pop_changes` are tracked as well.
+    Areas are also kept in fixed buckets, so snapshots copy only the buckets
+    modified since the previous snapshot.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty mapping."""
+        self._areas: dict[str, RecordAndMetadata] = {}
+        self._sequence = itertools.count()
+        self._keys: dict[Record, tuple[_IndexEntry, int]] = {}
+        self._index: dict[RecordType | None, list[_IndexEntry]] = {}
+        self._expirations: list[tuple[datetime, int, str, RecordAndMetadata]] = []
+        self._touched: dict[str, bool] = {}
+        self._bucket_of: dict[str, int] = {}
+        self._buckets: list[dict[str, RecordAndMetadata]] = []
+        self._dirty_buckets: set[int] = set()
+        self._dirty_types: set[RecordType | None] = set()
+        self._snapshot = AreaRecordsSnapshot(self._bucket_of, (), {}, 0)
+
+    def __getitem__(self, area: str) -> RecordAndMetadata:
+        """Return the record of an area."""
+        return self._areas[area]
+
+    def __setitem__(self, area: str, record: RecordAndMetadata) -> None:
+        """Set the record of an area and update the indexes."""
+        if (current := self._areas.get(area)) is record:
+            return
+        if current is not None:
+            self._unindex(current)
+        self._touched.setdefault(area, current is not None)
+        self._areas[area] = record
+        if (bucket := self._bucket_of.get(area)) is None:
+            bucket = self._bucket_of[area] = len(self._bucket_of) // BUCKET_SIZE
+            if bucket == len(self._buckets):
+                self._buckets.append({})
+        self._buckets[bucket][area] = record
+        self._dirty_buckets.add(bucket)
+        self._index_record(record)
+        if record.expire is not None:
+            heapq.heappush(
+                self._expirations,
+                (record.expire, next(self._sequence), area, record),
+            )
+
+    def __delitem__(self, area: str) -> None:
+        """Remove the record of an area and update the indexes."""
+        self._unindex(self._areas.pop(area))
+        self._touched.setdefault(area, True)
+        bucket = self._bucket_of[area]
+        del self._buckets[bucket][area]
+        self._dirty_buckets.add(bucket)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the areas."""
+        return iter(self._areas)
+
+    def __len__(self) -> int:
+        """Return the number of areas."""
+        return len(self._areas)
+
+    def clear(self) -> None:
+        """Remove all records."""
+        for area in self._areas:
+            self._touched.setdefault(area, True)
+        self._areas.clear()
+        self._keys.clear()
+        self._dirty_types.update(self._index)
+        self._index.clear()
+        self._expirations.clear()
+        for bucket, records in enumerate(self._buckets):
+            records.clear()
+            self._dirty_buckets.add(bucket)
+
+    def snapshot(self) -> AreaRecordsSnapshot:
+        """Return an immutable snapshot (the same one while nothing changes)."""
+        if not self._dirty_buckets and not self._dirty_types:
+            return self._snapshot
+        buckets = list(self._snapshot._buckets)  # noqa: SLF001
+        for bucket in sorted(self._dirty_buckets):
+            if bucket < len(buckets):
+                buckets[bucket] = dict(self._buckets[bucket])
+            else:
+                buckets.append(dict(self._buckets[bucket]))
+        index = {
+            **self._snapshot._index,  # noqa: SLF001
+            **{
+                record_type: tuple(self._index.get(record_type, ()))
+                for record_type in self._dirty_types
+            },
+        }
+        self._dirty_buckets.clear()
+        self._dirty_types.clear()
+        self._snapshot = AreaRecordsSnapshot(
+            self._bucket_of, tuple(buckets), index, len(self._areas)
+        )
+        return self._snapshot
+
+    def pop_changes(self) -> tuple[frozenset[str], frozenset[str], frozenset[str]]:
+        """Return the added, changed and removed areas since the previous call."""
+        added, changed, removed = set(), set(), set()
+        for area, existed in self._touched.items():
+            if area not in self._areas:
+                if existed:
+                    removed.add(area)
+            elif existed:
+                changed.add(area)
+            else:
+                added.add(area)
+        self._touched.clear()
+        return frozenset(added), frozenset(changed), frozenset(removed)
+
+    def next_expiry(self) -> datetime | None:
+        """Return the earliest expiration of a stored record."""
+        # Entries of replaced records are dropped lazily.
+        while self._expirations and (
+            self._areas.get(self._expirations[0][2]) is not self._expirations[0][3]
+        ):
+            heapq.heappop(self._expirations)
+        return self._expirations[0][0] if self._expirations else None
+
+    def pop_expired(self, now: datetime) -> list[str]:
+        """Return the areas whose stored record expired by the given time."""
+        expired: dict[str, None] = {}
+        while self._expirations and self._expirations[0][0] <= now:
+            _, _, area, record = heapq.heappop(self._expirations)
+            if self._areas.get(area) is record:
+                expired[area] = None
+        return list(expired)
+
+    def latest_time(self, record_types: Iterable[RecordType | None]) -> datetime | None:
+        """Return the time of the latest record of the types."""
+        latest = max(
+            (
+                entries[-1][0]
+                for record_type in record_types
+                if (entries := self._index.get(record_type))
+            ),
+            default=None,
+        )
+        return datetime.fromtimestamp(latest, IST) if latest is not None else None
+
+    def ordered(
+        self,
+        areas: Iterable[str] | None,
+        record_types: Iterable[RecordType | None] | None,
+        earliest: datetime | None,
+        newer_first: bool,  # noqa: FBT001
+    ) -> list[RecordAndMetadata]:
+        """Return unique records ordered by time (and then by the record's area)."""
+        return self.snapshot().ordered(areas, record_types, earliest, newer_first)
+
+    def _index_record(self, record: RecordAndMetadata) -> None:
+        """Add a reference to the record, indexing it on first use."""
+        if (entry := self._keys.get(record.raw)) is not None:
+            self._keys[record.raw] = (entry[0], entry[1] + 1)
+            return
+        key = (record.timestamp, record.raw.data, next(self._sequence), record)
+        self._keys[record.raw] = (key, 1)
+        insort(self._index.setdefault(record.record_type, []), key)
+        self._dirty_types.add(record.record_type)
+
+    def _unindex(self, record: RecordAndMetadata) -> None:
+        """Drop a reference to the record, removing it from the index when unused."""
+        key, count = self._keys[record.raw]
+        if count > 1:
+            self._keys[record.raw] = (key, count - 1)
+            return
+        del self._keys[record.raw]
+        record_type = key[-1].record_type
+        entries = self._index[record_type]
+        del entries[bisect_left(entries, key)]
+        self._dirty_types.add(record_type)
@@ -0,0 +1,281 @@
+"""Network I/O of a paho MQTT client, driven by the asyncio loop."""
+
+from __future__ import annotations
+
+import asyncio
+import enum
+import secrets
+import threading
+from typing import TYPE_CHECKING, Any, Final
+
+import homeassistant.util.dt as dt_util
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_call_later
+from paho.mqtt.enums import MQTTErrorCode
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from datetime import datetime
+
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+    from paho.mqtt.client import Client as MQTTClient
+
+MQTT_MISC_INTERVAL: Final = 1
+MQTT_INITIAL_BACKOFF: Final = 2
+MQTT_MAX_BACKOFF: Final = 300
+
+
+class ConnectionState(enum.StrEnum):
+    """State of a connection."""
+
+    CONNECTED = "connected"
+    DISCONNECTED = "disconnected"
+
+
+class ConnectionHealth:
+    """Connected and disconnected intervals of a connection."""
+
+    def __init__(self) -> None:
+        """Initialize a disconnected connection."""
+        self.state = ConnectionState.DISCONNECTED
+        self._since = dt_util.utcnow()
+        self._durations = dict.fromkeys(ConnectionState, 0.0)
+        self._listeners: list[CALLBACK_TYPE] = []
+        self.attempts = 0
+        self.connections = 0
+        self.reconnect_delay: float | None = None
+        self.last_gap: float | None = None
+        self.longest_gap = 0.0
+
+    @callback
+    def async_add_listener(self, listener: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Listen for state changes, and return a function for removing it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def _change(self, state: ConnectionState) -> float:
+        """Move to a state, and return the duration of the previous one."""
+        now = dt_util.utcnow()
+        duration = (now - self._since).total_seconds()
+        self._durations[self.state] += duration
+        self.state, self._since = state, now
+        for listener in list(self._listeners):
+            listener()
+        return duration
+
+    @callback
+    def connected(self) -> float | None:
+        """Mark as connected, and return the gap (None for the first connection)."""
+        first = not self.connections
+        self.connections += 1
+        self.reconnect_delay = None
+        gap = self._change(ConnectionState.CONNECTED)
+        if first:
+            return None
+        self.last_gap = gap
+        self.longest_gap = max(self.longest_gap, gap)
+        return gap
+
+    @callback
+    def disconnected(self) -> None:
+        """Mark as disconnected."""
+        if self.state == ConnectionState.CONNECTED:
+            self._change(ConnectionState.DISCONNECTED)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics."""
+        durations = {**self._durations}
+        durations[self.state] += (dt_util.utcnow() - self._since).total_seconds()
+        total = sum(durations.values())
+        return {
+            "state": self.state.value,
+            "since": self._since.isoformat(),
+            "attempts": self.attempts,
+            "connections": self.connections,
+            "disconnections": max(
+                self.connections - (self.state == ConnectionState.CONNECTED), 0
+            ),
+            "reconnect_delay": self.reconnect_delay,
+            "last_gap": None if self.last_gap is None else round(self.last_gap, 3),
+            "longest_gap": round(self.longest_gap, 3),
+            "connected_ratio": round(durations[ConnectionState.CONNECTED] / total, 4)
+            if total
+            else None,
+        }
+
+
+class AsyncioMQTTLoop:
+    """
+    Run the network I/O of a paho MQTT client on the event loop.
+
+    paho's external loop hooks register the client's socket in the event loop,
+    which calls the client's read and write handlers once the socket is ready,
+    and the periodic work (e.g. keepalive pings) runs on a timer. Only the
+    connection, which is blocking (including the TLS handshake), runs in the
+    executor. The client's callbacks (e.g. on_message) are called on the loop.
+
+    The connection is supervised: when it fails or is lost, it's re-established
+    with a jittered exponential backoff (to a freshly resolved host), and its
+    connected and disconnected intervals are tracked.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        client: MQTTClient,
+        host: Callable[[], str],
+        port: int,
+        keepalive: int,
+        *,
+        health: ConnectionHealth,
+    ) -> None:
+        """Initialize the loop, and register the client's hooks."""
+        self._hass = hass
+        self._client = client
+        self._host = host
+        self._port = port
+        self._keepalive = keepalive
+        self.health = health
+        self._backoff = 0.0
+        self._fileno: int | None = None
+        self._misc: asyncio.TimerHandle | None = None
+        self._unsub_reconnect: CALLBACK_TYPE | None = None
+        self._connecting: asyncio.Future[Any] | None = None
+        self._stopped = False
+        client.on_socket_open = lambda _c, _u, sock: self._in_loop(
+            self._async_socket_open, sock.fileno()
+        )
+        client.on_socket_close = lambda _c, _u, _sock: self._in_loop(
+            self._async_socket_close
+        )
+        client.on_socket_register_write = lambda _c, _u, _sock: self._in_loop(
+            self._async_register_write
+        )
+        client.on_socket_unregister_write = lambda _c, _u, _sock: self._in_loop(
+            self._async_unregister_write
+        )
+
+    def _in_loop(self, target: Callable[..., None], *args: Any) -> None:
+        """Call on the loop (the hooks are called by the executor when connecting)."""
+        if threading.get_ident() == self._hass.loop_thread_id:
+            target(*args)
+        else:
+            self._hass.loop.call_soon_threadsafe(target, *args)
+
+    async def async_connect(self) -> None:
+        """Connect to the broker (and keep reconnecting on failures)."""
+        self.health.attempts += 1
+        host = self._host()
+        LOGGER.debug("MQTT connecting to '%s'.", host)
+        # The connection is blocking, so it runs in the executor.
+        self._connecting = self._hass.async_add_executor_job(
+            self._client.connect, host, self._port, self._keepalive
+        )
+        try:
+            await self._connecting
+        except OSError as ex:
+            LOGGER.warning("MQTT connection failed: %s", ex)
+            self._schedule_reconnect()
+        finally:
+            self._connecting = None
+
+    @callback
+    def connected(self) -> float | None:
+        """Reset the backoff, and return the gap (None for the first connection)."""
+        self._backoff = 0.0
+        return self.health.connected()
+
+    def _schedule_reconnect(self) -> None:
+        """Reconnect after a jittered backoff (unless stopped)."""
+        if self._stopped or self._unsub_reconnect is not None:
+            return
+        self._backoff = min(
+            self._backoff * 2 if self._backoff else MQTT_INITIAL_BACKOFF,
+            MQTT_MAX_BACKOFF,
+        )
+        self.health.reconnect_delay = round(
+            self._backoff * secrets.SystemRandom().uniform(0.5, 1), 3
+        )
+        LOGGER.debug("MQTT reconnecting in %s seconds.", self.health.reconnect_delay)
+        self._unsub_reconnect = async_call_later(
+            self._hass, self.health.reconnect_delay, self._async_reconnect
+        )
+
+    async def _async_reconnect(self, _: datetime) -> None:
+        """Reconnect to the broker."""
+        self._unsub_reconnect = None
+        await self.async_connect()
+
+    @callback
+    def _async_socket_open(self, fileno: int) -> None:
+        """Read the socket once it's readable, and start the periodic work."""
+        self._fileno = fileno
+        self._hass.loop.add_reader(fileno, self._on_readable)
+        self._schedule_misc()
+
+    @callback
+    def _on_readable(self) -> None:
+        """Read the socket, including the TLS records which were decrypted."""
+        rc = self._client.loop_read()
+        # The decrypted records don't make the socket readable again.
+        while rc == MQTTErrorCode.MQTT_ERR_SUCCESS and self._pending():
+            rc = self._client.loop_read()
+
+    def _pending(self) -> bool:
+        """Return whether there are pending bytes (of a TLS socket)."""
+        sock = self._client.socket()
+        pending = getattr(sock, "pending", None)
+        return pending is not None and pending() > 0
+
+    @callback
+    def _async_socket_close(self) -> None:
+        """Unregister the socket, and reconnect (unless stopped)."""
+        if self._fileno is not None:
+            self._hass.loop.remove_reader(self._fileno)
+            self._hass.loop.remove_writer(self._fileno)
+            self._fileno = None
+        if self._misc is not None:
+            self._misc.cancel()
+            self._misc = None
+        self.health.disconnected()
+        self._schedule_reconnect()
+
+    @callback
+    def _async_register_write(self) -> None:
+        """Write the pending packets once the socket is writable."""
+        if self._fileno is not None:
+            self._hass.loop.add_writer(self._fileno, self._client.loop_write)
+
+    @callback
+    def _async_unregister_write(self) -> None:
+        """Stop writing (there are no pending packets)."""
+        if self._fileno is not None:
+            self._hass.loop.remove_writer(self._fileno)
+
+    @callback
+    def _schedule_misc(self) -> None:
+        """Schedule the periodic work."""
+        self._misc = self._hass.loop.call_later(MQTT_MISC_INTERVAL, self._on_misc)
+
+    @callback
+    def _on_misc(self) -> None:
+        """Do the periodic work (keepalive pings and retries)."""
+        self._client.loop_misc()
+        if self._fileno is not None:
+            self._schedule_misc()
+
+    async def async_stop(self) -> None:
+        """Disconnect, and stop reconnecting."""
+        self._stopped = True
+        if self._unsub_reconnect is not None:
+            self._unsub_reconnect()
+            self._unsub_reconnect = None
+        if self._connecting is not None:
+            # Wait for the connection (it can't be cancelled), without its errors.
+            await asyncio.wait([self._connecting])
+        self._client.disconnect()
+        # Send the DISCONNECT packet (the socket is closed once it's sent).
+        self._client.loop_write()
+        self._async_socket_close()
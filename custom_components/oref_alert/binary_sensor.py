@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.components import binary_sensor
 from homeassistant.const import Platform
+from homeassistant.core import callback
 from homeassistant.util import slugify
 
 from .entity import OrefAlertCoordinatorEntity
@@ -138,6 +139,13 @@ class AlertSensor(AlertSensorBase):
         """Get the key of the extra sensor."""
         return self._sensor_key
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state (and measure the latency of the default sensor)."""
+        super()._handle_coordinator_update()
+        if not self._sensor_key:
+            self.coordinator.latency.state_written(self._areas)
+
 
 class AlertSensorAllAreas(AlertSensorBase):
     """Representation of the alert sensor for all areas."""
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Final
 
 from homeassistant.const import ATTR_DATE
 from homeassistant.core import HomeAssistant, callback
@@ -17,6 +19,7 @@ from .const import (
     RecordAndMetadata,
     RecordType,
 )
+from .journal import Journal
 from .ttl_deque import TTLDeque
 
 if TYPE_CHECKING:
@@ -25,6 +28,8 @@ if TYPE_CHECKING:
     from . import OrefAlertConfigEntry
     from .coordinator import OrefAlertDataUpdateCoordinator
 
+RESTORE_CHUNK_SIZE: Final = 200
+
 
 class OrefAlertBusEventManager:
     """Manage bus events."""
@@ -47,7 +52,10 @@ class OrefAlertBusEventManager:
         self._store = Store[dict[str, Any]](
             hass, self._STORAGE_VERSION, self._STORAGE_KEY
         )
+        self._journal = Journal(hass, self._store, self._storage_data)
         self._unsub_update: Callable[[], None] | None = None
+        self._revision: int | None = None
+        self.restore_stats: dict[str, float] = {}
 
     def start(self) -> None:
         """Subscribe to coordinator updates."""
@@ -56,6 +64,15 @@ class OrefAlertBusEventManager:
         )
         self._unsub_update = self._coordinator.async_add_listener(self._async_update)
 
+    @property
+    def counters(self) -> dict[str, int]:
+        """Return the sizes of the histories."""
+        return {
+            "alert_history": len(self.alert_history),
+            "history_records": len(self._history_records),
+            "previous_items": len(self._previous_items),
+        }
+
     def stop(self) -> None:
         """Remove listener."""
         if self._unsub_update is not None:
@@ -63,38 +80,75 @@ class OrefAlertBusEventManager:
             self._unsub_update = None
 
     async def async_restore(self) -> None:
-        """Restore history records from persistent storage."""
-        stored = await self._store.async_load()
-        if not stored:
-            return
-        for raw_record in stored.get(self._STORAGE_RECORDS_KEY, []):
+        """
+        Restore history records from persistent storage (snapshot and journal).
+
+        Only the recent records, which are needed for not firing them again, are
+        restored right away. The history is restored in the background (newest
+        first), in chunks which yield to the event loop.
+        """
+        start = time.perf_counter()
+        stored, entries = await self._journal.async_load()
+        records: list[RecordAndMetadata] = []
+        for raw_record in reversed(
+            [*(stored or {}).get(self._STORAGE_RECORDS_KEY, []), *entries]
+        ):
             try:
-                record = Record(**raw_record)
+                records.append(
+                    self._config_entry.runtime_data.coordinator.add_metadata(
+                        Record(**raw_record)
+                    )
+                )
             except Exception:  # noqa: BLE001
                 LOGGER.debug("Skipping invalid restored history record", exc_info=True)
-                continue
-            record_metadata = self._config_entry.runtime_data.coordinator.add_metadata(
-                record
+        for record in records:
+            if not self._previous_items.add_older(record.raw, record.time):
+                break
+        self.restore_stats = {
+            "records": len(records),
+            "load_seconds": time.perf_counter() - start,
+        }
+        self._journal.defer_compaction(
+            self._config_entry.async_create_background_task(
+                self._hass,
+                self._async_restore_history(records),
+                f"{DOMAIN} history restore",
             )
-            self._history_records.add(record_metadata, record_metadata.time)
-            self._previous_items.add(record, record_metadata.time)
-            if event := self._compose_event(record_metadata):
-                self.alert_history.add(
-                    {**event, ATTR_DATE: record_metadata.time.isoformat()},
-                    record_metadata.time,
-                )
+        )
 
-    async def async_save(self) -> None:
-        """Persist history records to storage."""
-        await self._store.async_save(
-            {
-                self._STORAGE_RECORDS_KEY: [
-                    record.raw_dict
-                    for record in reversed(list(self._history_records.items()))
-                ]
-            }
+    async def _async_restore_history(self, records: list[RecordAndMetadata]) -> None:
+        """Restore the history records (ordered from the newest)."""
+        start = time.perf_counter()
+        for index in range(0, len(records), RESTORE_CHUNK_SIZE):
+            if index:
+                await asyncio.sleep(0)
+            for record in records[index : index + RESTORE_CHUNK_SIZE]:
+                self._history_records.add_older(record, record.time)
+                if event := self._compose_event(record):
+                    self.alert_history.add_older(
+                        {**event, ATTR_DATE: record.time.isoformat()}, record.time
+                    )
+        self.restore_stats["history_seconds"] = time.perf_counter() - start
+        LOGGER.debug(
+            "Restored %d history records (load: %.3fs, history: %.3fs)",
+            len(records),
+            self.restore_stats["load_seconds"],
+            self.restore_stats["history_seconds"],
         )
 
+    async def async_save(self) -> None:
+        """Persist history records to storage (once they are restored)."""
+        await self._journal.async_compact()
+
+    def _storage_data(self) -> dict[str, Any]:
+        """Return the history records (chronologically ordered) as raw records."""
+        return {
+            self._STORAGE_RECORDS_KEY: [
+                record.raw_dict
+                for record in reversed(list(self._history_records.items()))
+            ]
+        }
+
     def _compose_event(self, record: RecordAndMetadata) -> dict[str, Any] | None:
         """Compose event from a record."""
         if not (published := record.published_data):
@@ -116,8 +170,14 @@ class OrefAlertBusEventManager:
         synchronous, or the triggers will start firing multiple times per
         refresh instead of once.
         """
+        data = self._coordinator.data
+        areas = data.changes_since(self._revision)
+        self._revision = data.revision
+        if areas is not None and not areas:
+            return
+        journal = []
         for record in self._coordinator.get_record_and_metadata(
-            None, None, 3, newer_first=False
+            areas, None, 3, newer_first=False
         ):
             if record.raw in self._previous_items or not (
                 event := self._compose_event(record)
@@ -141,4 +201,6 @@ class OrefAlertBusEventManager:
                     {**event, ATTR_DATE: record.time.isoformat()}, record.time
                 )
                 self._history_records.add(record, record.time)
+                journal.append(record.raw_dict)
             self._previous_items.add(record.raw, record.time)
+        self._journal.append(journal)
@@ -0,0 +1,133 @@
+"""Capture of the raw traffic of the channels (for replaying incidents)."""
+
+from __future__ import annotations
+
+import enum
+import gzip
+import json
+import time
+from typing import TYPE_CHECKING, Any, Final
+
+import homeassistant.util.dt as dt_util
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+    from pathlib import Path
+
+    from aiohttp import ClientResponse
+    from homeassistant.core import HomeAssistant
+    from multidict import CIMultiDictProxy
+
+CAPTURE_FILE: Final = "oref_alert_capture_{timestamp}.jsonl.gz"
+CAPTURE_VERSION: Final = 1
+CAPTURE_MAX_SIZE: Final = 50_000_000  # Characters of the payloads.
+
+
+class CaptureChannel(enum.StrEnum):
+    """Channel of a captured payload."""
+
+    HTTP = "http"
+    MQTT = "mqtt"
+    WS = "ws"
+
+
+class BufferedResponse:
+    """A received HTTP response, which can be read again by the readers."""
+
+    def __init__(self, response: ClientResponse, body: bytes) -> None:
+        """Initialize the response."""
+        self.status: int = response.status
+        self.headers: CIMultiDictProxy[str] = response.headers
+        self.content = self
+        self.body = body
+
+    @classmethod
+    async def async_read(cls, response: ClientResponse) -> BufferedResponse:
+        """Read the entire body of a response."""
+        return cls(response, await response.read())
+
+    async def read(self) -> bytes:
+        """Return the entire body."""
+        return self.body
+
+    async def iter_any(self) -> AsyncGenerator[bytes]:
+        """Yield the body (as a single chunk)."""
+        yield self.body
+
+
+class TrafficCapture:
+    """
+    Record the raw payloads received by the channels.
+
+    The entries are kept in memory, and are written as compressed JSON lines
+    when the capture is saved. Each entry carries its offset (in seconds) from
+    the beginning of the capture, so the traffic can be replayed with the
+    original timing. The memory is bounded by the payloads' total size, and the
+    entries beyond it are dropped (and counted).
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the capture."""
+        self.path = path
+        self._start_time = dt_util.now()
+        self._start = time.monotonic()
+        self._entries: list[dict[str, Any]] = []
+        self._size = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def record(self, channel: CaptureChannel, payload: str, **details: Any) -> None:
+        """Add an entry (thread-safe)."""
+        if self._size + len(payload) > CAPTURE_MAX_SIZE:
+            self.dropped += 1
+            return
+        self._size += len(payload)
+        self._entries.append(
+            {
+                "t": round(time.monotonic() - self._start, 3),
+                "channel": channel.value,
+                **details,
+                "payload": payload,
+            }
+        )
+
+    def record_response(self, url: str, response: BufferedResponse) -> None:
+        """Add an HTTP response."""
+        self.record(
+            CaptureChannel.HTTP,
+            response.body.decode("utf-8", errors="replace"),
+            url=url,
+            status=response.status,
+            last_modified=response.headers.get("Last-Modified", ""),
+        )
+
+    async def async_save(self, hass: HomeAssistant) -> None:
+        """Write the entries to the capture's file."""
+        header = {
+            "version": CAPTURE_VERSION,
+            "start": self._start_time.isoformat(),
+            "dropped": self.dropped,
+        }
+        await hass.async_add_executor_job(
+            save_capture, self.path, [header, *self._entries]
+        )
+
+
+def save_capture(path: Path, lines: list[dict[str, Any]]) -> None:
+    """Write the lines of a capture file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.writelines(f"{json.dumps(line, ensure_ascii=False)}\n" for line in lines)
+
+
+def load_capture(path: Path) -> list[dict[str, Any]]:
+    """Return the entries of a capture file (ordered by their offsets)."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header, *entries = (json.loads(line) for line in file)
+    if header.get("version") != CAPTURE_VERSION:
+        msg = f"Unsupported capture version: {header.get('version')}"
+        raise ValueError(msg)
+    return sorted(entries, key=lambda entry: entry["t"])
@@ -0,0 +1,97 @@
+"""Circuit breaker for remote endpoints."""
+
+from __future__ import annotations
+
+import enum
+import secrets
+from typing import Any
+
+
+class CircuitState(enum.StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stop calling a failing endpoint, and probe it with a growing backoff.
+
+    The circuit opens after consecutive failures. While it's open, calls are
+    not allowed. Once the (jittered, exponential) backoff elapses, the circuit
+    is half-open and allows a single trial call: a success closes the circuit,
+    and a failure opens it again with a doubled backoff.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        initial_backoff: float = 5,
+        max_backoff: float = 300,
+    ) -> None:
+        """Initialize a closed circuit."""
+        self._failure_threshold = failure_threshold
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._backoff = 0.0
+        self._open_until = 0.0
+        self._trials = 0
+        self._opened = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the state (without considering the current time)."""
+        return self._state
+
+    def allow(self, now: float) -> bool:
+        """Return whether a call is allowed (moving to half-open when due)."""
+        if self._state == CircuitState.OPEN and now >= self._open_until:
+            self._state = CircuitState.HALF_OPEN
+            self._trials = 0
+        if self._state == CircuitState.HALF_OPEN:
+            if self._trials:
+                return False
+            self._trials += 1
+        return self._state != CircuitState.OPEN
+
+    def release(self) -> None:
+        """Allow another trial, when a trial ended without a result (cancelled)."""
+        if self._state == CircuitState.HALF_OPEN:
+            self._trials = 0
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._backoff = 0.0
+
+    def record_failure(self, now: float) -> None:
+        """Count a failure, and open the circuit when needed."""
+        self._failures += 1
+        if (
+            self._state == CircuitState.HALF_OPEN
+            or self._failures >= self._failure_threshold
+        ):
+            self._backoff = min(
+                self._backoff * 2 if self._backoff else self._initial_backoff,
+                self._max_backoff,
+            )
+            self._open_until = now + self._backoff * secrets.SystemRandom().uniform(
+                0.5, 1
+            )
+            self._state = CircuitState.OPEN
+            self._opened += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state for diagnostics."""
+        return {
+            "state": self._state.value,
+            "failures": self._failures,
+            "backoff": self._backoff,
+            "open_until": self._open_until,
+            "opened": self._opened,
+        }
@@ -4,14 +4,16 @@ from __future__ import annotations
 
 import enum
 import logging
+import sys
 import zoneinfo
 from dataclasses import dataclass, field
+from datetime import datetime
 from typing import TYPE_CHECKING, Final, TypedDict
 
 from homeassistant.const import STATE_OK
 
 if TYPE_CHECKING:
-    from datetime import datetime
+    from collections.abc import Callable
 
 DOMAIN: Final = "oref_alert"
 TITLE: Final = "Oref Alert"
@@ -38,6 +40,9 @@ ATTR_TYPE: Final = "type"
 CONF_AREA: Final = "area"
 CONF_AREAS: Final = "areas"
 CONF_DURATION: Final = "duration"
+CONF_ENTRIES: Final = "entries"
+CONF_REFRESHES: Final = "refreshes"
+CONF_SAVE: Final = "save"
 CONF_SENSORS: Final = "sensors"
 
 ADD_SENSOR_ACTION: Final = "add_sensor"
@@ -49,6 +54,9 @@ ADD_AREAS: Final = "add_areas"
 REMOVE_AREAS: Final = "remove_areas"
 SYNTHETIC_ALERT_ACTION: Final = "synthetic_alert"
 MANUAL_EVENT_END_ACTION: Final = "manual_event_end"
+CAPTURE_ACTION: Final = "capture"
+CHANNELS_RACE_ACTION: Final = "channels_race"
+PROFILE_ACTION: Final = "profile"
 OREF_ALERT_UNIQUE_ID: Final = DOMAIN
 OREF_ALERT_RECORD_EVENT: Final = f"{DOMAIN}_record"
 ALL_AREAS_ID_SUFFIX: Final = "all_areas"
@@ -76,7 +84,7 @@ MANUAL_EVENT_END_TITLE: Final = "האירוע סומן כהסתיים ידנית
 EXPIRED_EVENT_END_TITLE: Final = "האירוע הסתיים אוטומטית לאחר שחלף הזמן המקסימלי"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Record:
     """Record type."""
 
@@ -87,9 +95,10 @@ class Record:
     title: str
 
     def __post_init__(self) -> None:
-        """Convert StrEnum to plain str."""
-        if isinstance(self.channel, enum.StrEnum):
-            object.__setattr__(self, "channel", self.channel.value)
+        """Convert StrEnum to plain str, and intern the repeating strings."""
+        object.__setattr__(self, "data", sys.intern(self.data))
+        object.__setattr__(self, "channel", sys.intern(str(self.channel)))
+        object.__setattr__(self, "title", sys.intern(self.title))
 
 
 class RecordType(enum.StrEnum):
@@ -125,19 +134,56 @@ class PublishedData(TypedDict):
     date: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RecordAndMetadata:
-    """Class for holding a record with additional metadata."""
+    """
+    Class for holding a record with additional metadata.
+
+    Only the record and the compact metadata are stored. The other views (e.g.
+    the time as datetime) are derived on access, and the published data is
+    built on first access.
+    """
 
     raw: Record
-    raw_dict: dict[str, str | int] = field(hash=False, compare=False)
-    time: datetime = field(hash=False, compare=False)
+    timestamp: int = field(hash=False, compare=False)  # Epoch seconds.
     record_type: RecordType | None = field(hash=False, compare=False)
     expire: datetime | None = field(hash=False, compare=False)
-    published_data: PublishedData | None = field(
-        hash=False, compare=False, default=None
+    area: str | None = field(hash=False, compare=False, default=None)
+    publisher: Callable[[RecordAndMetadata], PublishedData | None] | None = field(
+        hash=False, compare=False, default=None, repr=False
+    )
+    # Epoch times of the record's receipt and of its metadata's calculation.
+    received: float = field(hash=False, compare=False, default=0.0, repr=False)
+    processed: float = field(hash=False, compare=False, default=0.0, repr=False)
+    # The published data, once built.
+    _published_data: PublishedData | None = field(
+        hash=False, compare=False, default=None, init=False, repr=False
     )
 
+    @property
+    def time(self) -> datetime:
+        """Return the record's time."""
+        return datetime.fromtimestamp(self.timestamp, IST)
+
+    @property
+    def raw_dict(self) -> dict[str, str | int]:
+        """Return the raw record as dict."""
+        raw = self.raw
+        return {
+            AREA_FIELD: raw.data,
+            CATEGORY_FIELD: raw.category,
+            CHANNEL_FIELD: raw.channel,
+            DATE_FIELD: raw.alertDate,
+            TITLE_FIELD: raw.title,
+        }
+
+    @property
+    def published_data(self) -> PublishedData | None:
+        """Build the area-specific published data on first access."""
+        if self._published_data is None and self.publisher is not None:
+            object.__setattr__(self, "_published_data", self.publisher(self))
+        return self._published_data
+
 
 class RecordSource(enum.StrEnum):
     """Enum for alert sources."""
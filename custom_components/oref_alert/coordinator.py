@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import itertools
 import json
-from dataclasses import asdict, dataclass, replace
+import time
+from collections import deque
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
 from http import HTTPStatus
-from types import MappingProxyType
-from typing import TYPE_CHECKING, Any, Final
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, cast
 
 import homeassistant.util.dt as dt_util
 from homeassistant.const import (
@@ -18,7 +22,11 @@ from homeassistant.const import (
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
 )
+from homeassistant.core import callback
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util.location import vincenty
@@ -29,6 +37,8 @@ from custom_components.oref_alert.metadata import (
 )
 from custom_components.oref_alert.metadata.area_to_district import AREA_TO_DISTRICT
 
+from .area_records import AreaRecords, AreaRecordsSnapshot
+from .capture import CAPTURE_FILE, BufferedResponse, TrafficCapture
 from .categories import (
     END_ALERT_CATEGORY,
     PRE_ALERT_CATEGORY,
@@ -38,12 +48,14 @@ from .categories import (
     category_to_icon,
     real_time_to_history_category,
 )
+from .circuit_breaker import CircuitBreaker
 from .const import (
     AREA_FIELD,
     ATTR_AREA,
     ATTR_DISTRICT,
     ATTR_EMOJI,
     ATTR_HOME_DISTANCE,
+    ATTR_RECORD,
     ATTR_TYPE,
     CATEGORY_FIELD,
     CHANNEL_FIELD,
@@ -63,14 +75,28 @@ from .const import (
     RecordSource,
     RecordType,
 )
+from .counters import FetchCounters, Timing
+from .journal import Journal
+from .json_stream import JSONStreamError, async_iter_json_array
+from .latency import LatencyTracker
 from .metadata.area_info import AREA_INFO
 from .metadata.areas import AREAS
+from .profiler import PROFILE_FILE, PROFILE_TOP_ENTRIES, RefreshProfiler, profiled
+from .race import ChannelRaceTracker
 
 if TYPE_CHECKING:
-    from collections import deque
-    from collections.abc import AsyncIterator, Callable, Generator, Iterable, Mapping
+    from collections.abc import (
+        AsyncGenerator,
+        AsyncIterable,
+        Awaitable,
+        Callable,
+        Container,
+        Generator,
+        Iterable,
+    )
 
-    from homeassistant.core import HomeAssistant
+    from aiohttp import ClientResponse
+    from homeassistant.core import CALLBACK_TYPE, HomeAssistant
 
     from . import OrefAlertConfigEntry
 
@@ -94,16 +120,104 @@ OREF_HEADERS: Final = {
 }
 REQUEST_RETRIES: Final = 3
 REQUEST_THROTTLING: Final = 0.8
+REQUEST_TIMEOUT: Final = 5
 DEDUP_WINDOW_SECONDS: Final = 180
+HISTORY_OVERLAP: Final = timedelta(minutes=30)
 UPDATE_INTERVAL: Final = timedelta(seconds=20)
+ACTIVE_UPDATE_INTERVAL: Final = timedelta(seconds=5)
+MAX_UPDATE_INTERVAL: Final = timedelta(seconds=80)
+ACTIVITY_WINDOW: Final = timedelta(minutes=10)
 STORAGE_VERSION: Final = 1
+FETCH_GRACE_SECONDS: Final = 0.2
+HEDGE_PERCENTILE: Final = 0.95
+HEDGE_SAMPLES: Final = 100
+HEDGE_MIN_SAMPLES: Final = 20
+HEDGE_MIN_DELAY: Final = 0.5
+ALERT_DATE_CACHE_SIZE: Final = 1024
+PUSH_REFRESH_LATENCY: Final = 0.1
+ALERT_DATE_LENGTH: Final = len("YYYY-MM-DD HH:MM:SS")
+
+# A reader parses a response, and returns the content and an update of its state
+# (which is applied only if the reply is used).
+type Reader = Callable[
+    [str, ClientResponse], Awaitable[tuple[Any, Callable[[], None] | None]]
+]
+
+
+@lru_cache(maxsize=ALERT_DATE_CACHE_SIZE)
+def _parse_alert_date(alert_date: str) -> datetime:
+    """
+    Parse a record's date (in Israel time).
+
+    Dates are almost always in a fixed format, which is parsed by slicing. A
+    single alert covers many areas with the same date, so parsed dates are
+    cached.
+    """
+    if (
+        len(alert_date) == ALERT_DATE_LENGTH
+        and alert_date[4] == alert_date[7] == "-"
+        and alert_date[10] in " T"
+        and alert_date[13] == alert_date[16] == ":"
+    ):
+        return datetime(
+            int(alert_date[:4]),
+            int(alert_date[5:7]),
+            int(alert_date[8:10]),
+            int(alert_date[11:13]),
+            int(alert_date[14:16]),
+            int(alert_date[17:]),
+            tzinfo=IST,
+        )
+    return dt_util.parse_datetime(alert_date, raise_on_error=True).replace(tzinfo=IST)
+
+
+@dataclass(frozen=True)
+class OrefEndpoint:
+    """Class for holding the fetch settings of an Oref endpoint."""
+
+    url: str
+    interval: timedelta  # Minimal time between fetches.
+    timeout: float  # Total budget of a fetch (including retries).
+
+
+# The budgets cover all the retries (REQUEST_RETRIES * REQUEST_TIMEOUT).
+OREF_ENDPOINTS: Final = (
+    OrefEndpoint(OREF_ALERTS_URL, timedelta(), 20),
+    OrefEndpoint(OREF_HISTORY_URL, timedelta(seconds=20), 20),
+    OrefEndpoint(OREF_HISTORY2_URL, timedelta(seconds=60), 30),
+)
+
+
+@dataclass(slots=True)
+class _Reply:
+    """A request's reply (its updates are applied only if the reply is used)."""
+
+    last_modified: str | None  # None when not modified.
+    content: Any = None
+    updates: list[Callable[[], None]] = field(default_factory=list)
+
+    def use(self) -> tuple[str | None, Any]:
+        """Apply the updates, and return the Last-Modified header and the content."""
+        for update in self.updates:
+            update()
+        return self.last_modified, self.content
 
 
 @dataclass(frozen=True)
 class OrefAlertCoordinatorData:
     """Class for holding coordinator data."""
 
-    areas: Mapping[str, RecordAndMetadata]
+    areas: AreaRecordsSnapshot
+    revision: int = 0
+    added: frozenset[str] = frozenset()
+    changed: frozenset[str] = frozenset()
+    removed: frozenset[str] = frozenset()
+
+    def changes_since(self, revision: int | None) -> frozenset[str] | None:
+        """Return the areas updated since the revision (None when unknown)."""
+        if revision is None or self.revision != revision + 1:
+            return None
+        return self.added | self.changed | self.removed
 
 
 class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorData]):
@@ -114,6 +228,8 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
         hass: HomeAssistant,
         config_entry: OrefAlertConfigEntry,
         channels: list[deque[RecordAndMetadata]],
+        *,
+        push_latency: float = PUSH_REFRESH_LATENCY,
     ) -> None:
         """Initialize global data updater."""
         super().__init__(
@@ -126,39 +242,139 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
         self._config_entry = config_entry
         self._http_client = async_get_clientsession(hass)
         self._http_replies: dict[str, tuple[str, float]] = {}
+        self._history_marks: dict[str, datetime] = {}
+        # The records within the overlap of each history URL (with their time).
+        self._history_seen: dict[str, dict[Record, int]] = {}
+        self._readers: dict[str, Reader] = {
+            OREF_HISTORY_URL: partial(
+                self._read_history, payload_to_record=self._history_to_record
+            ),
+            OREF_HISTORY2_URL: partial(
+                self._read_history, payload_to_record=self._history2_to_record
+            ),
+        }
+        self._fetches: dict[str, asyncio.Task[Any]] = {}
+        self._fetch_times: dict[str, datetime] = {}
+        self._deferred_fetches: set[str] = set()
+        self._circuit_breakers: dict[str, CircuitBreaker] = {}
+        self._latencies: dict[str, deque[float]] = {}
+        self._fetch_counters: dict[str, FetchCounters] = {}
+        self._refreshes = Timing()
+        self._fan_out = Timing()
+        self._fetch_failed = False
+        self._push_activity: datetime | None = None
+        self._push_refresh = Debouncer(
+            hass,
+            LOGGER,
+            cooldown=push_latency,
+            immediate=False,
+            function=self._async_push_refresh,
+        )
         self._channels: list[deque[RecordAndMetadata]] = channels
         self._last_update: datetime | None = None
-        self._areas: dict[str, RecordAndMetadata] = {}
+        self._areas = AreaRecords()
+        self._home_location: tuple[float, float] | None = None
+        self._home_distances: dict[str, float] = {}
+        self._unsub_expiry: CALLBACK_TYPE | None = None
+        self._revision = 0
+        self.restore_stats: dict[str, float] = {}
+        self.capture: TrafficCapture | None = None
+        self.latency = LatencyTracker()
+        self.race = ChannelRaceTracker(DEDUP_WINDOW_SECONDS)
+        self.profiler: RefreshProfiler | None = None
+        self._unsub_capture: CALLBACK_TYPE | None = None
         self._store = Store[dict[str, Any]](hass, STORAGE_VERSION, DOMAIN)
-        self.data = OrefAlertCoordinatorData(MappingProxyType({}))
+        self._journal = Journal(hass, self._store, self._storage_data)
+        self.data = OrefAlertCoordinatorData(self._areas.snapshot())
+
+    async def async_push_refresh(self) -> None:
+        """
+        Request a refresh for records added to a push channel.
+
+        Requests are coalesced, so all the records pushed within the (bounded)
+        latency are processed by a single refresh.
+        """
+        await self._push_refresh.async_call()
+
+    async def _async_push_refresh(self) -> None:
+        """Refresh, and request another refresh for records pushed meanwhile."""
+        await self.async_refresh()
+        # The debouncer drops the requests while its refresh runs (e.g. while it
+        # polls, since the pushed records were merged by a previous refresh).
+        if any(self._channels):
+            self._push_refresh.async_schedule_call()
+
+    async def async_catch_up(self) -> None:
+        """Fetch all the endpoints now (e.g. after a push channel's gap)."""
+        self._fetch_times.clear()
+        await self.async_refresh()
 
     async def async_restore(self) -> None:
-        """Restore cached areas from persistent storage."""
-        stored = await self._store.async_load()
+        """
+        Restore cached areas from persistent storage (snapshot and journal).
+
+        The restored areas are not published as changes (so they are not
+        journaled again). The revision is skipped instead, so the consumers
+        read all the areas.
+        """
+        start = time.perf_counter()
+        stored, entries = await self._journal.async_load()
         if stored:
             for area, raw_record in stored.get(CONF_AREAS, {}).items():
                 try:
-                    self._areas[area] = self.add_metadata(Record(**raw_record))
+                    self._restore_area(area, self.add_metadata(Record(**raw_record)))
                 except Exception:  # noqa: BLE001
                     LOGGER.debug(
                         "Skipping invalid restored area '%s'",
                         area,
                         exc_info=True,
                     )
+        for entry in entries:
+            if (raw_record := entry.get(ATTR_RECORD)) is None:
+                for area in entry[CONF_AREAS]:
+                    self._areas.pop(area, None)
+                continue
+            try:
+                record = self.add_metadata(Record(**raw_record))
+            except Exception:  # noqa: BLE001
+                LOGGER.debug("Skipping invalid journal entry", exc_info=True)
+                continue
+            for area in entry[CONF_AREAS]:
+                self._restore_area(area, record)
+        self._areas.pop_changes()
+        self._revision += 1
+        self.restore_stats = {
+            "areas": len(self._areas),
+            "journal_entries": len(entries),
+            "seconds": time.perf_counter() - start,
+        }
+        LOGGER.debug(
+            "Restored %d areas in %.3fs",
+            len(self._areas),
+            self.restore_stats["seconds"],
+        )
+
+    def _restore_area(self, area: str, record: RecordAndMetadata) -> None:
+        """Restore an area's record (which can be an "all areas" record)."""
+        self._areas[area] = (
+            record if area == record.raw.data else replace(record, area=area)
+        )
 
     async def async_save(self) -> None:
         """Persist current areas to storage as raw records."""
         if self._last_update:
-            cutoff = dt_util.now() - timedelta(days=1)
-            await self._store.async_save(
-                {
-                    CONF_AREAS: {
-                        area: record.raw_dict
-                        for area, record in self._areas.items()
-                        if record.time > cutoff
-                    }
-                }
-            )
+            await self._journal.async_compact()
+
+    def _storage_data(self) -> dict[str, Any]:
+        """Return the stored areas (of the last day) as raw records."""
+        cutoff = dt_util.now() - timedelta(days=1)
+        return {
+            CONF_AREAS: {
+                area: record.raw_dict
+                for area, record in self._areas.items()
+                if record.time > cutoff
+            }
+        }
 
     def get_record_and_metadata(
         self,
@@ -168,20 +384,11 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
         newer_first: bool,  # noqa: FBT001
     ) -> list[RecordAndMetadata]:
         """Return the records and metadata, sorted and filtered."""
-        earliest = dt_util.now() - timedelta(minutes=window) if window else None
-        return sorted(
-            sorted(
-                {
-                    record
-                    for area, record in self.data.areas.items()
-                    if (areas is None or area in areas)
-                    and (record_types is None or record.record_type in record_types)
-                    and (earliest is None or record.time >= earliest)
-                },
-                key=lambda record: record.raw.data,
-            ),
-            key=lambda record: record.time,
-            reverse=newer_first,
+        return self.data.areas.ordered(
+            areas,
+            record_types,
+            dt_util.now() - timedelta(minutes=window) if window else None,
+            newer_first,
         )
 
     def get_records(
@@ -215,38 +422,96 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
     ) -> dict[str, PublishedData]:
         """Return area's raw records keyed by area, filtered by record type."""
         return {
-            area: record.published_data
+            area: published_data
             for area, record in self.data.areas.items()
-            if record.published_data is not None
-            and (record_types is None or record.record_type in record_types)
+            if (record_types is None or record.record_type in record_types)
+            and (published_data := record.published_data) is not None
         }
 
     def get_last_update(self) -> str | None:
         """Return the backend revision token for map consumers."""
         return self._last_update.isoformat() if self._last_update else None
 
-    async def _records_to_process(self) -> AsyncIterator[RecordAndMetadata]:
+    async def _records_to_process(self) -> Iterable[RecordAndMetadata]:
         """Get records from push channels. Otherwise, from polling channels."""
         if any(channel for channel in self._channels):
+            self._push_activity = dt_util.now()
+            records = []
             for channel in self._channels:
                 while channel:
-                    yield channel.popleft()
+                    records.append(channel.popleft())
 
             # Polling channels are postponed to a follow up refresh.
             self.hass.async_create_task(self.async_refresh())
-        else:
-            current, history, history2 = await asyncio.gather(
-                *[
-                    self._async_fetch_url(url)
-                    for url in (OREF_ALERTS_URL, OREF_HISTORY_URL, OREF_HISTORY2_URL)
-                ]
-            )
-            for record in itertools.chain(
-                self._process_history_alerts(history, self._history_to_record),
-                self._process_history_alerts(history2, self._history2_to_record),
-                self._current_to_history_format(current),
+            return records
+        results = await self._async_fetch_endpoints()
+        return itertools.chain(
+            results.get(OREF_HISTORY_URL) or [],
+            results.get(OREF_HISTORY2_URL) or [],
+            self._current_to_history_format(results.get(OREF_ALERTS_URL)),
+        )
+
+    async def _async_fetch_endpoints(self) -> dict[str, Any]:
+        """
+        Fetch the endpoints which are due, and return the fresh results.
+
+        Each endpoint has its own cadence and timeout. The endpoints are
+        redundant, so the refresh waits for the first fetch with new content
+        (i.e. not a 304, throttled or failed one), and gives the other fetches
+        a short grace. Slower fetches continue in the background, and their new
+        content is merged by a follow up refresh (as soon as each one completes).
+        """
+        now = dt_util.now()
+        for endpoint in OREF_ENDPOINTS:
+            if endpoint.url in self._fetches or (
+                (last_fetch := self._fetch_times.get(endpoint.url)) is not None
+                and now - last_fetch < endpoint.interval
             ):
-                yield record
+                continue
+            self._fetch_times[endpoint.url] = now
+            task = self._fetches[endpoint.url] = self.hass.async_create_task(
+                self._async_fetch_endpoint(endpoint), eager_start=True
+            )
+            task.add_done_callback(partial(self._fetch_done, endpoint.url))
+
+        pending = set(self._fetches.values())
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            if any(task.result() is not None for task in done):
+                break
+        if pending:
+            await asyncio.wait(pending, timeout=FETCH_GRACE_SECONDS)
+
+        results = {}
+        for url, task in list(self._fetches.items()):
+            if task.done():
+                results[url] = task.result()
+                del self._fetches[url]
+            else:
+                self._deferred_fetches.add(url)
+        return results
+
+    async def _async_fetch_endpoint(self, endpoint: OrefEndpoint) -> Any:
+        """Fetch an endpoint within its timeout budget (None without new content)."""
+        try:
+            async with asyncio.timeout(endpoint.timeout):
+                return await self._async_fetch_url(
+                    endpoint.url, self._readers.get(endpoint.url)
+                )
+        except TimeoutError:
+            LOGGER.info("Fetching '%s' timed out", endpoint.url)
+            self._fetch_failed = True
+            return None
+
+    @callback
+    def _fetch_done(self, url: str, task: asyncio.Task[Any]) -> None:
+        """Merge the results of a fetch which completed after its refresh."""
+        if url in self._deferred_fetches:
+            self._deferred_fetches.discard(url)
+            if not task.cancelled() and task.result() is not None:
+                self.hass.async_create_task(self.async_refresh())
 
     def _area_records(
         self, record: RecordAndMetadata
@@ -256,24 +521,35 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
             yield record.raw.data, record
 
         else:
+            # Per-area views share everything but the area. Their published
+            # data is built only if a consumer reads it.
             for area in AREAS:
-                yield (
-                    area,
-                    replace(
-                        record,
-                        published_data=self._build_published_data(
-                            area, record.raw, record.time, record.record_type
-                        ),
-                    ),
-                )
+                yield area, replace(record, area=area)
 
     async def _async_update_data(self) -> OrefAlertCoordinatorData:
-        """Request the data from Oref channels."""
+        """Request the data from Oref channels (profiled, when requested)."""
+        start = time.monotonic()
+        self._fetch_failed = False
+        records = await self._records_to_process()
+        # The fetches are awaited, so only the (synchronous) merge is profiled.
+        profiler = self.profiler
+        with profiled(profiler):
+            data = self._merge_records(records)
+        if profiler is not None:
+            profiler.refreshed()
+        self._refreshes.add(time.monotonic() - start)
+        return data
+
+    def _merge_records(
+        self, records: Iterable[RecordAndMetadata]
+    ) -> OrefAlertCoordinatorData:
+        """Merge the records of the channels into the areas."""
         self._remove_expired()
+        last_update = self._last_update
 
         # Update the latest areas' records.
         now = dt_util.now()
-        async for record in self._records_to_process():
+        for record in records:
             # Check if a valid record.
             if (
                 (
@@ -287,9 +563,11 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
 
             # Handle "all areas" record.
             for area, area_record in self._area_records(record):
+                self.race.arrived(area, area_record)
                 # If we don't have anything else for this area.
                 if (current := self._areas.get(area)) is None:
                     self._areas[area] = area_record
+                    self.latency.merged(area, area_record)
                     self._last_update = now
                     if area not in AREAS:
                         LOGGER.error("Alert has an unrecognized area: %s", area)
@@ -306,67 +584,180 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
                     > timedelta(seconds=DEDUP_WINDOW_SECONDS)
                 ):
                     self._areas[area] = area_record
+                    self.latency.merged(area, area_record)
                     self._last_update = now
 
-        return OrefAlertCoordinatorData(MappingProxyType(self._areas))
+        self._adapt_update_interval(updated=self._last_update != last_update)
+        return self._publish()
 
-    def _build_published_data(
-        self,
-        area: str,
-        record: Record,
-        record_time: datetime,
-        record_type: RecordType | None,
-    ) -> PublishedData | None:
-        """Build area-specific published data."""
-        if not (area_info := AREA_INFO.get(area)) or record_type is None:
+    def _adapt_update_interval(self, updated: bool) -> None:  # noqa: FBT001
+        """
+        Adapt the polling interval to the current activity.
+
+        Polling is tightened while there are recent alerts (or pre-alerts), or
+        recent records from the push channels. Otherwise, the interval is doubled
+        (up to a maximum) on every poll without new records, including polls
+        answered with "not modified" and failed polls.
+        """
+        if self.update_interval is None:
+            return
+        now = dt_util.now()
+        if not self._fetch_failed and any(
+            time is not None and now - time < ACTIVITY_WINDOW
+            for time in (
+                self._areas.latest_time((RecordType.ALERT, RecordType.PRE_ALERT)),
+                self._push_activity,
+            )
+        ):
+            self.update_interval = ACTIVE_UPDATE_INTERVAL
+        elif updated and not self._fetch_failed:
+            self.update_interval = UPDATE_INTERVAL
+        else:
+            self.update_interval = min(
+                max(self.update_interval * 2, UPDATE_INTERVAL), MAX_UPDATE_INTERVAL
+            )
+
+    def _publish(self) -> OrefAlertCoordinatorData:
+        """Return the areas with the changes since the previous publication."""
+        added, changed, removed = self._areas.pop_changes()
+        self._journal_changes(itertools.chain(added, changed), removed)
+        self._revision += 1
+        return OrefAlertCoordinatorData(
+            self._areas.snapshot(), self._revision, added, changed, removed
+        )
+
+    def _journal_changes(self, updated: Iterable[str], removed: Iterable[str]) -> None:
+        """Append the changes to the journal (an entry per distinct record)."""
+        records: dict[Record, tuple[RecordAndMetadata, list[str]]] = {}
+        for area in updated:
+            record = self._areas[area]
+            records.setdefault(record.raw, (record, []))[1].append(area)
+        entries: list[dict[str, Any]] = [
+            {CONF_AREAS: areas, ATTR_RECORD: record.raw_dict}
+            for record, areas in records.values()
+        ]
+        if removed := list(removed):
+            entries.append({CONF_AREAS: removed})
+        self._journal.append(entries)
+
+    def _build_published_data(self, record: RecordAndMetadata) -> PublishedData | None:
+        """Build area-specific published data (called lazily on first access)."""
+        area = record.area or record.raw.data
+        if not (area_info := AREA_INFO.get(area)) or record.record_type is None:
             return None
 
         return {
             ATTR_AREA: area,
-            ATTR_HOME_DISTANCE: round(
-                vincenty(
-                    (self.hass.config.latitude, self.hass.config.longitude),
-                    (area_info["lat"], area_info["lon"]),
-                )
-                or 0,
-                1,
-            ),
+            ATTR_HOME_DISTANCE: self._home_distance(area),
             ATTR_LATITUDE: area_info["lat"],
             ATTR_LONGITUDE: area_info["lon"],
-            CATEGORY_FIELD: record.category,
-            TITLE_FIELD: record.title,
-            ATTR_ICON: category_to_icon(record.category),
-            ATTR_EMOJI: category_to_emoji(record.category),
+            CATEGORY_FIELD: record.raw.category,
+            TITLE_FIELD: record.raw.title,
+            ATTR_ICON: category_to_icon(record.raw.category),
+            ATTR_EMOJI: category_to_emoji(record.raw.category),
             ATTR_DISTRICT: AREA_TO_DISTRICT.get(area, ""),
-            CHANNEL_FIELD: record.channel,
-            ATTR_TYPE: record_type.value,
-            ATTR_DATE: record_time.isoformat(),
+            CHANNEL_FIELD: record.raw.channel,
+            ATTR_TYPE: record.record_type.value,
+            ATTR_DATE: record.time.isoformat(),
         }
 
-    def _remove_expired(self) -> None:
-        """Remove expired records and add a synthetic "end" record instead."""
+    def _home_distance(self, area: str) -> float:
+        """Return the distance of the area from home, using a precomputed table."""
+        if (
+            home := (self.hass.config.latitude, self.hass.config.longitude)
+        ) != self._home_location:
+            # The table is (re)built only when the home location changes.
+            self._home_location = home
+            self._home_distances = {
+                name: round(vincenty(home, (info["lat"], info["lon"])) or 0, 1)
+                for name, info in AREA_INFO.items()
+            }
+        return self._home_distances[area]
+
+    def _remove_expired(self) -> bool:
+        """Replace expired records with a synthetic "end" record."""
         now = dt_util.now(IST)
+        if not (expired := self._areas.pop_expired(now)):
+            return False
         now_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        for area, record in self._areas.items():
-            if record.expire and record.expire <= now:
-                self._areas[area] = self.add_metadata(
-                    Record(
-                        alertDate=now_str,
-                        title=EXPIRED_EVENT_END_TITLE,
-                        data=area,
-                        category=END_ALERT_CATEGORY,
-                        channel=RecordSource.SYNTHETIC,
-                    )
+        for area in expired:
+            self._areas[area] = self.add_metadata(
+                Record(
+                    alertDate=now_str,
+                    title=EXPIRED_EVENT_END_TITLE,
+                    data=area,
+                    category=END_ALERT_CATEGORY,
+                    channel=RecordSource.SYNTHETIC,
                 )
-                self._last_update = now
+            )
+        self._last_update = now
+        return True
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        """Schedule a refresh and the timer of the next expiration."""
+        super()._schedule_refresh()
+        self._schedule_expiry()
+
+    @callback
+    def _unschedule_refresh(self) -> None:
+        """Unschedule the refresh and expiration timers (no more listeners)."""
+        super()._unschedule_refresh()
+        self._unsub_expiry_timer()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners (measuring the merged records)."""
+        self.latency.notified()
+        start = time.monotonic()
+        with profiled(self.profiler):
+            super().async_update_listeners()
+        self._fan_out.add(time.monotonic() - start)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled call, and ignore new runs."""
+        await super().async_shutdown()
+        self._push_refresh.async_shutdown()
+        self._unsub_expiry_timer()
+        await self.async_stop_capture()
+        fetches = list(self._fetches.values())
+        self._fetches.clear()
+        for task in fetches:
+            task.cancel()
+        await asyncio.gather(*fetches, return_exceptions=True)
+
+    @callback
+    def _schedule_expiry(self) -> None:
+        """Schedule a timer for the earliest expiration of a stored record."""
+        self._unsub_expiry_timer()
+        if (expire := self._areas.next_expiry()) is not None:
+            self._unsub_expiry = async_track_point_in_time(
+                self.hass, self._handle_expiry, expire
+            )
+
+    def _unsub_expiry_timer(self) -> None:
+        """Cancel the expiration timer."""
+        if self._unsub_expiry is not None:
+            self._unsub_expiry()
+            self._unsub_expiry = None
+
+    @callback
+    def _handle_expiry(self, _: datetime) -> None:
+        """Publish expired records as "end" records at their expiration time."""
+        self._unsub_expiry = None
+        if self._remove_expired():
+            self.async_set_updated_data(self._publish())
+        else:
+            self._schedule_expiry()
 
     def add_metadata(
-        self, record: Record, record_expire: datetime | None = None
+        self,
+        record: Record,
+        record_expire: datetime | None = None,
+        received: float | None = None,
     ) -> RecordAndMetadata:
-        """Calculate record metadata."""
-        record_time = dt_util.parse_datetime(
-            record.alertDate, raise_on_error=True
-        ).replace(tzinfo=IST)
+        """Calculate record metadata (the record was received now, by default)."""
+        record_time = _parse_alert_date(record.alertDate)
 
         record_type = CATEGORY_TO_RECORD_TYPE.get(record.category, RecordType.ALERT)
 
@@ -376,61 +767,360 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
         ):
             record_expire = record_time + timedelta(minutes=expiration)
 
+        processed = time.time()
         return RecordAndMetadata(
             raw=record,
-            raw_dict=asdict(record),
-            published_data=self._build_published_data(
-                record.data, record, record_time, record_type
-            ),
+            timestamp=int(record_time.timestamp()),
             record_type=record_type,
-            time=record_time,
             expire=record_expire,
+            publisher=self._build_published_data,
+            received=received or processed,
+            processed=processed,
+        )
+
+    def add_metadata_batch(  # noqa: PLR0913
+        self,
+        areas: Iterable[str],
+        alertDate: str,  # noqa: N803
+        title: str,
+        category: int,
+        channel: str,
+        *,
+        received: float | None = None,
+    ) -> list[RecordAndMetadata]:
+        """
+        Calculate the metadata of an alert's records (a record per area).
+
+        The metadata is calculated once, and is shared by the areas' records.
+        """
+        areas = iter(areas)
+        if (first_area := next(areas, None)) is None:
+            return []
+        first = self.add_metadata(
+            Record(first_area, category, channel, alertDate, title), received=received
         )
+        raw = first.raw
+        return [
+            first,
+            *(
+                replace(
+                    first,
+                    raw=Record(
+                        area, raw.category, raw.channel, raw.alertDate, raw.title
+                    ),
+                )
+                for area in areas
+            ),
+        ]
 
-    async def _async_fetch_url(self, url: str) -> Any:
-        """Fetch data from Oref servers."""
-        exc_info = Exception()
+    async def _async_fetch_url(
+        self,
+        url: str,
+        reader: Reader | None = None,
+    ) -> Any:
+        """
+        Fetch data from Oref servers (parsed by the reader, JSON by default).
+
+        Return None when there is no new content (not modified, throttled or
+        failed).
+        """
+        exc_info: Exception | None = None
         now = dt_util.now().timestamp()
         last_modified, last_request = self._http_replies.get(url, ("", 0))
+        counters = self._fetch_counters.setdefault(url, FetchCounters())
         if (now - last_request) < REQUEST_THROTTLING:
-            return []
+            counters.outcomes["throttled"] += 1
+            return None
         headers = (
             OREF_HEADERS
             if not last_modified
             else {"If-Modified-Since": last_modified, **OREF_HEADERS}
         )
+        breaker = self._circuit_breakers.setdefault(url, CircuitBreaker())
         for _ in range(REQUEST_RETRIES):
+            if not breaker.allow(dt_util.now().timestamp()):
+                counters.outcomes["skipped"] += 1
+                break
             try:
-                async with self._http_client.get(url, headers=headers) as response:
-                    if response.status == HTTPStatus.NOT_MODIFIED:
-                        self._http_replies[url] = (last_modified, now)
-                        return []
-                    raw = await response.read()
-                    text = raw.decode("utf-8-sig").replace("\x00", "").strip()
-                    try:
-                        content = None if not text else json.loads(text)
-                    except:
-                        LOGGER.debug(
-                            "JSON parsing failed for '%s': '%s' hex: '%s'",
-                            url,
-                            text,
-                            text.encode("utf-8").hex(),
-                        )
-                        raise
-                    self._http_replies[url] = (
-                        response.headers.get("Last-Modified", ""),
-                        now,
+                async with asyncio.timeout(REQUEST_TIMEOUT):
+                    modified, content = await self._async_hedged_request(
+                        url, headers, reader
                     )
-                    return content or []
+            except asyncio.CancelledError:
+                # E.g. the endpoint's budget elapsed, or a shutdown.
+                breaker.release()
+                raise
             except Exception as ex:  # noqa: BLE001
                 exc_info = ex
+                counters.outcomes["error"] += 1
+                breaker.record_failure(dt_util.now().timestamp())
+            else:
+                breaker.record_success()
+                self._http_replies[url] = (
+                    last_modified if modified is None else modified,
+                    now,
+                )
+                return None if modified is None else content or []
+
+        if exc_info is None:
+            LOGGER.debug("Skipping '%s' (circuit is %s)", url, breaker.state)
+        else:
+            LOGGER.info(
+                "Failed to fetch '%s'",
+                url,
+                exc_info=exc_info,
+            )
+        self._fetch_failed = True
+        return None
+
+    async def _async_hedged_request(
+        self,
+        url: str,
+        headers: dict[str, str],
+        reader: Reader | None,
+    ) -> tuple[str | None, Any]:
+        """
+        Send a request, and a duplicate one if the first is slower than usual.
+
+        The duplicate is sent once the request takes longer than a percentile
+        of the URL's recent latencies, so only the rare stalled requests are
+        duplicated. The first successful reply wins, and only its updates (of the
+        reader's state and of the capture) are applied.
+        """
+        start = time.monotonic()
+        requests = {
+            self.hass.async_create_task(
+                self._async_request(url, headers, reader), eager_start=True
+            )
+        }
+        if (delay := self._hedge_delay(url)) is not None and not (
+            await asyncio.wait(requests, timeout=delay)
+        )[0]:
+            LOGGER.debug("Sending a duplicate request to '%s'", url)
+            requests.add(
+                self.hass.async_create_task(
+                    self._async_request(url, headers, reader), eager_start=True
+                )
+            )
+        try:
+            while True:
+                done, requests = await asyncio.wait(
+                    requests, return_when=asyncio.FIRST_COMPLETED
+                )
+                if succeeded := [task for task in done if not task.exception()]:
+                    latency = time.monotonic() - start
+                    self._latencies.setdefault(url, deque(maxlen=HEDGE_SAMPLES)).append(
+                        latency
+                    )
+                    self._fetch_counters[url].latency.add(latency)
+                    return succeeded[0].result().use()
+                if not requests:
+                    return done.pop().result().use()
+        finally:
+            for task in requests:
+                task.cancel()
+
+    def _hedge_delay(self, url: str) -> float | None:
+        """Return the latency percentile of the URL (when there are enough samples)."""
+        if len(latencies := self._latencies.get(url, ())) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(
+            sorted(latencies)[int(len(latencies) * HEDGE_PERCENTILE)], HEDGE_MIN_DELAY
+        )
 
+    async def _async_request(
+        self,
+        url: str,
+        headers: dict[str, str],
+        reader: Reader | None,
+    ) -> _Reply:
+        """Return the reply (which is captured only if it's used)."""
+        async with self._http_client.get(url, headers=headers) as received:
+            response = received
+            reply = _Reply(None)
+            if self.capture is not None:
+                # The reader gets the buffered body.
+                buffered = await BufferedResponse.async_read(received)
+                response = cast("ClientResponse", buffered)
+                reply.updates.append(partial(self._capture_response, url, buffered))
+            self._fetch_counters[url].outcomes[str(response.status)] += 1
+            if response.status == HTTPStatus.NOT_MODIFIED:
+                return reply
+            reply.content, update = await (reader or self._read_json)(url, response)
+            if update is not None:
+                reply.updates.append(update)
+            reply.last_modified = response.headers.get("Last-Modified", "")
+            return reply
+
+    def _capture_response(self, url: str, response: BufferedResponse) -> None:
+        """Add a used response to the capture (if it's still on)."""
+        if self.capture is not None:
+            self.capture.record_response(url, response)
+
+    def start_capture(self, duration: float) -> Path:
+        """Capture the channels' traffic for a duration, and return the file's path."""
+        if self.capture is not None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="capture_in_progress",
+                translation_placeholders={"path": str(self.capture.path)},
+            )
+        self.capture = TrafficCapture(
+            Path(
+                self.hass.config.path(
+                    CAPTURE_FILE.format(timestamp=int(dt_util.now().timestamp()))
+                )
+            )
+        )
+        self._unsub_capture = async_call_later(
+            self.hass, duration, self.async_stop_capture
+        )
+        LOGGER.info("Capturing the traffic to '%s'", self.capture.path)
+        return self.capture.path
+
+    async def async_stop_capture(self, *_: Any) -> None:
+        """Stop the capture (if any), and save it."""
+        if self._unsub_capture is not None:
+            self._unsub_capture()
+            self._unsub_capture = None
+        if (capture := self.capture) is None:
+            return
+        self.capture = None
+        await capture.async_save(self.hass)
         LOGGER.info(
-            "Failed to fetch '%s'",
-            url,
-            exc_info=exc_info,
+            "Saved %d captured payloads to '%s' (%d dropped beyond the size limit)",
+            len(capture),
+            capture.path,
+            capture.dropped,
         )
-        return []
+
+    async def async_profile(
+        self,
+        duration: float,
+        refreshes: int | None = None,
+        *,
+        entries: int = PROFILE_TOP_ENTRIES,
+        save: bool = False,
+    ) -> dict[str, Any]:
+        """Profile the refresh pipeline for a duration (or refreshes), and report."""
+        if self.profiler is not None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="profile_in_progress"
+            )
+        try:
+            profiler = self.profiler = RefreshProfiler(refreshes)
+        except ValueError as ex:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="profiler_active"
+            ) from ex
+        try:
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(duration):
+                    await profiler.done.wait()
+        finally:
+            self.profiler = None
+        report: dict[str, Any] = {
+            "refreshes": profiler.refreshes,
+            "interrupted": profiler.interrupted,
+            "entries": profiler.top(entries),
+        }
+        if save:
+            path = Path(
+                self.hass.config.path(
+                    PROFILE_FILE.format(timestamp=int(dt_util.now().timestamp()))
+                )
+            )
+            await self.hass.async_add_executor_job(profiler.dump, path)
+            report["path"] = str(path)
+        return report
+
+    @property
+    def circuit_breakers(self) -> dict[str, dict[str, Any]]:
+        """Return the state of the endpoints' circuit breakers."""
+        return {
+            url: breaker.as_dict() for url, breaker in self._circuit_breakers.items()
+        }
+
+    @property
+    def counters(self) -> dict[str, Any]:
+        """Return the performance counters."""
+        return {
+            "refresh": self._refreshes.as_dict(),
+            "fan_out": {**self._fan_out.as_dict(), "listeners": len(self._listeners)},
+            "fetches": {
+                url: counters.as_dict()
+                for url, counters in self._fetch_counters.items()
+            },
+            "areas": len(self._areas),
+            "home_distances": len(self._home_distances),
+        }
+
+    @staticmethod
+    async def _read_json(url: str, response: ClientResponse) -> tuple[Any, None]:
+        """Read and parse the entire JSON content (there is no state to update)."""
+        raw = await response.read()
+        text = raw.decode("utf-8-sig").replace("\x00", "").strip()
+        try:
+            return None if not text else json.loads(text), None
+        except:
+            LOGGER.debug(
+                "JSON parsing failed for '%s': '%s' hex: '%s'",
+                url,
+                text,
+                text.encode("utf-8").hex(),
+            )
+            raise
+
+    async def _read_history(
+        self,
+        url: str,
+        response: ClientResponse,
+        payload_to_record: Callable[[dict[str, Any]], Record],
+    ) -> tuple[list[RecordAndMetadata], Callable[[], None] | None]:
+        """
+        Parse the history records while they are received.
+
+        The reading stops at the initial fetch's cutoff, and at records older
+        than the overlap of a previous fetch of the URL. Records can be published
+        late (with an older alert date), so the records within the overlap are
+        read, and the ones which were already processed are skipped. The overlap
+        is updated only if the reply is used.
+        """
+        # The cutoff of the initial fetch applies only when there is no update.
+        complete = self._last_update is not None
+        seen = self._history_seen.get(url, {})
+        try:
+            records = [
+                record
+                async for record in self._process_history_alerts(
+                    async_iter_json_array(response.content.iter_any()),
+                    payload_to_record,
+                    self._history_marks.get(url),
+                    seen,
+                )
+            ]
+        except JSONStreamError as ex:
+            LOGGER.debug("JSON parsing failed for '%s': '%s'", url, ex)
+            raise
+        if not complete or not records:
+            return records, None
+        return records, partial(self._update_history_overlap, url, records)
+
+    def _update_history_overlap(
+        self, url: str, records: list[RecordAndMetadata]
+    ) -> None:
+        """Update the overlap of a history URL with the records which were read."""
+        mark = max(record.time for record in records) - HISTORY_OVERLAP
+        mark = self._history_marks[url] = max(mark, self._history_marks.get(url, mark))
+        earliest = mark.timestamp()
+        self._history_seen[url] = {
+            raw: timestamp
+            for raw, timestamp in itertools.chain(
+                self._history_seen.get(url, {}).items(),
+                ((record.raw, record.timestamp) for record in records),
+            )
+            if timestamp >= earliest
+        }
 
     def _current_to_history_format(self, current: Any) -> Generator[RecordAndMetadata]:
         """Yield current alerts payload converted to history format."""
@@ -474,7 +1164,7 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
         """Set selected active alerts as manual-end records."""
         now = dt_util.now(IST)
         now_str = now.strftime("%Y-%m-%d %H:%M:%S")
-        for area, current in self._areas.copy().items():
+        for area, current in list(self._areas.items()):
             if current.record_type != RecordType.ALERT:
                 continue
             if areas is not None and area not in areas:
@@ -512,19 +1202,26 @@ class OrefAlertDataUpdateCoordinator(DataUpdateCoordinator[OrefAlertCoordinatorD
             channel=RecordSource.HISTORY,
         )
 
-    def _process_history_alerts(
+    async def _process_history_alerts(
         self,
-        records: list[dict[str, Any]],
+        records: AsyncIterable[dict[str, Any]],
         payload_to_record: Callable[[dict[str, Any]], Record],
-    ) -> Generator[RecordAndMetadata]:
-        """Yield latest history record per area with metadata."""
+        earliest: datetime | None = None,
+        seen: Container[Record] = (),
+    ) -> AsyncGenerator[RecordAndMetadata]:
+        """Yield latest history record per area with metadata (newer first)."""
         now = dt_util.now()
         areas = set()
-        for record in records:
+        async for record in records:
             if record[AREA_FIELD] in areas:
                 continue
             areas.add(record[AREA_FIELD])
             record_meta = self.add_metadata(payload_to_record(record))
+            if earliest is not None and record_meta.time < earliest:
+                break
+            if record_meta.raw in seen:
+                # The area's latest record was processed by a previous fetch.
+                continue
             yield record_meta
 
             # Post initial fetch, take only recent records.
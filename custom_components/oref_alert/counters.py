@@ -0,0 +1,106 @@
+"""Performance counters (for the diagnostics)."""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from http import HTTPStatus
+from typing import Any
+
+from .metadata.area_info import AREA_INFO
+from .metadata.area_to_district import AREA_TO_DISTRICT
+from .metadata.area_to_migun_time import AREA_TO_MIGUN_TIME
+from .metadata.area_to_polygon import loaded_area_to_polygon
+from .metadata.areas import AREAS
+from .metadata.areas_and_groups import AREAS_AND_GROUPS
+from .metadata.district_to_areas import DISTRICT_AREAS
+from .metadata.segment_to_area import SEGMENT_TO_AREA
+from .metadata.tzevaadom_id_to_area import TZEVAADOM_ID_TO_AREA
+
+
+class Timing:
+    """Count and durations (seconds) of an operation."""
+
+    __slots__ = ("count", "last", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, duration: float) -> None:
+        """Count an operation."""
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.last = duration
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters."""
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 4) if self.count else None,
+            "max": round(self.max, 4),
+            "last": round(self.last, 4),
+        }
+
+
+class FetchCounters:
+    """Counters of a URL's fetches."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.latency = Timing()
+        # HTTP status codes, "error", "skipped" (open circuit), and "throttled".
+        self.outcomes: Counter[str] = Counter()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters."""
+        replies = sum(
+            count for outcome, count in self.outcomes.items() if outcome.isdigit()
+        )
+        return {
+            "latency": self.latency.as_dict(),
+            "outcomes": dict(self.outcomes),
+            "not_modified_rate": round(
+                self.outcomes[str(HTTPStatus.NOT_MODIFIED.value)] / replies, 3
+            )
+            if replies
+            else None,
+        }
+
+
+def deep_size(obj: Any, seen: set[int] | None = None) -> int:
+    """Return the memory (bytes) of an object and the objects it contains."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(
+            deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items()
+        )
+    elif isinstance(obj, list | tuple | set | frozenset):
+        size += sum(deep_size(item, seen) for item in obj)
+    return size
+
+
+def metadata_memory() -> dict[str, int]:
+    """Return the memory (bytes) of the metadata tables (it's slow, use executor)."""
+    return {
+        name: deep_size(table)
+        for name, table in (
+            ("area_info", AREA_INFO),
+            ("area_to_district", AREA_TO_DISTRICT),
+            ("area_to_migun_time", AREA_TO_MIGUN_TIME),
+            ("area_to_polygon", loaded_area_to_polygon()),
+            ("areas", AREAS),
+            ("areas_and_groups", AREAS_AND_GROUPS),
+            ("district_to_areas", DISTRICT_AREAS),
+            ("segment_to_area", SEGMENT_TO_AREA),
+            ("tzevaadom_id_to_area", TZEVAADOM_ID_TO_AREA),
+        )
+    }
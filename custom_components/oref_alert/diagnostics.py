@@ -4,13 +4,33 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from .counters import metadata_memory
+
 if TYPE_CHECKING:
-    from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
+    from . import OrefAlertConfigEntry
+
 
 async def async_get_config_entry_diagnostics(
-    _: HomeAssistant, entry: ConfigEntry
+    hass: HomeAssistant, entry: OrefAlertConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    return dict(entry.options)
+    return {
+        "options": dict(entry.options),
+        "circuit_breakers": entry.runtime_data.coordinator.circuit_breakers,
+        "latency": entry.runtime_data.coordinator.latency.as_dict(),
+        "race": entry.runtime_data.coordinator.race.as_dict(),
+        "restore": {
+            "areas": entry.runtime_data.coordinator.restore_stats,
+            "history": entry.runtime_data.bus_events.restore_stats,
+        },
+        "performance": {
+            "coordinator": entry.runtime_data.coordinator.counters,
+            "pushy": entry.runtime_data.pushy.counters,
+            "pushy_connection": entry.runtime_data.pushy.health.as_dict(),
+            "tzevaadom": entry.runtime_data.tzevaadom.counters,
+            "bus_events": entry.runtime_data.bus_events.counters,
+            "metadata_memory": await hass.async_add_executor_job(metadata_memory),
+        },
+    }
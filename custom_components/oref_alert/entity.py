@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -12,6 +13,8 @@ from .const import DOMAIN
 from .coordinator import OrefAlertDataUpdateCoordinator
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
     from . import OrefAlertConfigEntry
 
 
@@ -36,7 +39,28 @@ class OrefAlertCoordinatorEntity(
 ):
     """Base class for entities that use a coordinator."""
 
+    # Entities depending only on some areas skip updates not touching them.
+    _tracked_areas: Collection[str] | None = None
+
     def __init__(self, config_entry: OrefAlertConfigEntry) -> None:
         """Initialize the entity with a coordinator."""
         OrefAlertEntity.__init__(self, config_entry)
         CoordinatorEntity.__init__(self, config_entry.runtime_data.coordinator)  # pyright: ignore[reportArgumentType]
+        self._revision: int | None = None
+
+    def _tracked_areas_updated(self) -> bool:
+        """Return whether the coordinator's update is relevant for the entity."""
+        data = self.coordinator.data
+        areas = data.changes_since(self._revision)
+        self._revision = data.revision
+        return (
+            areas is None
+            or self._tracked_areas is None
+            or not areas.isdisjoint(self._tracked_areas)
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        if self._tracked_areas_updated():
+            super()._handle_coordinator_update()
@@ -63,6 +63,7 @@ class AlertEvent(OrefAlertCoordinatorEntity, EventEntity):
         super().__init__(config_entry)
         self._attr_event_types = list(RecordType)
         self._area = area
+        self._tracked_areas = (area,)
         if not name:
             self.use_device_name = True
             self._attr_unique_id = OREF_ALERT_UNIQUE_ID
@@ -88,7 +89,8 @@ class AlertEvent(OrefAlertCoordinatorEntity, EventEntity):
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         if (
-            (record := self.coordinator.data.areas.get(self._area)) is not None
+            self._tracked_areas_updated()
+            and (record := self.coordinator.data.areas.get(self._area)) is not None
             and record.record_type is not None
             and self._record != record
         ):
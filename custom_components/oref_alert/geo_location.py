@@ -31,6 +31,8 @@ from .const import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Set as AbstractSet
+
     from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
     from . import OrefAlertConfigEntry
@@ -123,8 +125,12 @@ class OrefAlertLocationEvent(GeolocationEvent):
     @callback
     def async_update(self, record: RecordAndMetadata) -> None:
         """Update the record and extra attributes when needed."""
-        if self._record and record != self._record and record.published_data:
-            self._update_record(record, record.published_data)
+        if (
+            self._record
+            and record != self._record
+            and (published_data := record.published_data)
+        ):
+            self._update_record(record, published_data)
             self.async_write_ha_state()
 
 
@@ -142,6 +148,7 @@ class OrefAlertLocationEventManager:
         self._hass = hass
         self._config_entry = config_entry
         self._async_add_entities = async_add_entities
+        self._revision: int | None = None
         self._coordinator: OrefAlertDataUpdateCoordinator = (
             config_entry.runtime_data.coordinator
         )
@@ -150,24 +157,27 @@ class OrefAlertLocationEventManager:
 
     @callback
     def _async_update(self) -> None:
-        """Add and/or remove entities according to the new records list."""
-        exists = set(self._location_events.keys())
-        for area in exists:
+        """Add and/or remove entities according to the updated areas."""
+        data = self._coordinator.data
+        areas: AbstractSet[str] | None = data.changes_since(self._revision)
+        if areas is None:
+            areas = self._location_events.keys() | data.areas.keys()
+        self._revision = data.revision
+
+        to_add: dict[str, OrefAlertLocationEvent] = {}
+        for area in areas:
             if (
-                record := self._coordinator.data.areas.get(area)
-            ) and record.record_type == RecordType.ALERT:
-                self._location_events[area].async_update(record)
-            else:
-                self._location_events.pop(area).async_remove_self()
-
-        to_add = {
-            area: OrefAlertLocationEvent(
-                self._config_entry, area, record, record.published_data
-            )
-            for area in set(self._coordinator.data.areas.keys()) - exists
-            if (record := self._coordinator.data.areas.get(area))
-            and record.record_type == RecordType.ALERT
-            and record.published_data is not None
-        }
+                record := data.areas.get(area)
+            ) is None or record.record_type != RecordType.ALERT:
+                if (
+                    location_event := self._location_events.pop(area, None)
+                ) is not None:
+                    location_event.async_remove_self()
+            elif (location_event := self._location_events.get(area)) is not None:
+                location_event.async_update(record)
+            elif (published_data := record.published_data) is not None:
+                to_add[area] = OrefAlertLocationEvent(
+                    self._config_entry, area, record, published_data
+                )
         self._location_events.update(to_add)
         self._async_add_entities(to_add.values())
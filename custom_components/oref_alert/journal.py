@@ -0,0 +1,160 @@
+"""Append-only journal of the changes since the last stored snapshot."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util.file import write_utf8_file
+
+from .const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
+
+JOURNAL_COMPACTION_ENTRIES: Final = 1000
+GENERATION_KEY: Final = "journal"
+
+
+def journal_path(hass: HomeAssistant, key: str) -> Path:
+    """Return the path of the journal of a storage key."""
+    return Path(hass.config.path(STORAGE_DIR, f"{key}.journal"))
+
+
+def _read(path: Path) -> tuple[int | None, list[Any]]:
+    """Return the generation and the entries of a journal file."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except FileNotFoundError:
+        return None, []
+    entries = []
+    for line in lines:
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            # The last write was interrupted.
+            LOGGER.debug("Ignoring a partial entry in '%s'", path)
+            break
+    if not entries or not isinstance(entries[0], dict):
+        return None, []
+    return entries[0].get(GENERATION_KEY), entries[1:]
+
+
+def _append(path: Path, entries: list[Any]) -> None:
+    """Append entries to a journal file (and flush them to the disk)."""
+    with path.open("a", encoding="utf-8") as file:
+        file.write(
+            "".join(f"{json.dumps(entry, ensure_ascii=False)}\n" for entry in entries)
+        )
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _reset(path: Path, generation: int) -> None:
+    """Replace a journal file with an empty one of the generation."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_utf8_file(str(path), f"{json.dumps({GENERATION_KEY: generation})}\n")
+
+
+class Journal:
+    """
+    Persist data as a stored snapshot and an append-only journal.
+
+    Changes are appended to the journal as they happen, so they survive a
+    crash, and are compacted into a new snapshot occasionally. The snapshot
+    and the journal carry a generation, so a journal which was already
+    compacted (e.g. a crash before it was reset) is not replayed. While the
+    data is restored (e.g. in the background), the compactions are deferred,
+    so a partial snapshot doesn't replace the complete one.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: Store[dict[str, Any]],
+        snapshot: Callable[[], dict[str, Any]],
+    ) -> None:
+        """Initialize the journal of the store."""
+        self._hass = hass
+        self._store = store
+        self._path = journal_path(hass, store.key)
+        self._snapshot = snapshot
+        self._generation = 0
+        self._entries = 0
+        self._pending: list[Any] = []
+        self._lock = asyncio.Lock()
+        self._flush: asyncio.Task[None] | None = None
+        self._restore: asyncio.Future[Any] | None = None
+
+    async def async_load(self) -> tuple[dict[str, Any] | None, list[Any]]:
+        """Return the snapshot, and the journal entries which follow it."""
+        stored = await self._store.async_load()
+        self._generation = (stored or {}).get(GENERATION_KEY, 0)
+        async with self._lock:
+            generation, entries = await self._hass.async_add_executor_job(
+                _read, self._path
+            )
+            if generation != self._generation:
+                entries = []
+                await self._hass.async_add_executor_job(
+                    _reset, self._path, self._generation
+                )
+            self._entries = len(entries)
+        return stored, entries
+
+    @callback
+    def append(self, entries: Iterable[Any]) -> None:
+        """Append entries to the journal (in the background)."""
+        self._pending.extend(entries)
+        if self._pending and self._flush is None:
+            self._flush = self._hass.async_create_task(self._async_flush())
+
+    @callback
+    def defer_compaction(self, restore: asyncio.Future[Any]) -> None:
+        """Defer the compactions until the data is restored."""
+        self._restore = restore
+
+    async def async_compact(self) -> None:
+        """Store a new snapshot, and reset the journal (once restored)."""
+        if self._restore is not None:
+            await asyncio.wait([self._restore])
+            if self._restore.cancelled() or self._restore.exception() is not None:
+                # The data is partial, so the snapshot and the journal are kept.
+                return
+        async with self._lock:
+            # The snapshot covers the entries which were not written yet (and
+            # the ones which were written while waiting for the lock).
+            data = self._snapshot()
+            self._pending.clear()
+            self._generation += 1
+            await self._store.async_save({**data, GENERATION_KEY: self._generation})
+            await self._hass.async_add_executor_job(
+                _reset, self._path, self._generation
+            )
+            self._entries = 0
+
+    async def _async_flush(self) -> None:
+        """Write the pending entries."""
+        try:
+            async with self._lock:
+                while self._pending:
+                    entries, self._pending = self._pending, []
+                    await self._hass.async_add_executor_job(
+                        _append, self._path, entries
+                    )
+                    self._entries += len(entries)
+        finally:
+            self._flush = None
+        # The compaction is deferred to a later flush when the data is restored.
+        if self._entries >= JOURNAL_COMPACTION_ENTRIES and (
+            self._restore is None or self._restore.done()
+        ):
+            await self.async_compact()
@@ -0,0 +1,89 @@
+"""Incremental parsing of a JSON array while it's being received."""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterable, Generator
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class JSONStreamError(ValueError):
+    """Invalid JSON array."""
+
+
+class _ArrayParser:
+    """Parse the items of a JSON array from text fragments."""
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._buffer = ""
+        self._position = 0
+        self._started = False
+        self.done = False
+
+    def feed(self, text: str, *, final: bool = False) -> Generator[Any]:
+        """Add text and yield the complete items."""
+        self._buffer = self._buffer[self._position :] + text
+        self._position = 0
+        while not self.done and (char := self._next_char()) is not None:
+            if not self._started:
+                if char != "[":
+                    raise JSONStreamError(self._buffer[self._position :])
+                self._started = True
+                self._position += 1
+            elif char == "]":
+                self.done = True
+            elif char == ",":
+                self._position += 1
+            else:
+                try:
+                    item, end = _DECODER.raw_decode(self._buffer, self._position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise JSONStreamError(self._buffer[self._position :]) from None
+                    return
+                # A value at the end of the buffer might be truncated (e.g. number).
+                if end == len(self._buffer) and not final:
+                    return
+                self._position = end
+                yield item
+        if final and self._started and not self.done:
+            raise JSONStreamError(self._buffer[self._position :])
+
+    def _next_char(self) -> str | None:
+        """Skip whitespaces and return the next character (if any)."""
+        while (
+            self._position < len(self._buffer)
+            and self._buffer[self._position] in _WHITESPACE
+        ):
+            self._position += 1
+        return (
+            self._buffer[self._position] if self._position < len(self._buffer) else None
+        )
+
+
+async def async_iter_json_array(
+    chunks: AsyncIterable[bytes],
+) -> AsyncGenerator[Any]:
+    """
+    Yield the items of a JSON array, one by one, as the chunks arrive.
+
+    The remaining chunks are not read once the consumer stops iterating, or
+    once the array ends. An empty content is treated as an empty array (like
+    the non-streaming parsing). BOM and NUL characters are ignored.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    parser = _ArrayParser()
+    async for chunk in chunks:
+        for item in parser.feed(decoder.decode(chunk).replace("\x00", "")):
+            yield item
+        if parser.done:
+            return
+    for item in parser.feed(decoder.decode(b"", final=True), final=True):
+        yield item
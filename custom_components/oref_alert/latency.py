@@ -0,0 +1,157 @@
+"""Latency of the alerts' processing (from the alerts' time) per channel."""
+
+from __future__ import annotations
+
+import bisect
+import enum
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final
+
+from .const import RecordSource
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from .const import Record, RecordAndMetadata
+
+# Upper bounds (seconds) of the histograms' buckets (the last one is unbounded).
+LATENCY_BUCKETS: Final = (0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60, 120, 300)
+# The channels whose alerts' time is the time they were received (not measured).
+UNTIMED_CHANNELS: Final = frozenset({RecordSource.WEBSITE})
+
+
+class LatencyStage(enum.StrEnum):
+    """Stage of an alert's processing."""
+
+    RECEIVED = "received"
+    METADATA = "metadata"
+    MERGED = "merged"
+    NOTIFIED = "notified"
+    STATE_WRITTEN = "state_written"
+
+
+class LatencyHistogram:
+    """Bucketed distribution of latencies."""
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self._buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def add(self, latency: float) -> None:
+        """Add a sample (negative latencies are due to clocks' skew)."""
+        latency = max(latency, 0.0)
+        self._buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self._total += latency
+        self._max = max(self._max, latency)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return the upper bound of the bucket of a percentile (max if unbounded)."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self._buckets, strict=False):
+            seen += count
+            if count and seen >= rank:
+                return bound
+        return round(self._max, 3)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram's summary and buckets."""
+        return {
+            "count": self.count,
+            "mean": round(self._total / self.count, 3) if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": round(self._max, 3),
+            "buckets": {
+                f"le_{bound}": count
+                for bound, count in zip(
+                    (*LATENCY_BUCKETS, "inf"), self._buckets, strict=True
+                )
+            },
+        }
+
+
+@dataclass(slots=True)
+class _PendingRecord:
+    """A merged record whose later stages are not measured yet."""
+
+    channel: str
+    timestamp: int
+    areas: set[str] = field(default_factory=set)
+
+
+class LatencyTracker:
+    """
+    Measure the latency of each processing stage, per channel.
+
+    The latencies are measured from the alert's time (as published by the
+    channel), so the channels without an alert time are not measured. The first
+    stages are stamped on the record when it's received
+    (and its metadata is added), and the later ones are measured for the
+    records which were merged by an update.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self._histograms: dict[str, dict[LatencyStage, LatencyHistogram]] = {}
+        self._merged: dict[Record, _PendingRecord] = {}
+        self._notified: list[_PendingRecord] = []
+
+    def histogram(self, channel: str, stage: LatencyStage) -> LatencyHistogram:
+        """Return the histogram of a channel's stage (empty if there are no samples)."""
+        return self._histograms.get(channel, {}).get(stage) or LatencyHistogram()
+
+    def _add(self, channel: str, stage: LatencyStage, latency: float) -> None:
+        """Add a sample to the histogram of a channel's stage."""
+        self._histograms.setdefault(channel, {}).setdefault(
+            stage, LatencyHistogram()
+        ).add(latency)
+
+    def merged(self, area: str, record: RecordAndMetadata) -> None:
+        """Measure a record which was merged into the areas."""
+        if record.raw.channel in UNTIMED_CHANNELS:
+            return
+        if (pending := self._merged.get(record.raw)) is None:
+            channel, timestamp = record.raw.channel, record.timestamp
+            pending = self._merged[record.raw] = _PendingRecord(channel, timestamp)
+            self._add(channel, LatencyStage.RECEIVED, record.received - timestamp)
+            self._add(channel, LatencyStage.METADATA, record.processed - timestamp)
+            self._add(channel, LatencyStage.MERGED, time.time() - timestamp)
+        pending.areas.add(area)
+
+    def notified(self) -> None:
+        """Measure the merged records when the listeners are notified."""
+        now = time.time()
+        for pending in self._merged.values():
+            self._add(pending.channel, LatencyStage.NOTIFIED, now - pending.timestamp)
+        self._notified = list(self._merged.values())
+        self._merged.clear()
+
+    def state_written(self, areas: Collection[str]) -> None:
+        """Measure the notified records of the areas once the state was written."""
+        now = time.time()
+        unwritten = []
+        for pending in self._notified:
+            if pending.areas.isdisjoint(areas):
+                unwritten.append(pending)
+            else:
+                self._add(
+                    pending.channel, LatencyStage.STATE_WRITTEN, now - pending.timestamp
+                )
+        self._notified = unwritten
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the histograms."""
+        return {
+            channel: {
+                stage.value: histogram.as_dict() for stage, histogram in stages.items()
+            }
+            for channel, stages in self._histograms.items()
+        }
@@ -43,6 +43,11 @@ async def async_find_area(lat: float, lon: float) -> str | None:
     return find_area(lat, lon)
 
 
+def loaded_area_to_polygon() -> dict[str, list[tuple[float, float]]]:
+    """Return the area to polygon map (empty if it's not loaded)."""
+    return _area_to_polygon
+
+
 def area_to_polygon(area: str | None) -> list[tuple[float, float]] | None:
     """Return area's polygon."""
     return _area_to_polygon.get(area) if area else None
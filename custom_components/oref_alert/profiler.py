@@ -0,0 +1,96 @@
+"""On-demand profiling of the refresh pipeline."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import cProfile
+import pstats
+import threading
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+
+PROFILE_FILE: Final = "oref_alert_profile_{timestamp}.prof"
+PROFILE_TOP_ENTRIES: Final = 30
+
+
+class RefreshProfiler:
+    """
+    Run cProfile around the sections of the refresh pipeline.
+
+    The profiler is enabled while any section runs (sections can be nested,
+    e.g. a push message which is handled while a refresh awaits I/O), so
+    whatever runs at the same time is profiled as well. The profiling ends
+    after a number of refreshes (if set), when it's stopped, or when another
+    profiler is started (e.g. by Home Assistant's profiler integration).
+    """
+
+    def __init__(self, refreshes: int | None = None) -> None:
+        """Initialize the profiler, and check that no other profiler is active."""
+        self._profile = cProfile.Profile()
+        # Raises ValueError when another profiler is active.
+        self._profile.enable()
+        self._profile.disable()
+        self._refreshes = refreshes
+        self._depth = 0
+        self._lock = threading.Lock()
+        self.done = asyncio.Event()
+        self.refreshes = 0
+        self.interrupted = False
+
+    @contextlib.contextmanager
+    def section(self) -> Generator[None]:
+        """Profile a section (thread-safe)."""
+        with self._lock:
+            self._depth += 1
+            if self._depth == 1 and not self.interrupted:
+                try:
+                    self._profile.enable()
+                except ValueError:
+                    # Another profiler was started, so the profiling ends.
+                    self.interrupted = True
+                    self.done.set()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if not self._depth and not self.interrupted:
+                    self._profile.disable()
+
+    def refreshed(self) -> None:
+        """Count a refresh, and mark the profiling as done when due."""
+        self.refreshes += 1
+        if self._refreshes is not None and self.refreshes >= self._refreshes:
+            self.done.set()
+
+    def top(self, entries: int) -> list[dict[str, Any]]:
+        """Return the top entries (by cumulative time)."""
+        stats = pstats.Stats(self._profile).stats  # type: ignore[attr-defined]
+        return [
+            {
+                "function": f"{file}:{line}({function})",
+                "calls": calls,
+                "total_time": round(total_time, 6),
+                "cumulative_time": round(cumulative_time, 6),
+            }
+            for (file, line, function), (_, calls, total_time, cumulative_time, _) in (
+                sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[
+                    :entries
+                ]
+            )
+        ]
+
+    def dump(self, path: Path) -> None:
+        """Write the stats to a file (for pstats, snakeviz, etc.)."""
+        self._profile.dump_stats(path)
+
+
+def profiled(
+    profiler: RefreshProfiler | None,
+) -> contextlib.AbstractContextManager[None]:
+    """Return a section of the profiler (if any)."""
+    return contextlib.nullcontext() if profiler is None else profiler.section()
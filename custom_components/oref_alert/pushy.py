@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import asyncio
 import hashlib
 import json
 import ssl
+import time
 from collections import deque
 from datetime import timedelta
 from itertools import chain
@@ -13,6 +13,7 @@ from typing import TYPE_CHECKING, Any, Final
 
 import homeassistant.util.dt as dt_util
 from homeassistant.const import ATTR_DATE
+from homeassistant.core import callback
 from homeassistant.exceptions import IntegrationError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.instance_id import async_get
@@ -20,6 +21,8 @@ from paho.mqtt.client import Client as MQTTClient
 from paho.mqtt.client import MQTTMessage
 from paho.mqtt.enums import CallbackAPIVersion
 
+from .asyncio_mqtt import AsyncioMQTTLoop, ConnectionHealth
+from .capture import CaptureChannel
 from .categories import pushy_thread_id_to_history_category
 from .const import (
     CONF_AREAS,
@@ -27,12 +30,12 @@ from .const import (
     DOMAIN,
     LOGGER,
     TITLE_FIELD,
-    Record,
     RecordAndMetadata,
     RecordSource,
 )
 from .metadata.area_info import AREA_INFO
 from .metadata.segment_to_area import SEGMENT_TO_AREA
+from .profiler import profiled
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -84,7 +87,10 @@ class PushyNotifications:
         self._http_client = async_get_clientsession(hass)
         self._credentials: dict[str, str] = {}
         self._mqtt: MQTTClient | None = None
+        self._mqtt_loop: AsyncioMQTTLoop | None = None
+        self.health = ConnectionHealth()
         self.alerts: deque[RecordAndMetadata] = deque()
+        self._messages = 0
 
     async def _api_call(self, uri: str, content: Any, check: bool = True) -> Any:  # noqa: FBT001, FBT002
         """Make HTTP request to the API server."""
@@ -248,44 +254,75 @@ class PushyNotifications:
             return
         LOGGER.debug("Pushy unsubscribe is done: %s", topics)
 
-    def _listen(self) -> None:
-        """Listen for MQTT messages."""
-        self._mqtt = MQTTClient(
+    async def _listen(self) -> None:
+        """Listen for MQTT messages (the client runs on the event loop)."""
+        self._mqtt = await self._hass.async_add_executor_job(self._create_client)
+        self._mqtt_loop = AsyncioMQTTLoop(
+            self._hass,
+            self._mqtt,
+            # The host is rotated on each connection attempt.
+            lambda: MQTT_HOST.replace(
+                "{timestamp}", str(int(dt_util.now().timestamp()))
+            ),
+            MQTT_PORT,
+            MQTT_KEEPALIVE,
+            health=self.health,
+        )
+        self._config_entry.async_create_background_task(
+            self._hass, self._mqtt_loop.async_connect(), "Pushy MQTT connection"
+        )
+
+    def _create_client(self) -> MQTTClient:
+        """Create the MQTT client (loading the certificates is blocking)."""
+        mqtt = MQTTClient(
             callback_api_version=CallbackAPIVersion.VERSION2,
             client_id=self._credentials.get(TOKEN_KEY),
             clean_session=False,
         )
-        self._mqtt.user_data_set(self)
-        self._mqtt.enable_logger()
-        self._mqtt.username_pw_set(
+        mqtt.user_data_set(self)
+        mqtt.enable_logger()
+        mqtt.username_pw_set(
             self._credentials.get(TOKEN_KEY), self._credentials.get(AUTH_KEY)
         )
-        self._mqtt.tls_set(cert_reqs=ssl.CERT_REQUIRED, tls_version=ssl.PROTOCOL_TLS)
-        self._mqtt.on_message = lambda _client, _userdata, message: self.on_message(
-            message
-        )
-        self._mqtt.on_connect = lambda _c, _u, _f, reason_code, _p: self.on_connect(
+        mqtt.tls_set(cert_reqs=ssl.CERT_REQUIRED, tls_version=ssl.PROTOCOL_TLS)
+        mqtt.on_message = lambda _client, _userdata, message: self.on_message(message)
+        mqtt.on_connect = lambda _c, _u, _f, reason_code, _p: self.on_connect(
             reason_code
         )
-        self._mqtt.connect_async(
-            MQTT_HOST.replace("{timestamp}", str(int(dt_util.now().timestamp()))),
-            MQTT_PORT,
-            MQTT_KEEPALIVE,
-        )
-        self._mqtt.loop_start()
+        return mqtt
 
+    @callback
     def on_connect(self, reason_code: ReasonCode) -> None:
-        """Subscribe on successful connect."""
-        if not reason_code.is_failure and self._mqtt:
+        """Subscribe on successful connect, and catch up after a gap."""
+        if not reason_code.is_failure and self._mqtt and self._mqtt_loop:
             self._mqtt.subscribe(self._credentials.get(TOKEN_KEY, ""), MQTT_QOS)
             LOGGER.debug("MQTT subscribe is done.")
+            if (gap := self._mqtt_loop.connected()) is not None:
+                LOGGER.info("MQTT reconnected after %.1f seconds.", gap)
+                # The alerts pushed during the gap are in the history.
+                self._hass.async_create_task(
+                    self._config_entry.runtime_data.coordinator.async_catch_up(),
+                    eager_start=True,
+                )
         else:
             LOGGER.warning(f"MQTT connection failed: {reason_code.getName()}.")  # type: ignore[no-untyped-call]
 
+    @callback
     def on_message(self, message: MQTTMessage) -> None:
-        """MQTT message processing."""
+        """MQTT message processing (profiled, when requested)."""
+        with profiled(self._config_entry.runtime_data.coordinator.profiler):
+            self._process_message(message)
+
+    @callback
+    def _process_message(self, message: MQTTMessage) -> None:
+        """Parse an MQTT message, and queue its records."""
+        received = time.time()
+        self._messages += 1
         try:
-            content = json.loads(message.payload.decode("utf-8"))
+            payload = message.payload.decode("utf-8")
+            if capture := self._config_entry.runtime_data.coordinator.capture:
+                capture.record(CaptureChannel.MQTT, payload)
+            content = json.loads(payload)
             LOGGER.debug("MQTT message: %s", content)
             if content.get("test"):
                 return
@@ -298,27 +335,26 @@ class PushyNotifications:
                     int(content["threatId"])
                 )
             ) is not None:
-                for area in [
-                    SEGMENT_TO_AREA[int(segment)]
-                    for segment in content["citiesIds"].split(",")
-                    if int(segment) in SEGMENT_TO_AREA
-                ]:
-                    self.alerts.append(
-                        self._config_entry.runtime_data.coordinator.add_metadata(
-                            Record(
-                                alertDate=alert_date,
-                                title=content[TITLE_FIELD],
-                                data=area,
-                                category=category,
-                                channel=RecordSource.MOBILE,
-                            )
-                        )
+                records = (
+                    self._config_entry.runtime_data.coordinator.add_metadata_batch(
+                        [
+                            SEGMENT_TO_AREA[int(segment)]
+                            for segment in content["citiesIds"].split(",")
+                            if int(segment) in SEGMENT_TO_AREA
+                        ],
+                        alert_date,
+                        content[TITLE_FIELD],
+                        category,
+                        RecordSource.MOBILE,
+                        received=received,
                     )
-                    new_alert = True
+                )
+                self.alerts.extend(records)
+                new_alert = bool(records)
             if new_alert:
-                asyncio.run_coroutine_threadsafe(
-                    self._config_entry.runtime_data.coordinator.async_refresh(),
-                    self._hass.loop,
+                self._hass.async_create_task(
+                    self._config_entry.runtime_data.coordinator.async_push_refresh(),
+                    eager_start=True,
                 )
         except:  # noqa: E722
             LOGGER.exception("Failed to process MQTT message.")
@@ -333,11 +369,16 @@ class PushyNotifications:
         self._credentials = credentials
         if await self._subscribe():
             return  # The config entry data was changed so the integration will reload
-        await self._hass.async_add_executor_job(self._listen)
+        await self._listen()
+
+    @property
+    def counters(self) -> dict[str, int]:
+        """Return the performance counters."""
+        return {"messages": self._messages, "queue": len(self.alerts)}
 
     async def stop(self) -> None:
         """Unregister."""
-        if self._mqtt:
-            await self._hass.async_add_executor_job(self._mqtt.disconnect)
-            await self._hass.async_add_executor_job(self._mqtt.loop_stop)
+        if self._mqtt_loop:
+            await self._mqtt_loop.async_stop()
+            self._mqtt_loop = None
             self._mqtt = None
@@ -0,0 +1,101 @@
+"""Race of the channels to deliver each alert first."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from .const import RecordAndMetadata
+
+# A race is settled once its alert is older than this (later arrivals are ignored).
+RACE_SETTLE_SECONDS: Final = 600
+# The statistics are of the latest settled races.
+RACE_WINDOW: Final = 1000
+# Bound the open races (e.g. for alerts of all areas).
+RACE_MAX_OPEN: Final = 5000
+
+
+@dataclass(slots=True)
+class _Race:
+    """The arrival times of an alert per channel."""
+
+    timestamp: int
+    arrivals: dict[str, float] = field(default_factory=dict)
+
+
+class ChannelRaceTracker:
+    """
+    Track which channel delivers each alert first, and the lag of the others.
+
+    An alert is identified by its area, its category, and its time (within the
+    dedup window). Each channel's first arrival is recorded, and when the race
+    is settled the channels' lags behind the first one are calculated.
+    """
+
+    def __init__(self, window: float) -> None:
+        """Initialize the tracker (the window is of an alert's time)."""
+        self._window = window
+        self._open: dict[tuple[str, int], _Race] = {}
+        self._settled: deque[dict[str, float]] = deque(maxlen=RACE_WINDOW)
+
+    def arrived(self, area: str, record: RecordAndMetadata) -> None:
+        """Record the arrival of an area's record."""
+        if record.received - record.timestamp > RACE_SETTLE_SECONDS:
+            return
+        key = (area, record.raw.category)
+        race = self._open.get(key)
+        if race is None or abs(record.timestamp - race.timestamp) > self._window:
+            if race is not None:
+                self._settle(key)
+            race = self._open[key] = _Race(record.timestamp)
+            if len(self._open) > RACE_MAX_OPEN:
+                self._settle(next(iter(self._open)))
+        race.arrivals.setdefault(record.raw.channel, record.received)
+
+    def _settle(self, key: tuple[str, int]) -> None:
+        """Calculate the lags of a race's channels."""
+        arrivals = self._open.pop(key).arrivals
+        first = min(arrivals.values())
+        self._settled.append(
+            {channel: arrival - first for channel, arrival in arrivals.items()}
+        )
+
+    def _settle_expired(self) -> None:
+        """Settle the races which are old enough (lazily, when queried)."""
+        threshold = time.time() - RACE_SETTLE_SECONDS
+        for key in [
+            key for key, race in self._open.items() if race.timestamp < threshold
+        ]:
+            self._settle(key)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the channels' statistics of the settled races."""
+        self._settle_expired()
+        lags: dict[str, list[float]] = {}
+        for race in self._settled:
+            for channel, lag in race.items():
+                lags.setdefault(channel, []).append(lag)
+        return {
+            "races": len(self._settled),
+            "open_races": len(self._open),
+            "channels": {
+                channel: {
+                    "delivered": len(values),
+                    "first": (first := sum(1 for lag in values if not lag)),
+                    "first_rate": round(first / len(values), 3),
+                    "lag_p50": _percentile(values, 0.5),
+                    "lag_p95": _percentile(values, 0.95),
+                    "lag_max": round(max(values), 3),
+                }
+                for channel, values in sorted(lags.items())
+            },
+        }
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Return the percentile of values."""
+    ordered = sorted(values)
+    return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 3)
@@ -8,11 +8,12 @@ from typing import TYPE_CHECKING, Any, Final
 import homeassistant.util.dt as dt_util
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.components.sensor.const import SensorDeviceClass
-from homeassistant.const import Platform, UnitOfTime
+from homeassistant.const import EntityCategory, Platform, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import event as event_helper
 from homeassistant.util import slugify
 
+from .asyncio_mqtt import ConnectionState
 from .const import (
     ATTR_ALERT,
     ATTR_AREA,
@@ -25,10 +26,12 @@ from .const import (
     TIME_TO_SHELTER_ID_SUFFIX,
     AreaStatus,
     RecordAndMetadata,
+    RecordSource,
     RecordType,
 )
-from .entity import OrefAlertCoordinatorEntity
+from .entity import OrefAlertCoordinatorEntity, OrefAlertEntity
 from .helpers import record_status
+from .latency import LatencyStage
 from .metadata.area_to_migun_time import AREA_TO_MIGUN_TIME
 from .metadata.areas import AREAS
 
@@ -41,6 +44,11 @@ if TYPE_CHECKING:
 
 PARALLEL_UPDATES: Final = 0
 SECONDS_IN_A_MINUTE: Final = 60
+LATENCY_CHANNELS: Final = (
+    RecordSource.HISTORY,
+    RecordSource.MOBILE,
+    RecordSource.TZEVAADOM,
+)
 
 
 async def async_setup_entry(
@@ -60,6 +68,8 @@ async def async_setup_entry(
     async_add_entities(
         [TimeToShelterSensor(name, area, config_entry) for name, area in entities]
         + [OrefAlertStatusSensor(name, area, config_entry) for name, area in entities]
+        + [LatencySensor(channel, config_entry) for channel in LATENCY_CHANNELS]
+        + [PushyConnectionSensor(config_entry)]
     )
 
 
@@ -88,6 +98,7 @@ class TimeToShelterSensor(OrefAlertCoordinatorEntity, SensorEntity):
         """Initialize object with defaults."""
         super().__init__(config_entry)
         self._area: str = area
+        self._tracked_areas = (area,)
         self._alert: RecordAndMetadata | None = None
         self._migun_time: int = AREA_TO_MIGUN_TIME[area]
         if not name:
@@ -199,6 +210,7 @@ class OrefAlertStatusSensor(OrefAlertCoordinatorEntity, SensorEntity):
         """Initialize object with defaults."""
         super().__init__(config_entry)
         self._area: str = area
+        self._tracked_areas = (area,)
         self._attr_options = list(AreaStatus)
         if not name:
             self.use_device_name = True
@@ -222,3 +234,86 @@ class OrefAlertStatusSensor(OrefAlertCoordinatorEntity, SensorEntity):
             ATTR_AREA: self._area,
             ATTR_RECORD: self.coordinator.get_record(self._area, None),
         }
+
+
+class LatencySensor(OrefAlertCoordinatorEntity, SensorEntity):
+    """
+    Representation of a channel's latency sensor.
+
+    The state is the median latency from the alerts' time until the state of
+    the default binary sensor was written. The attributes summarize the latency
+    of each processing stage.
+    """
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_translation_key = "latency"
+    _unrecorded_attributes = frozenset(LatencyStage)
+
+    def __init__(
+        self, channel: RecordSource, config_entry: OrefAlertConfigEntry
+    ) -> None:
+        """Initialize object with defaults."""
+        super().__init__(config_entry)
+        self._channel = channel
+        self._attr_translation_placeholders = {"channel": channel.value}
+        self._attr_unique_id = slugify(f"{OREF_ALERT_UNIQUE_ID}_{channel}_latency")
+        self.entity_id = f"{Platform.SENSOR}.{self._attr_unique_id}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the median end-to-end latency."""
+        return self.coordinator.latency.histogram(
+            self._channel, LatencyStage.STATE_WRITTEN
+        ).percentile(0.5)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the stages' summaries."""
+        summaries = {}
+        for stage in LatencyStage:
+            summary = self.coordinator.latency.histogram(self._channel, stage).as_dict()
+            del summary["buckets"]
+            summaries[stage.value] = summary
+        return summaries
+
+
+class PushyConnectionSensor(OrefAlertEntity, SensorEntity):
+    """
+    Representation of the Pushy connection's health sensor.
+
+    The state is the MQTT connection's state, and the attributes are the
+    metrics of its connected and disconnected intervals.
+    """
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_translation_key = "pushy_connection"
+
+    def __init__(self, config_entry: OrefAlertConfigEntry) -> None:
+        """Initialize object with defaults."""
+        super().__init__(config_entry)
+        self._health = config_entry.runtime_data.pushy.health
+        self._attr_options = list(ConnectionState)
+        self._attr_unique_id = f"{OREF_ALERT_UNIQUE_ID}_pushy_connection"
+        self.entity_id = f"{Platform.SENSOR}.{self._attr_unique_id}"
+
+    async def async_added_to_hass(self) -> None:
+        """Write the state when the connection's state is changed."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._health.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> str:
+        """Return the connection's state."""
+        return self._health.state
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the connection's metrics."""
+        metrics = self._health.as_dict()
+        del metrics["state"]
+        return metrics
@@ -25,6 +25,13 @@ class TTLDeque[T]:
         self._deque.appendleft((time or dt_util.now(), item))
         self._prune()
 
+    def add_older(self, item: T, time: datetime) -> bool:
+        """Add an item older than the existing ones, and return if it's not expired."""
+        if dt_util.now() - time >= self._ttl:
+            return False
+        self._deque.append((time, item))
+        return True
+
     def _prune(self) -> None:
         """Remove expired items."""
         now = dt_util.now()
@@ -42,6 +49,11 @@ class TTLDeque[T]:
         self._prune()
         return self._deque[0][0] if self._deque else None
 
+    def __len__(self) -> int:
+        """Return the number of items."""
+        self._prune()
+        return len(self._deque)
+
     def __contains__(self, item: T) -> bool:
         """Check if the item exists."""
         self._prune()
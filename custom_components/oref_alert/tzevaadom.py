@@ -5,7 +5,9 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import enum
+import json
 import secrets
+import time
 from collections import deque
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Final
@@ -14,6 +16,7 @@ import aiohttp
 from aiohttp import ClientWebSocketResponse, WSMsgType
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
+from .capture import CaptureChannel
 from .categories import (
     END_ALERT_CATEGORY,
     PRE_ALERT_CATEGORY,
@@ -25,7 +28,6 @@ from .const import (
     IST,
     LOGGER,
     TITLE_FIELD,
-    Record,
     RecordAndMetadata,
     RecordSource,
 )
@@ -34,6 +36,7 @@ from .metadata.areas import AREAS
 from .metadata.tzevaadom_id_to_area import (
     TZEVAADOM_ID_TO_AREA,
 )
+from .profiler import profiled
 from .ttl_deque import TTLDeque
 
 if TYPE_CHECKING:
@@ -84,6 +87,7 @@ class TzevaAdomNotifications:
         self._config_entry = config_entry
         self.alerts: deque[RecordAndMetadata] = deque()
         self._ids: TTLDeque[str] = TTLDeque()
+        self._messages = 0
         self._http_client = async_get_clientsession(hass)
         self._ws: ClientWebSocketResponse | None = None
         self._stop = asyncio.Event()
@@ -93,6 +97,15 @@ class TzevaAdomNotifications:
         """Start the WebSocket listener."""
         self._task = asyncio.create_task(self._listen())
 
+    @property
+    def counters(self) -> dict[str, int]:
+        """Return the performance counters."""
+        return {
+            "messages": self._messages,
+            "queue": len(self.alerts),
+            "ids": len(self._ids),
+        }
+
     async def stop(self) -> None:
         """Stop the WebSocket listener."""
         self._stop.set()
@@ -216,9 +229,20 @@ class TzevaAdomNotifications:
         return fields
 
     async def _on_message(self, message: dict[str, Any]) -> None:
-        """Handle incoming WebSocket messages."""
+        """Handle incoming WebSocket messages (profiled, when requested)."""
+        with profiled(self._config_entry.runtime_data.coordinator.profiler):
+            await self._process_message(message)
+
+    async def _process_message(self, message: dict[str, Any]) -> None:
+        """Parse a WebSocket message, and queue its records."""
+        received = time.time()
+        self._messages += 1
         try:
             LOGGER.debug("WS message: %s", message)
+            if capture := self._config_entry.runtime_data.coordinator.capture:
+                capture.record(
+                    CaptureChannel.WS, json.dumps(message, ensure_ascii=False)
+                )
 
             if (fields := self._parse_message(message)) is None:
                 return
@@ -227,7 +251,7 @@ class TzevaAdomNotifications:
                 return
             self._ids.add(fields["id"])
 
-            new_alert = False
+            areas = []
             for area in fields["areas"]:
                 name = TZEVAADOM_SPELLING_FIX.get(area, area)
                 if name not in AREAS:
@@ -235,21 +259,19 @@ class TzevaAdomNotifications:
                         "Unknown area '%s' in Tzeva Adom alert, skipping.", name
                     )
                     continue
-                self.alerts.append(
-                    self._config_entry.runtime_data.coordinator.add_metadata(
-                        Record(
-                            alertDate=fields[DATE_FIELD],
-                            title=fields[TITLE_FIELD],
-                            data=name,
-                            category=fields[CATEGORY_FIELD],
-                            channel=RecordSource.TZEVAADOM,
-                        )
-                    )
-                )
-                new_alert = True
+                areas.append(name)
+            records = self._config_entry.runtime_data.coordinator.add_metadata_batch(
+                areas,
+                fields[DATE_FIELD],
+                fields[TITLE_FIELD],
+                fields[CATEGORY_FIELD],
+                RecordSource.TZEVAADOM,
+                received=received,
+            )
+            self.alerts.extend(records)
 
-            if new_alert:
-                await self._config_entry.runtime_data.coordinator.async_refresh()
+            if records:
+                await self._config_entry.runtime_data.coordinator.async_push_refresh()
 
         except:  # noqa: E722
             LOGGER.exception("Error processing WS message")
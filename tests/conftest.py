@@ -29,6 +29,7 @@ from .utils import mock_urls
 
 if TYPE_CHECKING:
     from collections.abc import Generator
+    from pathlib import Path
 
     from homeassistant.core import HomeAssistant
     from pytest_homeassistant_custom_component.test_util.aiohttp import (
@@ -83,6 +84,21 @@ def pytest_runtest_call(item: pytest.Item) -> Any:
     return result
 
 
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """Report the benchmarks (which are recorded as the tests' properties)."""
+    # The teardown reports (of all the tests) carry the recorded properties.
+    lines = [
+        value
+        for report in terminalreporter.getreports("")
+        for name, value in report.user_properties
+        if name == "benchmark"
+    ]
+    if lines:
+        terminalreporter.write_sep("-", "benchmarks")
+        for line in lines:
+            terminalreporter.write_line(line)
+
+
 @pytest.fixture(autouse=True)
 def _auto_aioclient_mock(aioclient_mock: AiohttpClientMocker) -> None:
     """Mock aiohttp with empty result relevant URLs."""
@@ -132,3 +148,13 @@ def _mock_ws() -> Generator[None]:
         new=lambda *_, **__: AsyncMock(__aenter__=AsyncMock(return_value=ws)),
     ) as _:
         yield
+
+
+@pytest.fixture(autouse=True)
+def _journal_dir(tmp_path: Path) -> Generator[None]:
+    """Keep the journals of each test in its own directory."""
+    with patch(
+        "custom_components.oref_alert.journal.journal_path",
+        side_effect=lambda _, key: tmp_path / f"{key}.journal",
+    ):
+        yield
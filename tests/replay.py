@@ -0,0 +1,193 @@
+"""
+Replay of captured traffic (see the `capture` action) through local stand-ins.
+
+The HTTP payloads are served by a local HTTP server (instead of Oref's servers),
+the WebSocket messages are sent by a local WebSocket server (instead of Tzeva
+Adom's server), and the MQTT messages are injected into the Pushy channel (on
+the event loop, like the MQTT client's network I/O). The traffic is replayed
+with its original timing, accelerated by a speed factor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+from aiohttp import ClientSession, WSMsgType, web
+from paho.mqtt.client import MQTTMessage
+from yarl import URL
+
+from custom_components.oref_alert.capture import CaptureChannel
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
+    from homeassistant.core import HomeAssistant
+
+    from custom_components.oref_alert import OrefAlertConfigEntry
+
+LOCALHOST = "127.0.0.1"
+
+
+class RedirectingSession:
+    """A client session which sends the remote requests to the local server."""
+
+    def __init__(self, session: ClientSession, base: str) -> None:
+        """Initialize the session."""
+        self._session = session
+        self._base = base
+
+    def _local(self, url: str) -> str:
+        """Return the local URL of a remote URL."""
+        remote = URL(url)
+        return f"{self._base}/{remote.host}{remote.raw_path_qs}"
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        """Send a GET request."""
+        return self._session.get(self._local(url), **kwargs)
+
+    def ws_connect(self, url: str, **kwargs: Any) -> Any:
+        """Connect a WebSocket."""
+        return self._session.ws_connect(self._local(url), **kwargs)
+
+
+class ReplayServer:
+    """Local stand-ins of the remote HTTP and WebSocket endpoints."""
+
+    def __init__(self) -> None:
+        """Initialize the server."""
+        self._http: dict[str, dict[str, Any]] = {}
+        self._sockets: set[web.WebSocketResponse] = set()
+        self._connected = asyncio.Event()
+        self._runner: web.AppRunner | None = None
+        self.base = ""
+
+    async def async_start(self) -> None:
+        """Start listening on a free local port."""
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, LOCALHOST, 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]  # noqa: SLF001
+        self.base = f"http://{LOCALHOST}:{port}"
+
+    async def async_stop(self) -> None:
+        """Close the connections and stop listening."""
+        for socket in list(self._sockets):
+            await socket.close()
+        if self._runner:
+            await self._runner.cleanup()
+
+    def set_http(self, entry: dict[str, Any]) -> None:
+        """Serve a captured HTTP response (until the URL's next one)."""
+        self._http[entry["url"]] = entry
+
+    async def async_wait_connected(self) -> None:
+        """Wait for a WebSocket client."""
+        await self._connected.wait()
+
+    async def async_send_ws(self, payload: str) -> None:
+        """Send a message to the WebSocket clients."""
+        for socket in list(self._sockets):
+            await socket.send_str(payload)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Serve a request."""
+        if request.headers.get("Upgrade", "").lower() == "websocket":
+            return await self._handle_ws(request)
+        entry = self._http.get(f"https://{request.path_qs[1:]}")
+        if entry is None:
+            return web.Response(body=b"")
+        if entry["status"] == HTTPStatus.NOT_MODIFIED or (
+            entry["last_modified"]
+            and request.headers.get("If-Modified-Since") == entry["last_modified"]
+        ):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED)
+        return web.Response(
+            body=entry["payload"].encode("utf-8"),
+            headers={"Last-Modified": entry["last_modified"]}
+            if entry["last_modified"]
+            else None,
+        )
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        """Keep a WebSocket connection (until it's closed)."""
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self._sockets.add(socket)
+        self._connected.set()
+        try:
+            async for message in socket:
+                if message.type == WSMsgType.ERROR:
+                    break
+        finally:
+            self._sockets.discard(socket)
+        return socket
+
+
+@contextlib.asynccontextmanager
+async def replay_server() -> AsyncGenerator[ReplayServer]:
+    """Start the stand-ins, and redirect the integration's traffic to them."""
+    server = ReplayServer()
+    await server.async_start()
+    async with ClientSession() as session:
+        redirecting = RedirectingSession(session, server.base)
+        with (
+            patch(
+                "custom_components.oref_alert.coordinator.async_get_clientsession",
+                return_value=redirecting,
+            ),
+            patch(
+                "custom_components.oref_alert.tzevaadom.async_get_clientsession",
+                return_value=redirecting,
+            ),
+        ):
+            try:
+                yield server
+            finally:
+                await server.async_stop()
+
+
+async def async_replay(
+    hass: HomeAssistant,
+    config_entry: OrefAlertConfigEntry,
+    server: ReplayServer,
+    entries: list[dict[str, Any]],
+    speed: float = 1,
+) -> dict[str, Any]:
+    """Replay the captured entries, and return the replay's statistics."""
+    coordinator = config_entry.runtime_data.coordinator
+    pushy = config_entry.runtime_data.pushy
+    counts = dict.fromkeys(CaptureChannel, 0)
+    lag = 0.0
+    start = time.monotonic()
+    for entry in entries:
+        if (delay := entry["t"] / speed - (time.monotonic() - start)) > 0:
+            await asyncio.sleep(delay)
+        lag = max(lag, time.monotonic() - start - entry["t"] / speed)
+        channel = CaptureChannel(entry["channel"])
+        counts[channel] += 1
+        match channel:
+            case CaptureChannel.HTTP:
+                # The payload is served from now on, and is fetched by a refresh.
+                server.set_http(entry)
+                config_entry.async_create_task(hass, coordinator.async_refresh())
+            case CaptureChannel.MQTT:
+                message = MQTTMessage(topic=b"replay")
+                message.payload = entry["payload"].encode("utf-8")
+                pushy.on_message(message)
+            case CaptureChannel.WS:
+                await server.async_send_ws(entry["payload"])
+    await hass.async_block_till_done()
+    return {
+        "entries": len(entries),
+        **{channel.value: count for channel, count in counts.items()},
+        "duration": time.monotonic() - start,
+        "max_lag": lag,
+    }
@@ -0,0 +1,262 @@
+"""The tests for the area_records file."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from custom_components.oref_alert.area_records import AreaRecords
+from custom_components.oref_alert.const import (
+    IST,
+    Record,
+    RecordAndMetadata,
+    RecordType,
+)
+
+BASE_TIME = datetime(2025, 1, 1, 12, 0, 0, tzinfo=IST)
+
+
+def create_record(
+    data: str,
+    minutes: int,
+    record_type: RecordType = RecordType.ALERT,
+    expire: int | None = None,
+) -> RecordAndMetadata:
+    """Create a record with metadata."""
+    time = BASE_TIME + timedelta(minutes=minutes)
+    record = Record(
+        alertDate=time.strftime("%Y-%m-%d %H:%M:%S"),
+        title="ירי רקטות וטילים",
+        data=data,
+        category=13 if record_type == RecordType.END else 1,
+        channel="website-history",
+    )
+    return RecordAndMetadata(
+        raw=record,
+        timestamp=int(time.timestamp()),
+        record_type=record_type,
+        expire=BASE_TIME + timedelta(minutes=expire) if expire is not None else None,
+    )
+
+
+def areas_of(records: list[RecordAndMetadata]) -> list[str]:
+    """Return the areas of the records."""
+    return [record.raw.data for record in records]
+
+
+def test_mapping() -> None:
+    """Test the mutable mapping behavior."""
+    records = AreaRecords()
+    first = create_record("בארי", 0)
+    records["בארי"] = first
+    records["בארי"] = first
+    assert len(records) == 1
+    assert list(records) == ["בארי"]
+    assert records["בארי"] is first
+
+    del records["בארי"]
+    assert len(records) == 0
+    assert records.ordered(None, None, None, newer_first=False) == []
+
+    records["בארי"] = first
+    records.clear()
+    assert len(records) == 0
+    assert records.ordered(None, None, None, newer_first=False) == []
+
+
+def test_ordered() -> None:
+    """Test ordering, filtering and window of the indexed query."""
+    records = AreaRecords()
+    records.update(
+        {
+            "בארי": create_record("בארי", 5),
+            "אילות": create_record("אילות", 5),
+            "נחל עוז": create_record("נחל עוז", 0, RecordType.END),
+            "אילת": create_record("אילת", 10, RecordType.PRE_ALERT),
+        }
+    )
+
+    assert areas_of(records.ordered(None, None, None, newer_first=False)) == [
+        "נחל עוז",
+        "אילות",
+        "בארי",
+        "אילת",
+    ]
+    assert areas_of(records.ordered(None, None, None, newer_first=True)) == [
+        "אילת",
+        "אילות",
+        "בארי",
+        "נחל עוז",
+    ]
+    assert records.latest_time([RecordType.ALERT, RecordType.END]) == (
+        BASE_TIME + timedelta(minutes=5)
+    )
+    assert records.latest_time([RecordType.PRE_ALERT]) == (
+        BASE_TIME + timedelta(minutes=10)
+    )
+    assert records.latest_time([None]) is None
+    assert areas_of(
+        records.ordered(
+            None, [RecordType.ALERT, RecordType.END], None, newer_first=True
+        )
+    ) == ["אילות", "בארי", "נחל עוז"]
+    assert areas_of(
+        records.ordered(None, [RecordType.ALERT], None, newer_first=False)
+    ) == ["אילות", "בארי"]
+    assert areas_of(
+        records.ordered(None, None, BASE_TIME + timedelta(minutes=5), newer_first=False)
+    ) == ["אילות", "בארי", "אילת"]
+    assert areas_of(
+        records.ordered(
+            ["בארי", "אילת", "unknown"],
+            [RecordType.ALERT],
+            None,
+            newer_first=False,
+        )
+    ) == ["בארי"]
+    assert areas_of(
+        records.ordered(
+            ["בארי", "נחל עוז"],
+            None,
+            BASE_TIME + timedelta(minutes=1),
+            newer_first=True,
+        )
+    ) == ["בארי"]
+
+
+def test_replaced_record_is_unindexed() -> None:
+    """Test a replaced record is removed from the type index."""
+    records = AreaRecords()
+    records["בארי"] = create_record("בארי", 0)
+    records["בארי"] = create_record("בארי", 1, RecordType.END)
+
+    assert records.ordered(None, [RecordType.ALERT], None, newer_first=False) == []
+    assert areas_of(
+        records.ordered(None, [RecordType.END], None, newer_first=False)
+    ) == ["בארי"]
+
+
+def test_shared_record_is_indexed_once() -> None:
+    """Test a record stored under multiple areas is returned once."""
+    records = AreaRecords()
+    all_areas = create_record("כל הארץ", 0)
+    records.update({"בארי": all_areas, "אילת": all_areas, "נחל עוז": all_areas})
+
+    assert records.ordered(None, None, None, newer_first=False) == [all_areas]
+
+    records["בארי"] = create_record("בארי", 1)
+    del records["אילת"]
+    assert areas_of(records.ordered(None, None, None, newer_first=False)) == [
+        "כל הארץ",
+        "בארי",
+    ]
+
+    records["נחל עוז"] = create_record("נחל עוז", 2)
+    assert areas_of(records.ordered(None, None, None, newer_first=False)) == [
+        "בארי",
+        "נחל עוז",
+    ]
+
+
+def test_expirations() -> None:
+    """Test the expiration heap ignores replaced records."""
+    records = AreaRecords()
+    assert records.next_expiry() is None
+    shared = create_record("כל הארץ", 0, expire=10)
+    records.update(
+        {
+            "בארי": create_record("בארי", 0, expire=5),
+            "אילת": shared,
+            "נחל עוז": shared,
+            "אילות": create_record("אילות", 0),
+        }
+    )
+    assert records.next_expiry() == BASE_TIME + timedelta(minutes=5)
+
+    records["בארי"] = create_record("בארי", 1, expire=20)
+    assert records.next_expiry() == BASE_TIME + timedelta(minutes=10)
+    assert records.pop_expired(BASE_TIME + timedelta(minutes=9)) == []
+
+    records["אילות"] = shared
+    del records["נחל עוז"]
+    assert records.pop_expired(BASE_TIME + timedelta(minutes=20)) == [
+        "אילת",
+        "אילות",
+        "בארי",
+    ]
+    assert records.next_expiry() is None
+
+    records["בארי"] = create_record("בארי", 2, expire=30)
+    records["אילת"] = records["בארי"]
+    records["בארי"] = create_record("בארי", 3)
+    records["בארי"] = records["אילת"]
+    assert records.pop_expired(BASE_TIME + timedelta(minutes=30)) == ["בארי", "אילת"]
+    records.clear()
+    assert records.next_expiry() is None
+
+
+def test_changes() -> None:
+    """Test tracking of added, changed and removed areas."""
+    records = AreaRecords()
+    records.update({"בארי": create_record("בארי", 0), "אילת": create_record("אילת", 0)})
+    assert records.pop_changes() == (
+        frozenset({"בארי", "אילת"}),
+        frozenset(),
+        frozenset(),
+    )
+    assert records.pop_changes() == (frozenset(), frozenset(), frozenset())
+
+    records["בארי"] = records["בארי"]
+    records["בארי"] = create_record("בארי", 1)
+    del records["אילת"]
+    records["נחל עוז"] = create_record("נחל עוז", 1)
+    del records["נחל עוז"]
+    assert records.pop_changes() == (
+        frozenset(),
+        frozenset({"בארי"}),
+        frozenset({"אילת"}),
+    )
+
+    records.clear()
+    records["אילת"] = create_record("אילת", 2)
+    assert records.pop_changes() == (
+        frozenset({"אילת"}),
+        frozenset(),
+        frozenset({"בארי"}),
+    )
+
+
+def test_snapshot() -> None:
+    """Test snapshots are immutable and share unchanged parts."""
+    records = AreaRecords()
+    empty = records.snapshot()
+    assert len(empty) == 0
+    assert records.snapshot() is empty
+
+    records.update(
+        {f"area {index}": create_record(f"area {index}", index) for index in range(40)}
+    )
+    first = records.snapshot()
+    assert records.snapshot() is first
+    assert len(first) == 40
+    assert list(first) == [f"area {index}" for index in range(40)]
+
+    records["area 39"] = create_record("area 39", 40, RecordType.END)
+    records["area 40"] = create_record("area 40", 41)
+    second = records.snapshot()
+    assert second is not first
+    assert first["area 39"].record_type == RecordType.ALERT
+    assert "area 40" not in first
+    assert "unknown" not in first
+    assert second["area 39"].record_type == RecordType.END
+    assert second._buckets[0] is first._buckets[0]  # noqa: SLF001
+    assert areas_of(
+        second.ordered(None, [RecordType.END], None, newer_first=False)
+    ) == ["area 39"]
+    assert (
+        areas_of(first.ordered(None, [RecordType.END], None, newer_first=False)) == []
+    )
+
+    del records["area 0"]
+    records.clear()
+    assert len(records.snapshot()) == 0
+    assert len(second) == 41
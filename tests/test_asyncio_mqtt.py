@@ -0,0 +1,303 @@
+"""The tests for the asyncio_mqtt file."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+import ssl
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+from paho.mqtt.client import Client as MQTTClient
+from paho.mqtt.enums import CallbackAPIVersion
+
+from custom_components.oref_alert.asyncio_mqtt import (
+    MQTT_INITIAL_BACKOFF,
+    MQTT_MAX_BACKOFF,
+    AsyncioMQTTLoop,
+    ConnectionHealth,
+    ConnectionState,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+    from pathlib import Path
+
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+    from paho.mqtt.client import MQTTMessage
+
+LOCALHOST = "127.0.0.1"
+CONNACK = b"\x20\x02\x00\x00"
+PUBLISH = b"\x30\x0a\x00\x03abcalert"
+DISCONNECT = b"\xe0\x00"
+
+
+@pytest.fixture
+def tls_context(tmp_path: Path) -> ssl.SSLContext:
+    """Return a server context with a self-signed certificate."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, LOCALHOST)])
+    now = datetime.now(UTC)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = tmp_path / "cert.pem"
+    cert_file.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_file = tmp_path / "key.pem"
+    key_file.write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert_file, key_file)
+    return context
+
+
+@pytest.fixture(autouse=True)
+def _fast_timers() -> Generator[None]:
+    """Run the periodic work and the reconnections without delays."""
+    with (
+        patch("custom_components.oref_alert.asyncio_mqtt.MQTT_MISC_INTERVAL", 0.01),
+        patch("custom_components.oref_alert.asyncio_mqtt.MQTT_INITIAL_BACKOFF", 0),
+    ):
+        yield
+
+
+class FakeBroker:
+    """A broker which accepts connections, and publishes a message."""
+
+    def __init__(
+        self,
+        *,
+        close: bool = False,
+        publish: int = 1,
+        tls: ssl.SSLContext | None = None,
+    ) -> None:
+        """Initialize the broker (which optionally drops the connections)."""
+        self._close = close
+        self._publish = publish
+        self._tls = tls
+        self.connections = 0
+        self.received = b""
+        self.port = 0
+        self._server: asyncio.Server | None = None
+
+    async def async_start(self) -> None:
+        """Listen on a free local port."""
+        self._server = await asyncio.start_server(
+            self._handle, LOCALHOST, 0, ssl=self._tls
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        """Stop listening."""
+        assert self._server is not None
+        self._server.close()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Acknowledge the connection, and publish the messages (in one write)."""
+        self.connections += 1
+        header = await reader.readexactly(2)
+        await reader.readexactly(header[1])
+        writer.write(CONNACK + PUBLISH * self._publish)
+        await writer.drain()
+        if not self._close:
+            self.received += await reader.read(1024)
+        writer.close()
+
+
+async def async_wait_for(hass: HomeAssistant, condition: Callable[[], bool]) -> None:
+    """Wait for the network I/O to satisfy a condition."""
+    for _ in range(500):
+        if condition():
+            return
+        await hass.async_add_executor_job(time.sleep, 0.01)
+    pytest.fail("Condition was not satisfied")
+
+
+def mqtt_loop(hass: HomeAssistant, client: MQTTClient, port: int) -> AsyncioMQTTLoop:
+    """Return a loop of a client, which connects to a local port."""
+    return AsyncioMQTTLoop(
+        hass, client, lambda: LOCALHOST, port, 60, health=ConnectionHealth()
+    )
+
+
+def mqtt_client(messages: list[tuple[bytes, int]]) -> MQTTClient:
+    """Return a client which collects the messages (and their threads)."""
+    client = MQTTClient(callback_api_version=CallbackAPIVersion.VERSION2)
+
+    def on_message(_client: MQTTClient, _userdata: None, message: MQTTMessage) -> None:
+        messages.append((message.payload, threading.get_ident()))
+
+    client.on_message = on_message
+    return client
+
+
+async def test_messages_on_loop(
+    hass: HomeAssistant,
+    socket_enabled: None,  # noqa: ARG001
+) -> None:
+    """Test that the messages are processed on the event loop."""
+    broker = FakeBroker()
+    await broker.async_start()
+    messages: list[tuple[bytes, int]] = []
+    client = mqtt_client(messages)
+    loop = mqtt_loop(hass, client, broker.port)
+    await loop.async_connect()
+    await async_wait_for(hass, lambda: bool(messages))
+    assert messages == [(b"alert", hass.loop_thread_id)]
+    assert client.is_connected()
+    # The periodic work runs while connected.
+    with patch.object(client, "loop_misc") as loop_misc:
+        await async_wait_for(hass, lambda: loop_misc.call_count > 1)
+    await loop.async_stop()
+    await async_wait_for(hass, lambda: broker.received.endswith(DISCONNECT))
+    assert broker.connections == 1
+    await broker.async_stop()
+
+
+async def test_messages_in_tls_records(
+    hass: HomeAssistant,
+    socket_enabled: None,  # noqa: ARG001
+    tls_context: ssl.SSLContext,
+) -> None:
+    """Test reading the messages which were already decrypted."""
+    broker = FakeBroker(publish=3, tls=tls_context)
+    await broker.async_start()
+    messages: list[tuple[bytes, int]] = []
+    client = mqtt_client(messages)
+    context = ssl.create_default_context()
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    client.tls_set_context(context)
+    loop = mqtt_loop(hass, client, broker.port)
+    await loop.async_connect()
+    # The records are decrypted together, so the socket isn't readable again.
+    await async_wait_for(hass, lambda: len(messages) == 3)
+    assert messages == [(b"alert", hass.loop_thread_id)] * 3
+    await loop.async_stop()
+    await broker.async_stop()
+
+
+async def test_reconnect(
+    hass: HomeAssistant,
+    socket_enabled: None,  # noqa: ARG001
+) -> None:
+    """Test reconnecting after the connection is lost."""
+    broker = FakeBroker(close=True)
+    await broker.async_start()
+    messages: list[tuple[bytes, int]] = []
+    loop = mqtt_loop(hass, mqtt_client(messages), broker.port)
+    await loop.async_connect()
+    await async_wait_for(hass, lambda: broker.connections > 1)
+    await loop.async_stop()
+    assert loop.health.attempts > 1
+    await broker.async_stop()
+
+
+@pytest.mark.allowed_logs(["MQTT connection failed"])
+async def test_connection_failure(
+    hass: HomeAssistant,
+    socket_enabled: None,  # noqa: ARG001
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a connection failure, and stopping while connecting."""
+    with socket.socket() as closed:
+        closed.bind((LOCALHOST, 0))
+        port = closed.getsockname()[1]
+    loop = mqtt_loop(hass, mqtt_client([]), port)
+    with patch("custom_components.oref_alert.asyncio_mqtt.MQTT_INITIAL_BACKOFF", 3600):
+        await loop.async_connect()
+    assert "MQTT connection failed" in caplog.text
+    delay = loop.health.reconnect_delay
+    assert delay is not None
+    assert MQTT_MAX_BACKOFF / 2 <= delay <= MQTT_MAX_BACKOFF
+
+    connect = hass.async_create_task(loop.async_connect(), eager_start=True)
+    # The reconnection is cancelled, and the connection is awaited.
+    await loop.async_stop()
+    await connect
+
+
+def test_backoff(hass: HomeAssistant) -> None:
+    """Test the exponential backoff, and its reset on a connection."""
+    loop = mqtt_loop(hass, mqtt_client([]), 0)
+    delays = []
+    with (
+        patch(
+            "custom_components.oref_alert.asyncio_mqtt.MQTT_INITIAL_BACKOFF",
+            MQTT_INITIAL_BACKOFF,
+        ),
+        patch("custom_components.oref_alert.asyncio_mqtt.async_call_later"),
+        patch("secrets.SystemRandom.uniform", return_value=1),
+    ):
+        for _ in range(10):
+            loop._schedule_reconnect()  # noqa: SLF001
+            delays.append(loop.health.reconnect_delay)
+            loop._unsub_reconnect = None  # noqa: SLF001
+        assert delays == [
+            min(MQTT_INITIAL_BACKOFF * 2**i, MQTT_MAX_BACKOFF) for i in range(10)
+        ]
+        assert loop.connected() is None
+        loop._schedule_reconnect()  # noqa: SLF001
+        assert loop.health.reconnect_delay == MQTT_INITIAL_BACKOFF
+
+
+def test_health(freezer: FrozenDateTimeFactory) -> None:
+    """Test the connected and disconnected intervals."""
+    health = ConnectionHealth()
+    changes = []
+    remove = health.async_add_listener(lambda: changes.append(health.state))
+    assert health.as_dict()["connected_ratio"] is None
+    assert health.as_dict()["disconnections"] == 0
+
+    freezer.tick(timedelta(seconds=10))
+    assert health.connected() is None
+    freezer.tick(timedelta(seconds=30))
+    health.disconnected()
+    # Not connected, so nothing changes.
+    health.disconnected()
+    freezer.tick(timedelta(seconds=20))
+    assert health.connected() == 20
+    freezer.tick(timedelta(seconds=5))
+    health.disconnected()
+    freezer.tick(timedelta(seconds=5))
+    assert health.connected() == 5
+    remove()
+    freezer.tick(timedelta(seconds=30))
+
+    assert changes == [
+        ConnectionState.CONNECTED,
+        ConnectionState.DISCONNECTED,
+        ConnectionState.CONNECTED,
+        ConnectionState.DISCONNECTED,
+        ConnectionState.CONNECTED,
+    ]
+    metrics = health.as_dict()
+    assert metrics["state"] == ConnectionState.CONNECTED
+    assert metrics["connections"] == 3
+    assert metrics["disconnections"] == 2
+    assert metrics["last_gap"] == 5
+    assert metrics["longest_gap"] == 20
+    assert metrics["connected_ratio"] == 0.65
@@ -0,0 +1,347 @@
+"""
+Micro-benchmarks of the hot paths (run with `pytest --slow tests/test_benchmarks.py`).
+
+Each stage is timed (best of a few rounds) on synthetic payloads, and is
+reported with its latency and throughput. Timings are normalized by a fixed
+calibration workload, so the stored baselines are comparable across machines.
+The timings are only reported by default, since they are noisy on shared
+runners (e.g. CI). Set OREF_BENCHMARK_CHECK=1 to fail a stage which is slower
+than its baseline by more than the tolerance, and OREF_BENCHMARK_UPDATE=1 to
+store new baselines.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+from collections import deque
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+import homeassistant.util.dt as dt_util
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.oref_alert.bus_events import OrefAlertBusEventManager
+from custom_components.oref_alert.const import DOMAIN, IST, RecordAndMetadata
+from custom_components.oref_alert.coordinator import (
+    OREF_ALERTS_URL,
+    OREF_HISTORY2_URL,
+    OREF_HISTORY_URL,
+    OrefAlertDataUpdateCoordinator,
+)
+from custom_components.oref_alert.metadata import ALL_AREAS_ALIASES
+from custom_components.oref_alert.metadata.areas import AREAS
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Generator
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.test_util.aiohttp import (
+        AiohttpClientMocker,
+    )
+
+BASELINE_PATH = Path(__file__).parent / "benchmarks_baseline.json"
+TOLERANCE = 2.5
+ROUNDS = 5
+CHECK_BASELINE = os.environ.get("OREF_BENCHMARK_CHECK") == "1"
+UPDATE_BASELINE = os.environ.get("OREF_BENCHMARK_UPDATE") == "1"
+SORTED_AREAS = sorted(AREAS - ALL_AREAS_ALIASES)
+
+pytestmark = pytest.mark.slow
+
+
+def history_payload(count: int, title: str = "ירי רקטות וטילים") -> str:
+    """Return a history payload of alerts in `count` areas (newer first)."""
+    now = dt_util.now(IST)
+    return json.dumps(
+        [
+            {
+                "alertDate": (now - timedelta(seconds=index // 10)).strftime(
+                    "%Y-%m-%d %H:%M:%S"
+                ),
+                "title": title,
+                "data": area,
+                "category": 1,
+            }
+            for index, area in enumerate(SORTED_AREAS[:count])
+        ],
+        ensure_ascii=False,
+    )
+
+
+def all_areas_real_time_payload() -> str:
+    """Return a real-time payload of an alert in all areas."""
+    return json.dumps(
+        {
+            "id": "1",
+            "cat": "1",
+            "title": "ירי רקטות וטילים",
+            "data": ["כל הארץ"],
+            "desc": "היכנסו למרחב המוגן",
+        },
+        ensure_ascii=False,
+    )
+
+
+def push_burst(
+    coordinator: OrefAlertDataUpdateCoordinator, messages: int, areas: int
+) -> list[RecordAndMetadata]:
+    """Return the records of a burst of push messages (random areas each)."""
+    alert_date = dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S")
+    randomizer = random.Random(messages)  # noqa: S311
+    records = []
+    for _ in range(messages):
+        records.extend(
+            coordinator.add_metadata_batch(
+                randomizer.sample(SORTED_AREAS, areas),
+                alert_date,
+                "ירי רקטות וטילים",
+                1,
+                "mobile",
+            )
+        )
+    return records
+
+
+def calibrate() -> float:
+    """Return the duration of a fixed workload (the normalization unit)."""
+    randomizer = random.Random(0)  # noqa: S311
+    items = [randomizer.random() for _ in range(50000)]
+    best = float("inf")
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        sorted(items)
+        json.loads(json.dumps(items))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+class Benchmarks:
+    """Time stages and compare them to the baselines."""
+
+    def __init__(self) -> None:
+        """Initialize the benchmarks."""
+        self.unit = calibrate()
+        self.baselines: dict[str, float] = (
+            json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        )
+        self.results: dict[str, float] = {}
+        self.record_property: Callable[[str, object], None] | None = None
+
+    async def measure(
+        self,
+        stage: str,
+        run: Callable[[], Awaitable[Any]],
+        items: int,
+        setup: Callable[[], Awaitable[Any]] | None = None,
+    ) -> None:
+        """Time the best of a few rounds of a stage."""
+        best = float("inf")
+        for _ in range(ROUNDS):
+            if setup:
+                await setup()
+            start = time.perf_counter()
+            await run()
+            best = min(best, time.perf_counter() - start)
+        relative = best / self.unit
+        self.results[stage] = round(relative, 3)
+        if self.record_property is not None:
+            # Reported in the terminal summary (and in the JUnit XML).
+            self.record_property(
+                "benchmark",
+                f"{stage:<28} {best * 1000:9.3f}ms {items / best:12.0f} items/s"
+                f" {relative:8.3f} units",
+            )
+        if CHECK_BASELINE and (baseline := self.baselines.get(stage)):
+            assert relative <= baseline * TOLERANCE, (
+                f"{stage} regressed: {relative:.3f} units (baseline {baseline:.3f})"
+            )
+
+
+@pytest.fixture(scope="module")
+def module_benchmarks() -> Generator[Benchmarks]:
+    """Provide the benchmarks (and store the baselines when requested)."""
+    benchmarks = Benchmarks()
+    yield benchmarks
+    if UPDATE_BASELINE:
+        BASELINE_PATH.write_text(
+            json.dumps(
+                {**benchmarks.baselines, **benchmarks.results}, indent=2, sort_keys=True
+            )
+            + "\n"
+        )
+
+
+@pytest.fixture
+def benchmarks(
+    module_benchmarks: Benchmarks, record_property: Callable[[str, object], None]
+) -> Benchmarks:
+    """Provide the benchmarks, which record the timings of the test."""
+    module_benchmarks.record_property = record_property
+    return module_benchmarks
+
+
+def create_coordinator(
+    hass: HomeAssistant, channels: list[deque[RecordAndMetadata]] | None = None
+) -> OrefAlertDataUpdateCoordinator:
+    """Create a coordinator."""
+    config = MockConfigEntry(domain=DOMAIN, options={})
+    config.mock_state(hass, ConfigEntryState.SETUP_IN_PROGRESS)
+    coordinator = OrefAlertDataUpdateCoordinator(hass, config, channels or [])
+    coordinator.config_entry = config
+    return coordinator
+
+
+def mock_payloads(
+    aioclient_mock: AiohttpClientMocker, real_time: str = "", history: str = ""
+) -> None:
+    """Mock the endpoints' payloads."""
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, text=real_time)
+    aioclient_mock.get(OREF_HISTORY_URL, text=history)
+    aioclient_mock.get(OREF_HISTORY2_URL, text="")
+
+
+@pytest.mark.parametrize("areas", [100, 1000])
+async def test_history_refresh(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    benchmarks: Benchmarks,
+    areas: int,
+) -> None:
+    """Benchmark a refresh with an N-area history payload."""
+    mock_payloads(aioclient_mock, history=history_payload(areas))
+    coordinators = []
+
+    async def setup() -> None:
+        coordinators.append(create_coordinator(hass))
+
+    async def run() -> None:
+        await coordinators[-1].async_refresh()
+
+    await benchmarks.measure(f"history_refresh_{areas}", run, areas, setup)
+    assert len(coordinators[-1].data.areas) == areas
+    await hass.async_block_till_done()
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+async def test_all_areas_refresh(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    benchmarks: Benchmarks,
+) -> None:
+    """Benchmark a refresh with an all-areas real-time alert."""
+    mock_payloads(aioclient_mock, real_time=all_areas_real_time_payload())
+    coordinators = []
+
+    async def setup() -> None:
+        coordinators.append(create_coordinator(hass))
+
+    async def run() -> None:
+        await coordinators[-1].async_refresh()
+
+    await benchmarks.measure("all_areas_refresh", run, len(AREAS), setup)
+    assert len(coordinators[-1].data.areas) == len(AREAS)
+    await hass.async_block_till_done()
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+
+
+async def test_get_record_and_metadata(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    benchmarks: Benchmarks,
+) -> None:
+    """Benchmark the ordered records queries."""
+    mock_payloads(aioclient_mock, history=history_payload(1000))
+    coordinator = create_coordinator(hass)
+    await coordinator.async_refresh()
+    areas = SORTED_AREAS[:1000:10]
+
+    async def run_all() -> None:
+        for _ in range(10):
+            coordinator.get_record_and_metadata(None, None, None, newer_first=True)
+
+    async def run_areas() -> None:
+        for _ in range(10):
+            coordinator.get_record_and_metadata(areas, None, 10, newer_first=True)
+
+    await benchmarks.measure("ordered_records_all", run_all, 10 * 1000)
+    await benchmarks.measure("ordered_records_areas", run_areas, 10 * len(areas))
+    await hass.async_block_till_done()
+    await coordinator.async_shutdown()
+
+
+async def test_area_records(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    benchmarks: Benchmarks,
+) -> None:
+    """Benchmark the expansion of an all-areas record."""
+    mock_payloads(aioclient_mock)
+    coordinator = create_coordinator(hass)
+    (record,) = coordinator.add_metadata_batch(
+        ["כל הארץ"], dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S"), "", 1, "website"
+    )
+
+    async def run() -> None:
+        list(coordinator._area_records(record))  # noqa: SLF001
+
+    await benchmarks.measure("all_areas_records", run, len(AREAS))
+
+
+async def test_bus_events_update(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    benchmarks: Benchmarks,
+) -> None:
+    """Benchmark firing the events of a refresh."""
+    mock_payloads(aioclient_mock, history=history_payload(1000))
+    coordinator = create_coordinator(hass)
+    await coordinator.async_refresh()
+    bus_events = OrefAlertBusEventManager(
+        hass,
+        SimpleNamespace(  # type: ignore[arg-type]
+            runtime_data=SimpleNamespace(coordinator=coordinator)
+        ),
+    )
+    bus_events._coordinator = coordinator  # noqa: SLF001
+
+    async def setup() -> None:
+        bus_events._revision = None  # noqa: SLF001
+        bus_events._previous_items = bus_events._previous_items.__class__()  # noqa: SLF001
+
+    async def run() -> None:
+        bus_events._async_update()  # noqa: SLF001
+
+    await benchmarks.measure("bus_events_update", run, 1000, setup)
+    await hass.async_block_till_done()
+    await coordinator.async_shutdown()
+
+
+async def test_push_poll_burst(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    benchmarks: Benchmarks,
+) -> None:
+    """Benchmark a burst of push messages, mixed with polling."""
+    mock_payloads(aioclient_mock, history=history_payload(200))
+    channel: deque[RecordAndMetadata] = deque()
+    coordinator = create_coordinator(hass, [channel])
+    await coordinator.async_refresh()
+
+    async def run() -> None:
+        channel.extend(push_burst(coordinator, 50, 20))
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    await benchmarks.measure("push_poll_burst", run, 50 * 20)
+    assert not channel
+    await coordinator.async_shutdown()
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 from homeassistant.const import ATTR_DATE
 from pytest_homeassistant_custom_component.common import (
@@ -316,3 +316,49 @@ async def test_restore_prevents_duplicate_event_for_same_record(
     assert alerts == []
 
     await async_shutdown(hass, config_id)
+
+
+async def test_restore_in_chunks(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the history is restored in the background, newest first."""
+    freezer.move_to("2023-10-07 06:31:00+03:00")
+    mock_urls(aioclient_mock, None, None)
+    config_id = await async_setup(hass)
+    config_entry = hass.config_entries.async_get_entry(config_id)
+    assert config_entry is not None
+    bus_events = config_entry.runtime_data.bus_events
+    bus_events._store.async_load = AsyncMock(  # noqa: SLF001
+        return_value={
+            "records": [
+                {
+                    "alertDate": alert_date,
+                    "title": "ירי רקטות וטילים",
+                    "data": area,
+                    "category": 1,
+                    "channel": "website-history",
+                }
+                for alert_date, area in (
+                    ("2023-10-07 06:00:00", "נחל עוז"),
+                    ("2023-10-07 06:30:00", "בארי"),
+                )
+            ]
+        }
+    )
+
+    with patch("custom_components.oref_alert.bus_events.RESTORE_CHUNK_SIZE", 1):
+        await bus_events.async_restore()
+        # Only the recent records are restored right away.
+        assert len(list(bus_events._previous_items.items())) == 1  # noqa: SLF001
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert [item["area"] for item in bus_events.alert_history.items()] == [
+        "בארי",
+        "נחל עוז",
+    ]
+    assert bus_events.restore_stats["records"] == 2
+    assert "history_seconds" in bus_events.restore_stats
+
+    await async_shutdown(hass, config_id)
@@ -0,0 +1,61 @@
+"""The tests for the circuit_breaker file."""
+
+from unittest.mock import patch
+
+from custom_components.oref_alert.circuit_breaker import CircuitBreaker, CircuitState
+
+
+def test_circuit_breaker() -> None:
+    """Test the state transitions."""
+    breaker = CircuitBreaker(failure_threshold=2, initial_backoff=10, max_backoff=30)
+    assert breaker.allow(0)
+    breaker.record_failure(0)
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow(0)
+    with patch("secrets.SystemRandom.uniform", return_value=1):
+        breaker.record_failure(0)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.as_dict() == {
+        "state": "open",
+        "failures": 2,
+        "backoff": 10,
+        "open_until": 10,
+        "opened": 1,
+    }
+    assert not breaker.allow(9)
+
+    # A single trial is allowed when half-open.
+    assert breaker.allow(10)
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow(10)
+    with patch("secrets.SystemRandom.uniform", return_value=1):
+        breaker.record_failure(10)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.as_dict()["open_until"] == 30
+
+    # The backoff is bounded.
+    assert breaker.allow(30)
+    with patch("secrets.SystemRandom.uniform", return_value=0.5):
+        breaker.record_failure(30)
+    assert breaker.as_dict()["backoff"] == 30
+    assert breaker.as_dict()["open_until"] == 45
+
+    assert breaker.allow(45)
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.allow(45)
+    assert breaker.as_dict()["failures"] == 0
+
+
+def test_release() -> None:
+    """Test a trial which ended without a result allows another trial."""
+    breaker = CircuitBreaker(failure_threshold=1, initial_backoff=10)
+    breaker.release()
+    assert breaker.allow(0)
+    with patch("secrets.SystemRandom.uniform", return_value=1):
+        breaker.record_failure(0)
+    assert breaker.allow(10)
+    assert not breaker.allow(10)
+    breaker.release()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.allow(10)
@@ -1,22 +1,29 @@
 """The tests for the coordinator file."""
 
+import asyncio
 import json
 from collections import deque
-from dataclasses import asdict
+from dataclasses import asdict, replace
 from datetime import timedelta
 from http import HTTPStatus
-from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import homeassistant.util.dt as dt_util
 import pytest
+from aiohttp import ClientError
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.util.location import vincenty
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
     async_fire_time_changed,
+    load_fixture,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMockResponse,
 )
 
+from custom_components.oref_alert.capture import TrafficCapture
 from custom_components.oref_alert.categories import (
     END_ALERT_CATEGORY,
     PRE_ALERT_CATEGORY,
@@ -24,6 +31,7 @@ from custom_components.oref_alert.categories import (
 from custom_components.oref_alert.const import (
     AREA_FIELD,
     ATTR_AREA,
+    ATTR_HOME_DISTANCE,
     CONF_AREA,
     CONF_AREAS,
     CONF_DURATION,
@@ -34,25 +42,42 @@ from custom_components.oref_alert.const import (
     TITLE_FIELD,
     Record,
     RecordAndMetadata,
+    RecordSource,
     RecordType,
 )
 from custom_components.oref_alert.coordinator import (
+    FETCH_GRACE_SECONDS,
     OREF_ALERTS_URL,
+    OREF_ENDPOINTS,
     OREF_HISTORY2_URL,
     OREF_HISTORY_URL,
-    OrefAlertCoordinatorData,
+    REQUEST_RETRIES,
+    REQUEST_TIMEOUT,
     OrefAlertDataUpdateCoordinator,
+    OrefEndpoint,
+    _parse_alert_date,
 )
 from custom_components.oref_alert.metadata import SOME_PARTS_OF_THE_COUNTRY
+from custom_components.oref_alert.metadata.area_info import AREA_INFO
 
 from .utils import load_json_fixture, mock_urls
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
     from freezegun.api import FrozenDateTimeFactory
     from homeassistant.core import HomeAssistant
     from pytest_homeassistant_custom_component.test_util.aiohttp import (
         AiohttpClientMocker,
     )
+    from yarl import URL
+
+
+async def async_iter(items: list[dict[str, Any]]) -> AsyncIterator[dict[str, Any]]:
+    """Iterate the items asynchronously."""
+    for item in items:
+        yield item
 
 
 def create_coordinator(
@@ -99,12 +124,12 @@ async def test_save_and_restore_areas(hass: HomeAssistant) -> None:
         category=1,
         channel="website-history",
     )
-    coordinator._areas = {  # noqa: SLF001
-        "אילת": coordinator.add_metadata(record)
-    }
+    coordinator._areas.update(  # noqa: SLF001
+        {"אילת": coordinator.add_metadata(record)}
+    )
     await coordinator.async_save()
 
-    coordinator._areas = {}  # noqa: SLF001
+    coordinator._areas.clear()  # noqa: SLF001
     await coordinator.async_restore()
 
     restored = coordinator._areas.get("אילת")  # noqa: SLF001
@@ -114,6 +139,60 @@ async def test_save_and_restore_areas(hass: HomeAssistant) -> None:
     assert restored.raw.title == "ירי רקטות וטילים"
 
 
+async def test_journal_replay(hass: HomeAssistant) -> None:
+    """Test the areas changes are replayed from the journal."""
+    coordinator = create_coordinator(hass)
+    await coordinator.async_restore()
+    now = dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S")
+    alert, all_areas = coordinator.add_metadata_batch(
+        ["אילת", "כל הארץ"], now, "ירי רקטות וטילים", 1, "website-history"
+    )
+    coordinator._areas.update(  # noqa: SLF001
+        {
+            "אילת": alert,
+            "בארי": replace(alert, raw=replace(alert.raw, data="בארי")),
+            "נחל עוז": replace(all_areas, area="נחל עוז"),
+        }
+    )
+    coordinator._publish()  # noqa: SLF001
+    del coordinator._areas["בארי"]  # noqa: SLF001
+    coordinator._publish()  # noqa: SLF001
+    coordinator._journal.append([{CONF_AREAS: ["אילות"], "record": {}}])  # noqa: SLF001
+    await hass.async_block_till_done()
+
+    coordinator = create_coordinator(hass)
+    await coordinator.async_restore()
+    assert set(coordinator._areas) == {"אילת", "נחל עוז"}  # noqa: SLF001
+    assert coordinator._areas["אילת"].raw == alert.raw  # noqa: SLF001
+    assert coordinator._areas["נחל עוז"].raw == all_areas.raw  # noqa: SLF001
+    assert coordinator._areas["נחל עוז"].area == "נחל עוז"  # noqa: SLF001
+
+    # The restored areas are not journaled again.
+    with patch.object(coordinator._journal, "append") as append:  # noqa: SLF001
+        await coordinator.async_refresh()
+    append.assert_called_once_with([])
+    assert coordinator.data.changes_since(0) is None
+
+
+async def test_restore_all_areas_snapshot(hass: HomeAssistant) -> None:
+    """Test restoring an "all areas" record from the snapshot."""
+    coordinator = create_coordinator(hass)
+    now = dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S")
+    (all_areas,) = coordinator.add_metadata_batch(
+        ["כל הארץ"], now, "ירי רקטות וטילים", 1, "website-history"
+    )
+    coordinator._areas["נחל עוז"] = replace(all_areas, area="נחל עוז")  # noqa: SLF001
+    coordinator._last_update = dt_util.now()  # noqa: SLF001
+    await coordinator.async_save()
+
+    coordinator = create_coordinator(hass)
+    await coordinator.async_restore()
+    restored = coordinator._areas["נחל עוז"]  # noqa: SLF001
+    assert restored.raw == all_areas.raw
+    assert restored.published_data is not None
+    assert restored.published_data[ATTR_AREA] == "נחל עוז"
+
+
 async def test_get_last_update(hass: HomeAssistant) -> None:
     """Test returning backend update token."""
     coordinator = create_coordinator(hass)
@@ -123,6 +202,43 @@ async def test_get_last_update(hass: HomeAssistant) -> None:
     assert coordinator.get_last_update() == now.isoformat()
 
 
+async def test_revisions(hass: HomeAssistant) -> None:
+    """Test each refresh publishes a new revision with the updated areas."""
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    revision = coordinator.data.revision
+    coordinator.add_synthetic_alert(
+        {CONF_AREA: ["אילת", "בארי"], CONF_DURATION: 40, "category": 4}
+    )
+    await coordinator.async_refresh()
+    assert coordinator.data.revision == revision + 1
+    assert coordinator.data.added == {"אילת", "בארי"}
+    assert coordinator.data.changes_since(revision) == {"אילת", "בארי"}
+    assert coordinator.data.changes_since(revision - 1) is None
+    assert coordinator.data.changes_since(None) is None
+
+    coordinator.add_manual_event_end(["בארי"])
+    await coordinator.async_refresh()
+    assert coordinator.data.revision == revision + 2
+    assert coordinator.data.changes_since(revision + 1) == {"בארי"}
+    assert coordinator.data.changed == {"בארי"}
+
+    areas = coordinator.data.areas
+    record = areas["אילת"]
+    coordinator.add_synthetic_alert(
+        {CONF_AREA: ["אילת"], CONF_DURATION: 60, "category": 4}
+    )
+    assert coordinator.data.areas is areas
+    assert areas["אילת"] is record
+    await coordinator.async_refresh()
+    assert coordinator.data.areas is not areas
+    areas = coordinator.data.areas
+
+    await coordinator.async_refresh()
+    assert coordinator.data.changes_since(revision + 3) == set()
+    assert coordinator.data.areas is areas
+
+
 async def test_process_history_alerts_skips_duplicate_areas(
     hass: HomeAssistant,
 ) -> None:
@@ -144,9 +260,13 @@ async def test_process_history_alerts_skips_duplicate_areas(
         },
     ]
 
-    processed = list(
-        coordinator._process_history_alerts(records, coordinator._history_to_record)  # noqa: SLF001
-    )
+    processed = [
+        record
+        async for record in coordinator._process_history_alerts(  # noqa: SLF001
+            async_iter(records),
+            coordinator._history_to_record,  # noqa: SLF001
+        )
+    ]
 
     assert len(processed) == 1
 
@@ -171,10 +291,23 @@ async def test_all_areas_alias_builds_area_specific_published_data(
         channel=alert["channel"],
     )
     coordinator = create_coordinator(hass, channels=[channel])
-    channel.append(coordinator.add_metadata(record))
 
-    await coordinator.async_config_entry_first_refresh()
+    with patch.object(
+        coordinator,
+        "_build_published_data",
+        wraps=coordinator._build_published_data,  # noqa: SLF001
+    ) as build_published_data:
+        channel.append(coordinator.add_metadata(record))
+        await coordinator.async_config_entry_first_refresh()
+        # Published data is built lazily, only for the areas being read.
+        assert build_published_data.call_count == 0
+        assert coordinator.data.areas["אילת"].published_data
+        assert coordinator.data.areas["אילת"].published_data
+        assert build_published_data.call_count == 1
 
+    assert (
+        coordinator.data.areas["אילת"].raw is coordinator.data.areas["קריית שמונה"].raw
+    )
     assert coordinator.data.areas["קריית שמונה"].raw.data == "כל הארץ"
     assert coordinator.data.areas["קריית שמונה"].published_data
     assert (
@@ -183,6 +316,84 @@ async def test_all_areas_alias_builds_area_specific_published_data(
     assert coordinator.get_areas_status()[("קריית שמונה")][ATTR_AREA] == "קריית שמונה"
 
 
+def test_compact_record(hass: HomeAssistant) -> None:
+    """Test the record's strings are interned and its views are derived."""
+    coordinator = create_coordinator(hass)
+    title, area = "ירי רקטות וטילים", "אילת"
+    records = [
+        coordinator.add_metadata(
+            Record(
+                alertDate="2025-06-13 03:00:00",
+                title=title[:4] + title[4:],
+                data=area[:2] + area[2:],
+                category=1,
+                channel=RecordSource.WEBSITE,
+            )
+        )
+        for _ in range(2)
+    ]
+    assert records[0].raw.title is records[1].raw.title
+    assert records[0].raw.data is records[1].raw.data
+    assert type(records[0].raw.channel) is str
+    assert not hasattr(records[0], "__dict__")
+    assert records[0].time == dt_util.parse_datetime("2025-06-13 03:00:00+03:00")
+    assert records[0].time.tzinfo is IST
+    assert records[0].raw_dict == asdict(records[0].raw)
+
+
+def test_add_metadata_batch(hass: HomeAssistant) -> None:
+    """Test the metadata of an alert's records is calculated once."""
+    coordinator = create_coordinator(hass)
+    assert coordinator.add_metadata_batch([], "2025-06-13 03:00:00", "", 1, "") == []
+    records = coordinator.add_metadata_batch(
+        ["אילת", "בארי"],
+        "2025-06-13 03:00:00",
+        "ירי רקטות וטילים",
+        1,
+        RecordSource.MOBILE,
+    )
+    assert records == [
+        coordinator.add_metadata(
+            Record(
+                alertDate="2025-06-13 03:00:00",
+                title="ירי רקטות וטילים",
+                data=area,
+                category=1,
+                channel=RecordSource.MOBILE,
+            )
+        )
+        for area in ("אילת", "בארי")
+    ]
+    assert records[0].expire is records[1].expire
+    assert records[1].raw_dict[AREA_FIELD] == "בארי"
+    assert records[1].published_data[ATTR_AREA] == "בארי"
+
+
+@pytest.mark.parametrize(
+    "alert_date",
+    [
+        "2025-06-13 03:04:05",
+        "2025-06-13T03:04:05",
+        "2025-06-13T03:04:05.000",
+        "2025-06-13 03:04:05+00:00",
+    ],
+)
+def test_parse_alert_date(alert_date: str) -> None:
+    """Test parsing of records' dates."""
+    _parse_alert_date.cache_clear()
+    expected = dt_util.parse_datetime("2025-06-13 03:04:05+03:00")
+    assert _parse_alert_date(alert_date) == expected
+    assert _parse_alert_date(alert_date).tzinfo is IST
+    assert _parse_alert_date.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("alert_date", ["2025-06-13 03:04:0x", "invalid"])
+def test_parse_invalid_alert_date(alert_date: str) -> None:
+    """Test parsing of invalid records' dates."""
+    with pytest.raises(ValueError):  # noqa: PT011
+        _parse_alert_date(alert_date)
+
+
 async def test_special_backend_area_is_ignored(
     hass: HomeAssistant,
     aioclient_mock: AiohttpClientMocker,
@@ -240,10 +451,12 @@ async def test_save_persists_only_records_newer_than_cutoff(
         category=1,
         channel="website-history",
     )
-    coordinator._areas = {  # noqa: SLF001
-        "אילת": coordinator.add_metadata(fresh_record),
-        "קריית שמונה": coordinator.add_metadata(old_record),
-    }
+    coordinator._areas.update(  # noqa: SLF001
+        {
+            "אילת": coordinator.add_metadata(fresh_record),
+            "קריית שמונה": coordinator.add_metadata(old_record),
+        }
+    )
     await coordinator.async_save()
 
     assert "אילת" in stored[CONF_AREAS]
@@ -270,12 +483,12 @@ async def test_restore_skips_expired_records(hass: HomeAssistant) -> None:
         category=1,
         channel="website-history",
     )
-    coordinator._areas = {  # noqa: SLF001
-        "אילת": coordinator.add_metadata(old_record)
-    }
+    coordinator._areas.update(  # noqa: SLF001
+        {"אילת": coordinator.add_metadata(old_record)}
+    )
     await coordinator.async_save()
 
-    coordinator._areas = {}  # noqa: SLF001
+    coordinator._areas.clear()  # noqa: SLF001
     await coordinator.async_restore()
     assert "אילת" not in coordinator._areas  # noqa: SLF001
 
@@ -349,15 +562,14 @@ async def test_get_record_and_metadata_sorting_filters_and_window(
         )
     )
 
-    coordinator.data = OrefAlertCoordinatorData(
-        MappingProxyType(
-            {
-                area_b.raw.data: area_b,
-                area_a.raw.data: area_a,
-                old_update.raw.data: old_update,
-            }
-        )
+    coordinator._areas.update(  # noqa: SLF001
+        {
+            area_b.raw.data: area_b,
+            area_a.raw.data: area_a,
+            old_update.raw.data: old_update,
+        }
     )
+    coordinator.data = coordinator._publish()  # noqa: SLF001
 
     oldest_first = coordinator.get_record_and_metadata(
         areas=None,
@@ -420,7 +632,28 @@ async def test_updates(
         await coordinator.async_refresh()
         await hass.async_block_till_done(wait_background_tasks=True)
     assert updates == 5
-    assert aioclient_mock.call_count == 15
+    # The history endpoints are fetched in their own (slower) cadence.
+    assert aioclient_mock.call_count == 7
+    await coordinator.async_shutdown()
+
+
+async def test_catch_up(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test that catching up fetches all the endpoints."""
+    coordinator = create_coordinator(hass)
+    await coordinator.async_refresh()
+    endpoints = aioclient_mock.call_count
+    assert endpoints > 1
+    # The history endpoints are not due yet.
+    freezer.tick()
+    await coordinator.async_refresh()
+    assert aioclient_mock.call_count == endpoints + 1
+    freezer.tick()
+    await coordinator.async_catch_up()
+    assert aioclient_mock.call_count == 2 * endpoints + 1
     await coordinator.async_shutdown()
 
 
@@ -466,6 +699,429 @@ async def test_cached_content_on_failure(
     assert coordinator.get_records(None, None, None) == alerts
 
 
+async def test_adaptive_update_interval(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the polling interval follows the activity."""
+    freezer.move_to("2023-10-07 06:30:00+03:00")
+    mock_urls(aioclient_mock, None, None)
+    channel: deque[RecordAndMetadata] = deque()
+    coordinator = create_coordinator(hass, channels=[channel])
+
+    async def refresh() -> timedelta | None:
+        freezer.tick()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        return coordinator.update_interval
+
+    # Quiet: exponential backoff up to the maximum.
+    assert await refresh() == timedelta(seconds=40)
+    assert await refresh() == timedelta(seconds=80)
+    assert await refresh() == timedelta(seconds=80)
+
+    # Active alerts.
+    coordinator.add_synthetic_alert(
+        {CONF_AREA: ["אילת"], CONF_DURATION: 3600, "category": 1}
+    )
+    assert await refresh() == timedelta(seconds=5)
+    assert await refresh() == timedelta(seconds=5)
+
+    # Errors back off even during an incident.
+    mock_urls(aioclient_mock, None, None, exc=Exception("dummy log for testing"))
+    assert await refresh() == timedelta(seconds=20)
+    mock_urls(aioclient_mock, None, None)
+
+    # The alert is no longer recent.
+    freezer.tick(timedelta(minutes=10))
+    assert await refresh() == timedelta(seconds=40)
+
+    # New (non-alert) records restore the default interval.
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, text="")
+    aioclient_mock.get(
+        OREF_HISTORY_URL,
+        text=json.dumps(
+            [
+                {
+                    "alertDate": dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S"),
+                    "title": "ניתן לצאת מהמרחב המוגן",
+                    "data": "אילת",
+                    "category": END_ALERT_CATEGORY,
+                }
+            ]
+        ),
+    )
+    aioclient_mock.get(OREF_HISTORY2_URL, text="")
+    freezer.tick(timedelta(seconds=20))
+    assert await refresh() == timedelta(seconds=20)
+    assert await refresh() == timedelta(seconds=40)
+
+    # Push channels activity.
+    channel.append(
+        coordinator.add_metadata(
+            Record(
+                alertDate="2023-10-07 06:00:00",
+                title="test",
+                data="בארי",
+                category=END_ALERT_CATEGORY,
+                channel="pushy",
+            )
+        )
+    )
+    assert await refresh() == timedelta(seconds=5)
+
+    # Polling can still be disabled.
+    coordinator.update_interval = None
+    assert await refresh() is None
+
+
+async def test_slow_endpoint_is_merged_by_follow_up_refresh(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test a slow history endpoint doesn't delay the real-time endpoint."""
+    release = asyncio.Event()
+
+    async def slow_history(method: str, url: URL, _: Any) -> AiohttpClientMockResponse:
+        await release.wait()
+        return AiohttpClientMockResponse(
+            method,
+            url,
+            text=json.dumps(
+                [
+                    {
+                        "data": "בארי",
+                        "alertDate": dt_util.now(IST).strftime("%Y-%m-%dT%H:%M:%S"),
+                        "category": 1,
+                        "category_desc": "ירי רקטות וטילים",
+                    }
+                ]
+            ),
+        )
+
+    mock_urls(aioclient_mock, None, None)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        OREF_ALERTS_URL, text=load_fixture("single_alert_real_time.json")
+    )
+    aioclient_mock.get(OREF_HISTORY_URL, text="")
+    aioclient_mock.get(OREF_HISTORY2_URL, side_effect=slow_history)
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    assert set(coordinator.data.areas) == {"תל אביב - מרכז העיר"}
+
+    # The slow fetch is still in flight, so it's not started again.
+    coordinator._fetch_times.clear()  # noqa: SLF001
+    coordinator._http_replies.clear()  # noqa: SLF001
+    await coordinator.async_refresh()
+    assert aioclient_mock.call_count == 5
+
+    release.set()
+    await hass.async_block_till_done()
+    assert set(coordinator.data.areas) == {"תל אביב - מרכז העיר", "בארי"}
+    await coordinator.async_shutdown()
+
+
+async def test_unchanged_endpoints_dont_end_the_wait(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test the refresh waits for an endpoint with new content."""
+    release = asyncio.Event()
+
+    async def slow_history(method: str, url: URL, _: Any) -> AiohttpClientMockResponse:
+        await release.wait()
+        return AiohttpClientMockResponse(
+            method,
+            url,
+            text=json.dumps(
+                [
+                    {
+                        "data": "בארי",
+                        "alertDate": dt_util.now(IST).strftime("%Y-%m-%dT%H:%M:%S"),
+                        "category": 1,
+                        "category_desc": "ירי רקטות וטילים",
+                    }
+                ]
+            ),
+        )
+
+    mock_urls(aioclient_mock, None, None)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, status=HTTPStatus.NOT_MODIFIED)
+    aioclient_mock.get(OREF_HISTORY_URL, status=HTTPStatus.NOT_MODIFIED)
+    aioclient_mock.get(OREF_HISTORY2_URL, side_effect=slow_history)
+    coordinator = create_coordinator(hass)
+    # Released after the grace of the unchanged fetches.
+    hass.loop.call_later(FETCH_GRACE_SECONDS * 2, release.set)
+    await coordinator.async_config_entry_first_refresh()
+    assert set(coordinator.data.areas) == {"בארי"}
+    await coordinator.async_shutdown()
+
+
+async def test_first_endpoint_wins(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test a stalled real-time endpoint doesn't delay the history endpoints."""
+    release = asyncio.Event()
+
+    async def slow_real_time(
+        method: str, url: URL, _: Any
+    ) -> AiohttpClientMockResponse:
+        await release.wait()
+        return AiohttpClientMockResponse(
+            method, url, text=load_fixture("single_alert_real_time.json")
+        )
+
+    mock_urls(aioclient_mock, None, None)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, side_effect=slow_real_time)
+    aioclient_mock.get(
+        OREF_HISTORY_URL,
+        text=json.dumps(
+            [
+                {
+                    "data": "בארי",
+                    "alertDate": dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S"),
+                    "category": 1,
+                    "title": "ירי רקטות וטילים",
+                }
+            ]
+        ),
+    )
+    aioclient_mock.get(OREF_HISTORY2_URL, text="")
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    assert set(coordinator.data.areas) == {"בארי"}
+
+    release.set()
+    await hass.async_block_till_done()
+    assert set(coordinator.data.areas) == {"תל אביב - מרכז העיר", "בארי"}
+    await coordinator.async_shutdown()
+
+
+async def test_hedged_request(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test a duplicate request is sent when a request is slower than usual."""
+    calls = []
+    release = asyncio.Event()
+
+    async def stalled_once(method: str, url: URL, _: Any) -> AiohttpClientMockResponse:
+        calls.append(url)
+        if len(calls) == 1:
+            await release.wait()
+        elif len(calls) == 2:
+            release.set()
+            raise ClientError
+        return AiohttpClientMockResponse(
+            method, url, text=load_fixture("single_alert_real_time.json")
+        )
+
+    mock_urls(aioclient_mock, None, None)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, side_effect=stalled_once)
+    aioclient_mock.get(OREF_HISTORY_URL, text="")
+    aioclient_mock.get(OREF_HISTORY2_URL, text="")
+    coordinator = create_coordinator(hass)
+    coordinator._latencies[OREF_ALERTS_URL] = deque([0.01] * 20)  # noqa: SLF001
+    with patch("custom_components.oref_alert.coordinator.HEDGE_MIN_DELAY", 0.01):
+        await coordinator.async_config_entry_first_refresh()
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+    assert set(coordinator.data.areas) == {"תל אביב - מרכז העיר"}
+    assert len(coordinator._latencies[OREF_ALERTS_URL]) == 21  # noqa: SLF001
+
+    # The stalled request is cancelled once the duplicate succeeds.
+    async def stalled_first(method: str, url: URL, _: Any) -> AiohttpClientMockResponse:
+        calls.append(url)
+        if len(calls) == 1:
+            await asyncio.Event().wait()
+        return AiohttpClientMockResponse(method, url, text="")
+
+    calls.clear()
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, side_effect=stalled_first)
+    coordinator._http_replies.clear()  # noqa: SLF001
+    with patch("custom_components.oref_alert.coordinator.HEDGE_MIN_DELAY", 0.01):
+        await coordinator.async_refresh()
+    assert len(calls) == 2
+    await coordinator.async_shutdown()
+
+
+async def test_hedged_request_uses_one_reply(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    tmp_path: Path,
+) -> None:
+    """Test only the used reply of a hedged request updates the state."""
+    calls = []
+    release = asyncio.Event()
+    now = dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S")
+
+    async def both_reply(method: str, url: URL, _: Any) -> AiohttpClientMockResponse:
+        calls.append(url)
+        if first := len(calls) == 1:
+            await release.wait()
+        else:
+            release.set()
+        return AiohttpClientMockResponse(
+            method,
+            url,
+            text=json.dumps(
+                [
+                    {
+                        AREA_FIELD: "בארי" if first else "אילת",
+                        TITLE_FIELD: "ירי רקטות וטילים",
+                        "alertDate": now,
+                        "category": 1,
+                    }
+                ]
+            ),
+        )
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_HISTORY_URL, side_effect=both_reply)
+    coordinator = create_coordinator(hass)
+    coordinator._last_update = dt_util.now()  # noqa: SLF001
+    coordinator._latencies[OREF_HISTORY_URL] = deque([0.01] * 20)  # noqa: SLF001
+    capture = coordinator.capture = TrafficCapture(tmp_path / "capture.jsonl.gz")
+    with patch("custom_components.oref_alert.coordinator.HEDGE_MIN_DELAY", 0.01):
+        records = await coordinator._async_fetch_url(  # noqa: SLF001
+            OREF_HISTORY_URL,
+            coordinator._readers[OREF_HISTORY_URL],  # noqa: SLF001
+        )
+    assert len(calls) == 2
+    (record,) = records
+    seen = coordinator._history_seen[OREF_HISTORY_URL]  # noqa: SLF001
+    assert list(seen) == [record.raw]
+    assert len(capture) == 1
+    await hass.async_block_till_done()
+
+
+def test_endpoint_budget_covers_retries() -> None:
+    """Test that the endpoints' budgets don't cut the retries."""
+    for endpoint in OREF_ENDPOINTS:
+        assert endpoint.timeout > REQUEST_RETRIES * REQUEST_TIMEOUT
+
+
+async def test_endpoint_timeout(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an endpoint fetch is bounded by its timeout."""
+
+    async def hanging(*_: Any) -> AiohttpClientMockResponse:
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    mock_urls(aioclient_mock, None, None)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, side_effect=hanging)
+    aioclient_mock.get(OREF_HISTORY_URL, text="")
+    aioclient_mock.get(OREF_HISTORY2_URL, text="")
+    coordinator = create_coordinator(hass)
+    with patch(
+        "custom_components.oref_alert.coordinator.OREF_ENDPOINTS",
+        (OrefEndpoint(OREF_ALERTS_URL, timedelta(), 0.01),),
+    ):
+        await coordinator.async_config_entry_first_refresh()
+    assert f"Fetching '{OREF_ALERTS_URL}' timed out" in caplog.text
+    assert coordinator.update_interval == timedelta(seconds=40)
+    await coordinator.async_shutdown()
+
+
+async def test_shutdown_cancels_fetches(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test in-flight fetches are cancelled on shutdown."""
+
+    async def hanging(*_: Any) -> AiohttpClientMockResponse:
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    mock_urls(aioclient_mock, None, None)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, text="")
+    aioclient_mock.get(OREF_HISTORY_URL, text="")
+    aioclient_mock.get(OREF_HISTORY2_URL, side_effect=hanging)
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    task = coordinator._fetches[OREF_HISTORY2_URL]  # noqa: SLF001
+    await coordinator.async_shutdown()
+    assert task.cancelled()
+    assert not coordinator._fetches  # noqa: SLF001
+
+
+async def test_circuit_breaker(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failing endpoint is not called until its backoff elapses."""
+    freezer.move_to("2023-10-07 06:30:00+03:00")
+    mock_urls(aioclient_mock, None, None, exc=Exception("dummy log for testing"))
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    assert aioclient_mock.call_count == 7
+    assert coordinator.circuit_breakers[OREF_ALERTS_URL]["state"] == "open"
+
+    aioclient_mock.mock_calls.clear()
+    freezer.tick()
+    await coordinator.async_refresh()
+    assert aioclient_mock.call_count == 0
+    assert f"Skipping '{OREF_ALERTS_URL}' (circuit is open)" in caplog.text
+
+    mock_urls(aioclient_mock, None, None)
+    freezer.tick(5)
+    await coordinator.async_refresh()
+    assert aioclient_mock.call_count == 1
+    assert aioclient_mock.mock_calls[0][1].human_repr() == OREF_ALERTS_URL
+    assert coordinator.circuit_breakers[OREF_ALERTS_URL]["state"] == "closed"
+
+
+async def test_circuit_breaker_cancelled_trial(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a cancelled trial of a half-open circuit allows another trial."""
+
+    async def hanging(*_: Any) -> AiohttpClientMockResponse:
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    freezer.move_to("2023-10-07 06:30:00+03:00")
+    mock_urls(aioclient_mock, None, None, exc=Exception("dummy log for testing"))
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    assert coordinator.circuit_breakers[OREF_ALERTS_URL]["state"] == "open"
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, side_effect=hanging)
+    freezer.tick(5)
+    fetch = hass.async_create_task(
+        coordinator._async_fetch_url(OREF_ALERTS_URL),  # noqa: SLF001
+        eager_start=True,
+    )
+    assert coordinator.circuit_breakers[OREF_ALERTS_URL]["state"] == "half_open"
+    fetch.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await fetch
+
+    mock_urls(aioclient_mock, None, None)
+    freezer.tick(5)
+    await coordinator._async_fetch_url(OREF_ALERTS_URL)  # noqa: SLF001
+    assert coordinator.circuit_breakers[OREF_ALERTS_URL]["state"] == "closed"
+
+
 async def test_request_throttling(
     hass: HomeAssistant,
     aioclient_mock: AiohttpClientMocker,
@@ -482,7 +1138,7 @@ async def test_request_throttling(
 
     for i in range(10):
         await coordinator.async_refresh()
-        assert aioclient_mock.call_count == 3 * (i // 2)
+        assert aioclient_mock.call_count == i // 2
         assert len(coordinator.get_records(None, None, None)) == 1
         freezer.tick(0.7)
         async_fire_time_changed(hass)
@@ -572,7 +1228,9 @@ async def test_not_modified_real_time_does_not_override_history_update(
     )
 
 
-def test_process_history_alerts_skips_duplicate_area(hass: HomeAssistant) -> None:
+async def test_process_history_alerts_skips_duplicate_area(
+    hass: HomeAssistant,
+) -> None:
     """Test duplicate areas in history payload are skipped."""
     coordinator = create_coordinator(hass)
     records = [
@@ -590,12 +1248,13 @@ def test_process_history_alerts_skips_duplicate_area(hass: HomeAssistant) -> Non
         },
     ]
 
-    processed = list(
-        coordinator._process_history_alerts(  # noqa: SLF001
-            records,
+    processed = [
+        record
+        async for record in coordinator._process_history_alerts(  # noqa: SLF001
+            async_iter(records),
             coordinator._history_to_record,  # noqa: SLF001
         )
-    )
+    ]
     assert len(processed) == 1
 
 
@@ -657,6 +1316,94 @@ async def test_json_parsing_error(
     ) in caplog.text
 
 
+async def test_history_json_parsing_error(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test logging for history JSON parsing error."""
+    mock_urls(aioclient_mock, None, None)
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(OREF_ALERTS_URL, text="")
+    aioclient_mock.get(OREF_HISTORY_URL, text="[invalid")
+    aioclient_mock.get(OREF_HISTORY2_URL, text="")
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    assert coordinator.get_records(None, None, None) == []
+    assert (f"JSON parsing failed for '{OREF_HISTORY_URL}': 'invalid'") in caplog.text
+
+
+async def test_history_reading_stops_at_processed_records(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test history records which were already processed are not read again."""
+    freezer.move_to("2023-10-07 06:30:00+03:00")
+
+    def history_record(area: str, alert_date: str) -> dict[str, Any]:
+        return {
+            "alertDate": alert_date,
+            "title": "ירי רקטות וטילים",
+            "data": area,
+            "category": 1,
+        }
+
+    def mock_history(records: list[dict[str, Any]]) -> None:
+        aioclient_mock.clear_requests()
+        aioclient_mock.get(OREF_ALERTS_URL, text="")
+        aioclient_mock.get(OREF_HISTORY_URL, text=json.dumps(records))
+        aioclient_mock.get(OREF_HISTORY2_URL, text="")
+
+    history = [
+        history_record("בארי", "2023-10-07 06:29:00"),
+        history_record("נחל עוז", "2023-10-07 06:00:00"),
+        history_record("אילות", "2023-10-07 05:00:00"),
+    ]
+    mock_history(history)
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    # The initial fetch stops after the first record older than 5 minutes.
+    assert set(coordinator.data.areas) == {"בארי", "נחל עוז"}
+
+    freezer.tick(timedelta(seconds=20))
+    await coordinator.async_refresh()
+    assert set(coordinator.data.areas) == {"בארי", "נחל עוז", "אילות"}
+
+    mock_history(
+        [
+            history_record("אילת", "2023-10-07 06:30:00"),
+            history_record("כיסופים", "2023-10-07 06:25:00"),
+            history_record("בארי", "2023-10-07 06:29:00"),
+            # Published late (older than the latest processed record).
+            history_record("מגן", "2023-10-07 06:20:00"),
+            history_record("נחל עוז", "2023-10-07 06:00:00"),
+            # Older than the overlap, so the reading stops.
+            history_record("זיקים", "2023-10-07 05:30:00"),
+            history[2],
+        ]
+    )
+    freezer.tick(timedelta(seconds=20))
+    with patch.object(
+        coordinator.race, "arrived", wraps=coordinator.race.arrived
+    ) as arrived:
+        await coordinator.async_refresh()
+    assert set(coordinator.data.areas) == {
+        "בארי",
+        "נחל עוז",
+        "אילות",
+        "אילת",
+        "כיסופים",
+        "מגן",
+    }
+    # The records which were already processed are skipped.
+    assert {call.args[0] for call in arrived.call_args_list} == {
+        "אילת",
+        "כיסופים",
+        "מגן",
+    }
+
+
 async def test_synthetic_alert(
     hass: HomeAssistant,
     freezer: FrozenDateTimeFactory,
@@ -703,6 +1450,49 @@ async def test_synthetic_alert(
     await coordinator.async_shutdown()
 
 
+async def test_expiry_timer(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test expired records are published without waiting for a refresh."""
+    coordinator = create_coordinator(hass)
+    await coordinator.async_config_entry_first_refresh()
+    coordinator.update_interval = None
+    updates = []
+    remove_listener = coordinator.async_add_listener(lambda: updates.append(1))
+    coordinator.add_synthetic_alert(
+        {CONF_AREA: ["אילת"], CONF_DURATION: 40, "category": 4}
+    )
+    coordinator.add_synthetic_alert(
+        {CONF_AREA: ["קריית שמונה"], CONF_DURATION: 60, "category": 4}
+    )
+    await coordinator.async_refresh()
+    updates.clear()
+
+    freezer.tick(41)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(updates) == 1
+    assert coordinator.data.areas["אילת"].raw.title == EXPIRED_EVENT_END_TITLE
+    assert coordinator.data.areas["קריית שמונה"].record_type == RecordType.ALERT
+
+    coordinator.add_manual_event_end(["קריית שמונה"])
+    freezer.tick(20)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert len(updates) == 1
+    assert coordinator._unsub_expiry is None  # noqa: SLF001
+
+    coordinator.add_synthetic_alert(
+        {CONF_AREA: ["אילת"], CONF_DURATION: 40, "category": 4}
+    )
+    await coordinator.async_refresh()
+    assert coordinator._unsub_expiry is not None  # noqa: SLF001
+    remove_listener()
+    assert coordinator._unsub_expiry is None  # noqa: SLF001
+    await coordinator.async_shutdown()
+
+
 def test_manual_event_end_skips_non_alert_records(hass: HomeAssistant) -> None:
     """Test manual_event_end updates only ALERT records."""
     coordinator = create_coordinator(hass)
@@ -721,10 +1511,12 @@ def test_manual_event_end_skips_non_alert_records(hass: HomeAssistant) -> None:
         category=1,
         channel="website-history",
     )
-    coordinator._areas = {  # noqa: SLF001
-        pre_alert.data: coordinator.add_metadata(pre_alert),
-        alert.data: coordinator.add_metadata(alert),
-    }
+    coordinator._areas.update(  # noqa: SLF001
+        {
+            pre_alert.data: coordinator.add_metadata(pre_alert),
+            alert.data: coordinator.add_metadata(alert),
+        }
+    )
 
     coordinator.add_manual_event_end([pre_alert.data, alert.data])
 
@@ -886,10 +1678,11 @@ async def test_channels(
     channel.append(
         RecordAndMetadata(
             raw=record,
-            raw_dict=asdict(record),
-            time=dt_util.parse_datetime(
-                alert["alertDate"], raise_on_error=True
-            ).replace(tzinfo=IST),
+            timestamp=int(
+                dt_util.parse_datetime(alert["alertDate"], raise_on_error=True)
+                .replace(tzinfo=IST)
+                .timestamp()
+            ),
             record_type=RecordType.ALERT,
             expire=None,
         )
@@ -931,9 +1724,10 @@ async def test_channels_are_drained_once(
     channel.append(
         RecordAndMetadata(
             raw=record,
-            raw_dict=asdict(record),
-            time=dt_util.parse_datetime(record.alertDate, raise_on_error=True).replace(
-                tzinfo=IST
+            timestamp=int(
+                dt_util.parse_datetime(record.alertDate, raise_on_error=True)
+                .replace(tzinfo=IST)
+                .timestamp()
             ),
             record_type=RecordType.ALERT,
             expire=None,
@@ -949,6 +1743,89 @@ async def test_channels_are_drained_once(
     assert coordinator.get_records(None, None, None) == []
 
 
+async def test_push_refresh_coalescing(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test records pushed within the latency are processed by one refresh."""
+    mock_urls(aioclient_mock, None, None)
+    channel: deque[RecordAndMetadata] = deque()
+    config = MockConfigEntry(domain=DOMAIN, options={})
+    config.mock_state(hass, ConfigEntryState.SETUP_IN_PROGRESS)
+    coordinator = OrefAlertDataUpdateCoordinator(
+        hass, config, [channel], push_latency=0.01
+    )
+    coordinator.config_entry = config
+    await coordinator.async_config_entry_first_refresh()
+    now = dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S")
+    for area in ("אילת", "בארי", "נחל עוז"):
+        channel.extend(
+            coordinator.add_metadata_batch([area], now, "ירי רקטות וטילים", 1, "mobile")
+        )
+        await coordinator.async_push_refresh()
+    assert len(channel) == 3
+
+    with patch.object(
+        coordinator,
+        "_async_update_data",
+        wraps=coordinator._async_update_data,  # noqa: SLF001
+    ) as update:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
+    assert not channel
+    assert set(coordinator.data.areas) == {"אילת", "בארי", "נחל עוז"}
+    # A single push refresh, and the follow up refresh of the polling channels.
+    assert update.call_count == 2
+    await coordinator.async_shutdown()
+
+
+async def test_push_during_push_refresh(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+) -> None:
+    """Test records pushed while a push refresh polls are processed."""
+    mock_urls(aioclient_mock, None, None)
+    channel: deque[RecordAndMetadata] = deque()
+    config = MockConfigEntry(domain=DOMAIN, options={})
+    config.mock_state(hass, ConfigEntryState.SETUP_IN_PROGRESS)
+    coordinator = OrefAlertDataUpdateCoordinator(
+        hass, config, [channel], push_latency=0.01
+    )
+    coordinator.config_entry = config
+    await coordinator.async_config_entry_first_refresh()
+    now = dt_util.now(IST).strftime("%Y-%m-%d %H:%M:%S")
+    records = coordinator.add_metadata_batch(
+        ["אילת"], now, "ירי רקטות וטילים", 1, "mobile"
+    )
+
+    polled = asyncio.Event()
+
+    async def push_while_polling() -> dict[str, Any]:
+        if records:
+            channel.append(records.pop())
+            await coordinator.async_push_refresh()
+            await polled.wait()
+        return {}
+
+    with patch.object(
+        coordinator, "_async_fetch_endpoints", side_effect=push_while_polling
+    ):
+        # The channel is empty (e.g. its records were merged by a polling refresh).
+        await coordinator.async_push_refresh()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_add_executor_job(lambda: None)
+        # The request's cooldown elapses while the push refresh polls.
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+        await hass.async_add_executor_job(lambda: None)
+        polled.set()
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=3))
+        await hass.async_block_till_done()
+    assert not channel
+    assert "אילת" in coordinator.data.areas
+    await coordinator.async_shutdown()
+
+
 @pytest.mark.parametrize(
     ("current_category", "expected_record_type"),
     [
@@ -968,17 +1845,19 @@ async def test_pre_alert_transition_rules(
     mock_urls(aioclient_mock, None, None)
     coordinator = create_coordinator(hass, channels=[deque()])
     area = "בארי"
-    coordinator._areas = {  # noqa: SLF001
-        area: coordinator.add_metadata(
-            Record(
-                alertDate="2025-01-01 10:00:00",
-                title="current",
-                data=area,
-                category=current_category,
-                channel="website-history",
+    coordinator._areas.update(  # noqa: SLF001
+        {
+            area: coordinator.add_metadata(
+                Record(
+                    alertDate="2025-01-01 10:00:00",
+                    title="current",
+                    data=area,
+                    category=current_category,
+                    channel="website-history",
+                )
             )
-        )
-    }
+        }
+    )
     coordinator._channels[0].append(  # noqa: SLF001
         coordinator.add_metadata(
             Record(
@@ -994,3 +1873,35 @@ async def test_pre_alert_transition_rules(
     await coordinator.async_refresh()
 
     assert coordinator.data.areas[area].record_type == expected_record_type
+
+
+def test_home_distance_table_follows_home_location(hass: HomeAssistant) -> None:
+    """Test home distances are precomputed and rebuilt when home moves."""
+    coordinator = create_coordinator(hass)
+    record = Record(
+        alertDate="2025-01-01 12:00:00",
+        title="ירי רקטות וטילים",
+        data="בארי",
+        category=1,
+        channel="website-history",
+    )
+    hass.config.latitude = 32.072
+    hass.config.longitude = 34.879
+
+    with patch(
+        "custom_components.oref_alert.coordinator.vincenty", wraps=vincenty
+    ) as mock_vincenty:
+        metadata = coordinator.add_metadata(record)
+        assert metadata.published_data
+        assert metadata.published_data[ATTR_HOME_DISTANCE] == 80.7
+        assert mock_vincenty.call_count == len(AREA_INFO)
+
+        coordinator.add_metadata(replace(record, data="אילת"))
+        assert mock_vincenty.call_count == len(AREA_INFO)
+
+        hass.config.latitude = 31.42
+        hass.config.longitude = 34.49
+        metadata = coordinator.add_metadata(record)
+        assert metadata.published_data
+        assert metadata.published_data[ATTR_HOME_DISTANCE] < 80.7
+        assert mock_vincenty.call_count == 2 * len(AREA_INFO)
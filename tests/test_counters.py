@@ -0,0 +1,39 @@
+"""The tests for the counters file."""
+
+from custom_components.oref_alert.counters import (
+    FetchCounters,
+    Timing,
+    deep_size,
+    metadata_memory,
+)
+
+
+def test_timing() -> None:
+    """Test the durations' counters."""
+    timing = Timing()
+    assert timing.as_dict() == {"count": 0, "mean": None, "max": 0, "last": 0}
+    timing.add(0.5)
+    timing.add(0.1)
+    assert timing.as_dict() == {"count": 2, "mean": 0.3, "max": 0.5, "last": 0.1}
+
+
+def test_fetch_counters() -> None:
+    """Test the 304 hit rate."""
+    counters = FetchCounters()
+    assert counters.as_dict()["not_modified_rate"] is None
+    counters.outcomes.update(["200", "304", "304", "304", "error", "skipped"])
+    assert counters.as_dict()["not_modified_rate"] == 0.75
+
+
+def test_deep_size() -> None:
+    """Test the memory of nested objects."""
+    shared = "x" * 1000
+    assert deep_size([shared, shared]) < deep_size([shared, "y" * 1000])
+    assert deep_size({"a": (1, {2})}) > deep_size({"a": None})
+
+
+def test_metadata_memory() -> None:
+    """Test the memory of the metadata tables."""
+    memory = metadata_memory()
+    assert memory["areas"] > 0
+    assert memory["area_info"] > memory["areas"]
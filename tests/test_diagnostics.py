@@ -7,6 +7,11 @@ from homeassistant.setup import async_setup_component
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.oref_alert.const import CONF_AREAS, DOMAIN
+from custom_components.oref_alert.coordinator import (
+    OREF_ALERTS_URL,
+    OREF_HISTORY2_URL,
+    OREF_HISTORY_URL,
+)
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -34,7 +39,28 @@ async def test_diagnostics(
         f"/api/diagnostics/config_entry/{config_entry.entry_id}"
     )
     assert diagnostics.status == HTTPStatus.OK
-    assert config == (await diagnostics.json())["data"]
+    data = (await diagnostics.json())["data"]
+    assert data["options"] == config
+    assert data["circuit_breakers"].keys() == {
+        OREF_ALERTS_URL,
+        OREF_HISTORY_URL,
+        OREF_HISTORY2_URL,
+    }
+    assert data["circuit_breakers"][OREF_ALERTS_URL]["state"] == "closed"
+    assert data["restore"]["areas"]["areas"] == 0
+    assert data["restore"]["history"]["records"] == 0
+    assert data["latency"] == {}
+    assert data["race"] == {"races": 0, "open_races": 0, "channels": {}}
+    performance = data["performance"]
+    assert performance["coordinator"]["refresh"]["count"] == 1
+    assert performance["coordinator"]["fetches"][OREF_ALERTS_URL]["outcomes"] == {
+        "200": 1
+    }
+    assert performance["pushy"] == {"messages": 0, "queue": 0}
+    assert performance["tzevaadom"] == {"messages": 0, "queue": 0, "ids": 0}
+    assert performance["pushy_connection"]["state"] == "disconnected"
+    assert performance["bus_events"]["alert_history"] == 0
+    assert performance["metadata_memory"]["area_info"] > 0
 
     assert await hass.config_entries.async_unload(config_entry.entry_id)
     await hass.async_block_till_done()
@@ -113,7 +113,7 @@ async def test_add_remove(
     assert len(hass.states.async_all(Platform.GEO_LOCATION)) == 0
 
     mock_urls(aioclient_mock, None, "multi_alerts_history.json")
-    freezer.tick()
+    freezer.tick(20)  # The history endpoint's cadence.
     async_fire_time_changed(hass)
     await refresh_coordinator(hass, config_id)
     await hass.async_block_till_done(wait_background_tasks=True)
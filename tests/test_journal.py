@@ -0,0 +1,182 @@
+"""The tests for the journal file."""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+from homeassistant.helpers.storage import Store
+
+from custom_components.oref_alert.journal import Journal, journal_path
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+KEY = "oref_alert_test"
+
+
+def create_journal(hass: HomeAssistant, items: list[Any]) -> Journal:
+    """Create a test journal."""
+    return Journal(hass, Store(hass, 1, KEY), lambda: {"items": list(items)})
+
+
+def journal_lines(tmp_path: Path) -> list[Any]:
+    """Return the lines of the journal file."""
+    return [
+        json.loads(line)
+        for line in (tmp_path / f"{KEY}.journal").read_text().splitlines()
+    ]
+
+
+def test_journal_path(hass: HomeAssistant) -> None:
+    """Test the journal is kept in the storage directory."""
+    assert journal_path(hass, KEY) == Path(hass.config.config_dir) / (
+        f".storage/{KEY}.journal"
+    )
+
+
+async def test_append_and_replay(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test entries are appended and replayed after the snapshot."""
+    items: list[Any] = []
+    journal = create_journal(hass, items)
+    assert await journal.async_load() == (None, [])
+    assert journal_lines(tmp_path) == [{"journal": 0}]
+
+    journal.append([1, {"a": "בארי"}])
+    journal.append([])
+    journal.append([3])
+    await hass.async_block_till_done()
+    assert journal_lines(tmp_path) == [{"journal": 0}, 1, {"a": "בארי"}, 3]
+    assert await create_journal(hass, []).async_load() == (
+        None,
+        [1, {"a": "בארי"}, 3],
+    )
+
+    items.extend([1, 2, 3])
+    journal.append([4])
+    await journal.async_compact()
+    await hass.async_block_till_done()
+    assert journal_lines(tmp_path) == [{"journal": 1}]
+    assert await create_journal(hass, []).async_load() == (
+        {"items": [1, 2, 3], "journal": 1},
+        [],
+    )
+
+
+async def test_compaction(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the journal is compacted once it's long enough."""
+    items = [1, 2]
+    journal = create_journal(hass, items)
+    await journal.async_load()
+    with patch("custom_components.oref_alert.journal.JOURNAL_COMPACTION_ENTRIES", 2):
+        journal.append([1])
+        await hass.async_block_till_done()
+        assert journal_lines(tmp_path) == [{"journal": 0}, 1]
+        journal.append([2])
+        await hass.async_block_till_done()
+    assert journal_lines(tmp_path) == [{"journal": 1}]
+    assert await create_journal(hass, []).async_load() == (
+        {"items": [1, 2], "journal": 1},
+        [],
+    )
+
+
+async def test_compaction_during_flush(hass: HomeAssistant) -> None:
+    """Test entries appended while a flush holds the lock are not lost."""
+    items: list[Any] = []
+    journal = create_journal(hass, items)
+    await journal.async_load()
+    started, release = threading.Event(), threading.Event()
+
+    def blocked_append(*_: Any) -> None:
+        started.set()
+        release.wait()
+
+    with patch("custom_components.oref_alert.journal._append", blocked_append):
+        items.append(1)
+        journal.append([1])
+        await hass.async_add_executor_job(started.wait)
+        compact = hass.async_create_task(journal.async_compact())
+        # The compaction waits for the flush.
+        await hass.async_add_executor_job(lambda: None)
+        items.append(2)
+        journal.append([2])
+        release.set()
+        await compact
+        await hass.async_block_till_done()
+    assert await create_journal(hass, []).async_load() == (
+        {"items": [1, 2], "journal": 1},
+        [],
+    )
+
+
+async def test_compaction_during_restore(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the compactions are deferred while the data is restored."""
+    items = [1]
+    journal = create_journal(hass, items)
+    await journal.async_load()
+    restore = hass.loop.create_future()
+    journal.defer_compaction(restore)
+    with patch("custom_components.oref_alert.journal.JOURNAL_COMPACTION_ENTRIES", 1):
+        journal.append([1])
+        await hass.async_block_till_done()
+        assert journal_lines(tmp_path) == [{"journal": 0}, 1]
+        compact = hass.async_create_task(journal.async_compact())
+        await hass.async_add_executor_job(lambda: None)
+        assert not compact.done()
+
+        items.append(2)
+        restore.set_result(None)
+        await compact
+        assert journal_lines(tmp_path) == [{"journal": 1}]
+        # The flushes compact once the data is restored.
+        items.append(3)
+        journal.append([3])
+        await hass.async_block_till_done()
+    assert await create_journal(hass, []).async_load() == (
+        {"items": [1, 2, 3], "journal": 2},
+        [],
+    )
+
+
+async def test_compaction_after_failed_restore(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test a partial restore doesn't replace the snapshot and the journal."""
+    journal = create_journal(hass, [])
+    await journal.async_load()
+    journal.append([1])
+    await hass.async_block_till_done()
+    restore = hass.loop.create_future()
+    restore.cancel()
+    journal.defer_compaction(restore)
+    await journal.async_compact()
+    assert journal_lines(tmp_path) == [{"journal": 0}, 1]
+
+
+async def test_stale_journal(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test a journal which was already compacted is not replayed."""
+    journal = create_journal(hass, [1])
+    await journal.async_load()
+    journal.append([1])
+    await hass.async_block_till_done()
+    await Store(hass, 1, KEY).async_save({"items": [1], "journal": 1})
+    assert await create_journal(hass, []).async_load() == (
+        {"items": [1], "journal": 1},
+        [],
+    )
+    assert journal_lines(tmp_path) == [{"journal": 1}]
+
+
+async def test_partial_journal(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test an interrupted write and a corrupted journal."""
+    path = tmp_path / f"{KEY}.journal"
+    path.write_text('{"journal": 0}\n1\n{"a": \n')
+    assert await create_journal(hass, []).async_load() == (None, [1])
+
+    path.write_text("[1]\n2\n")
+    assert await create_journal(hass, []).async_load() == (None, [])
+    assert journal_lines(tmp_path) == [{"journal": 0}]
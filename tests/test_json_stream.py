@@ -0,0 +1,73 @@
+"""The tests for the json_stream file."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from custom_components.oref_alert.json_stream import (
+    JSONStreamError,
+    async_iter_json_array,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+
+async def chunks_of(content: bytes, size: int) -> AsyncIterator[bytes]:
+    """Split the content into chunks."""
+    for index in range(0, len(content), size):
+        yield content[index : index + size]
+
+
+async def parse(content: bytes, size: int = 1) -> list[Any]:
+    """Parse the content in chunks."""
+    return [item async for item in async_iter_json_array(chunks_of(content, size))]
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+async def test_parse(size: int) -> None:
+    """Test parsing of an array received in chunks."""
+    content = '\ufeff [ {"data": "בארי", "category": 1},\x00\n 12345, "a,]" ] '.encode()
+    assert await parse(content, size) == [
+        {"data": "בארי", "category": 1},
+        12345,
+        "a,]",
+    ]
+
+
+async def test_empty() -> None:
+    """Test empty content and empty array."""
+    assert await parse(b"") == []
+    assert await parse(b" \r\n") == []
+    assert await parse(b"[]") == []
+
+
+async def test_stops_reading() -> None:
+    """Test the chunks are not read after the array or the consumer stop."""
+    read = []
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for chunk in (b"[1,", b"2]", b"garbage"):
+            read.append(chunk)
+            yield chunk
+
+    assert [item async for item in async_iter_json_array(chunks())] == [1, 2]
+    assert read == [b"[1,", b"2]"]
+
+    read.clear()
+    async for item in async_iter_json_array(chunks()):
+        assert item == 1
+        break
+    assert read == [b"[1,"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    [b"invalid", b'{"data": 1}', b"[1, {", b"[1, invalid]", b"[1, 2"],
+)
+async def test_invalid(content: bytes) -> None:
+    """Test invalid content raises an error."""
+    with pytest.raises(JSONStreamError):
+        await parse(content)
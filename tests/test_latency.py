@@ -0,0 +1,152 @@
+"""The tests for the latency file."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from homeassistant.const import Platform
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.oref_alert.const import (
+    CONF_AREAS,
+    DOMAIN,
+    Record,
+    RecordAndMetadata,
+    RecordSource,
+    RecordType,
+)
+from custom_components.oref_alert.latency import (
+    LatencyHistogram,
+    LatencyStage,
+    LatencyTracker,
+)
+
+from .utils import mock_urls
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.test_util.aiohttp import (
+        AiohttpClientMocker,
+    )
+
+LATENCY_ENTITY_ID = f"{Platform.SENSOR}.{DOMAIN}_website_history_latency"
+
+
+def test_histogram() -> None:
+    """Test the histogram's buckets and percentiles."""
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) is None
+    assert histogram.as_dict()["mean"] is None
+    for latency in (-1, 0.3, 0.4, 1.5, 1000):
+        histogram.add(latency)
+    assert histogram.percentile(0.2) == 0.1
+    assert histogram.percentile(0.5) == 0.5
+    assert histogram.percentile(0.8) == 2
+    assert histogram.percentile(1) == 1000
+    summary = histogram.as_dict()
+    assert summary["count"] == 5
+    assert summary["mean"] == 200.44
+    assert summary["max"] == 1000
+    assert summary["buckets"]["le_0.1"] == 1
+    assert summary["buckets"]["le_0.5"] == 2
+    assert summary["buckets"]["le_inf"] == 1
+    assert sum(summary["buckets"].values()) == 5
+
+
+def test_tracker() -> None:
+    """Test the stages' measurements."""
+    tracker = LatencyTracker()
+    record = RecordAndMetadata(
+        raw=Record("כל הארץ", 1, RecordSource.MOBILE, "", ""),
+        timestamp=100,
+        record_type=RecordType.ALERT,
+        expire=None,
+        received=101,
+        processed=102,
+    )
+    tracker.merged("a", record)
+    # The areas of the same record are measured once.
+    tracker.merged("b", record)
+    tracker.notified()
+    tracker.state_written(["c"])
+    tracker.state_written(["b"])
+    tracker.state_written(["a"])
+    latency = tracker.as_dict()[RecordSource.MOBILE]
+    assert latency.keys() == {stage.value for stage in LatencyStage}
+    assert latency[LatencyStage.RECEIVED]["max"] == 1
+    assert latency[LatencyStage.METADATA]["max"] == 2
+    for stage in LatencyStage:
+        assert latency[stage]["count"] == 1
+    assert tracker.histogram(RecordSource.HISTORY, LatencyStage.MERGED).count == 0
+    assert RecordSource.HISTORY not in tracker.as_dict()
+
+
+def test_untimed_channel() -> None:
+    """Test the records of a channel without an alert time are not measured."""
+    tracker = LatencyTracker()
+    tracker.merged(
+        "a",
+        RecordAndMetadata(
+            raw=Record("a", 1, RecordSource.WEBSITE, "", ""),
+            timestamp=100,
+            record_type=RecordType.ALERT,
+            expire=None,
+            received=100,
+            processed=100,
+        ),
+    )
+    tracker.notified()
+    tracker.state_written(["a"])
+    assert tracker.as_dict() == {}
+
+
+async def test_sensor(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the latency sensor of a channel."""
+    freezer.move_to("2023-10-07T06:28:01+0300")
+    er.async_get(hass).async_get_or_create(
+        Platform.SENSOR,
+        DOMAIN,
+        f"{DOMAIN}_website_history_latency",
+        suggested_object_id=f"{DOMAIN}_website_history_latency",
+    )
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, options={CONF_AREAS: ["תל אביב - מרכז העיר"]}
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    state = hass.states.get(LATENCY_ENTITY_ID)
+    assert state is not None
+    assert state.state == "unknown"
+    assert state.attributes[LatencyStage.STATE_WRITTEN]["count"] == 0
+
+    mock_urls(aioclient_mock, None, "history_same_as_real_time.json")
+    # The history is fetched every 20 seconds.
+    freezer.tick(20)
+    await config_entry.runtime_data.coordinator.async_refresh()
+    # The state is updated with the next update.
+    async_fire_time_changed(hass)
+    await config_entry.runtime_data.coordinator.async_refresh()
+    state = hass.states.get(LATENCY_ENTITY_ID)
+    assert state is not None
+    assert state.state == "30"
+    for stage in LatencyStage:
+        assert state.attributes[stage]["count"] == 1
+    assert "buckets" not in state.attributes[LatencyStage.MERGED]
+
+    # Sensors of other channels are disabled by default.
+    entity = er.async_get(hass).async_get(f"{Platform.SENSOR}.{DOMAIN}_mobile_latency")
+    assert entity is not None
+    assert entity.disabled_by == er.RegistryEntryDisabler.INTEGRATION
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -0,0 +1,188 @@
+"""The tests for the profiler file."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import pstats
+from typing import TYPE_CHECKING, Any
+from unittest.mock import patch
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.oref_alert.const import (
+    CONF_AREAS,
+    CONF_DURATION,
+    CONF_ENTRIES,
+    CONF_REFRESHES,
+    CONF_SAVE,
+    DOMAIN,
+    PROFILE_ACTION,
+)
+from custom_components.oref_alert.profiler import RefreshProfiler, profiled
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from homeassistant.core import HomeAssistant
+
+
+def busy() -> int:
+    """Do something to profile."""
+    return sum(range(1000))
+
+
+def test_profiler(tmp_path: Path) -> None:
+    """Test the sections and the report."""
+    profiler = RefreshProfiler(refreshes=2)
+    with profiler.section():
+        busy()
+        # Nested sections keep the profiler enabled.
+        with profiled(profiler):
+            busy()
+        busy()
+    busy()
+    with profiled(None):
+        busy()
+    (entry,) = [
+        entry for entry in profiler.top(1000) if entry["function"].endswith("(busy)")
+    ]
+    assert entry["calls"] == 3
+    assert entry["cumulative_time"] >= entry["total_time"]
+    assert len(profiler.top(1)) == 1
+
+    profiler.refreshed()
+    assert not profiler.done.is_set()
+    profiler.refreshed()
+    assert profiler.done.is_set()
+
+    path = tmp_path / "test.prof"
+    profiler.dump(path)
+    assert pstats.Stats(str(path)).total_calls > 0  # type: ignore[attr-defined]
+
+
+def test_another_profiler() -> None:
+    """Test that the profiler can't run along with another profiler."""
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        with pytest.raises(ValueError, match="Another profiling tool"):
+            RefreshProfiler()
+    finally:
+        other.disable()
+
+
+def test_another_profiler_started() -> None:
+    """Test that the profiling ends when another profiler is started."""
+    profiler = RefreshProfiler()
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        with profiler.section():
+            busy()
+    finally:
+        other.disable()
+    assert profiler.interrupted
+    assert profiler.done.is_set()
+    # The later sections are not profiled.
+    with profiler.section():
+        busy()
+    assert not [
+        entry for entry in profiler.top(1000) if entry["function"].endswith("(busy)")
+    ]
+
+
+async def test_fetches_not_profiled(hass: HomeAssistant) -> None:
+    """Test that the awaited fetches of a refresh are not profiled."""
+    config_entry = MockConfigEntry(domain=DOMAIN, options={CONF_AREAS: []})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    coordinator = config_entry.runtime_data.coordinator
+
+    async def fetch() -> dict[str, Any]:
+        # Another profiler can't be enabled while profiling.
+        other = cProfile.Profile()
+        other.enable()
+        other.disable()
+        return {}
+
+    profile = hass.async_create_task(coordinator.async_profile(60, 1))
+    await asyncio.sleep(0)
+    with patch.object(coordinator, "_async_fetch_endpoints", side_effect=fetch):
+        await coordinator.async_refresh()
+    response = await profile
+    assert response["refreshes"] == 1
+    assert not response["interrupted"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_profile_action(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test the profile action."""
+    hass.config.config_dir = str(tmp_path)
+    config_entry = MockConfigEntry(domain=DOMAIN, options={CONF_AREAS: []})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    coordinator = config_entry.runtime_data.coordinator
+
+    profile = hass.async_create_task(
+        hass.services.async_call(
+            DOMAIN,
+            PROFILE_ACTION,
+            {CONF_REFRESHES: 2, CONF_ENTRIES: 5, CONF_SAVE: True},
+            blocking=True,
+            return_response=True,
+        )
+    )
+    await asyncio.sleep(0)
+    assert coordinator.profiler is not None
+    with pytest.raises(ServiceValidationError) as exc_info:
+        await hass.services.async_call(
+            DOMAIN, PROFILE_ACTION, {}, blocking=True, return_response=True
+        )
+    assert exc_info.value.translation_key == "profile_in_progress"
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    response = await profile
+    assert response is not None
+    assert response["refreshes"] == 2
+    assert len(response["entries"]) == 5  # type: ignore[arg-type]
+    assert str(response["path"]).startswith(str(tmp_path))
+    assert coordinator.profiler is None
+
+    # The profiling ends after the duration (if there are less refreshes).
+    response = await coordinator.async_profile(0.01)
+    assert response["refreshes"] == 0
+    assert "path" not in response
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_profile_action_another_profiler(hass: HomeAssistant) -> None:
+    """Test the profile action when another profiler is active."""
+    config_entry = MockConfigEntry(domain=DOMAIN, options={CONF_AREAS: []})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        with pytest.raises(ServiceValidationError) as exc_info:
+            await hass.services.async_call(
+                DOMAIN,
+                PROFILE_ACTION,
+                {CONF_DURATION: 1},
+                blocking=True,
+                return_response=True,
+            )
+        assert exc_info.value.translation_key == "profiler_active"
+    finally:
+        other.disable()
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
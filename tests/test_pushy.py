@@ -14,6 +14,7 @@ from aiohttp.client_exceptions import (
     ClientError,
 )
 from homeassistant.const import STATE_OFF, STATE_ON, Platform
+from homeassistant.helpers import entity_registry as er
 from paho.mqtt.client import MQTTMessage
 from paho.mqtt.reasoncodes import ReasonCode
 from pytest_homeassistant_custom_component.common import (
@@ -366,9 +367,7 @@ async def test_mqtt_parameters(
         data={"pushy_credentials": DEFAULT_CREDENTIALS},
     )
     mqtt_mock.username_pw_set.assert_called_with("user", "password")
-    mqtt_mock.connect_async.assert_called_with(
-        f"mqtt-{int(time.time())}.ioref.io", 443, 300
-    )
+    mqtt_mock.connect.assert_called_with(f"mqtt-{int(time.time())}.ioref.io", 443, 300)
     mqtt_mock.disconnect.assert_not_called()
     await cleanup_test(hass, config)
     mqtt_mock.disconnect.assert_called()
@@ -397,6 +396,57 @@ async def test_on_connect(
     await cleanup_test(hass, config)
 
 
+async def test_catch_up_after_gap(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockPahoClient,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test catching up on the history after a reconnection."""
+    config = await setup_test(
+        hass,
+        data={"pushy_credentials": DEFAULT_CREDENTIALS},
+    )
+    listener: PushyNotifications = mqtt_mock.user_data_set.call_args.args[0]
+    with patch.object(
+        config.runtime_data.coordinator, "async_catch_up"
+    ) as async_catch_up:
+        listener.on_connect(ReasonCode(2, identifier=0))
+        async_catch_up.assert_not_called()
+        listener.health.disconnected()
+        freezer.tick(timedelta(seconds=10))
+        listener.on_connect(ReasonCode(2, identifier=0))
+        async_catch_up.assert_called_once()
+    assert listener.health.as_dict()["last_gap"] == 10
+    await cleanup_test(hass, config)
+
+
+async def test_connection_sensor(
+    hass: HomeAssistant,
+    mqtt_mock: MqttMockPahoClient,
+) -> None:
+    """Test the connection's health sensor."""
+    unique_id = f"{OREF_ALERT_UNIQUE_ID}_pushy_connection"
+    er.async_get(hass).async_get_or_create(
+        Platform.SENSOR, DOMAIN, unique_id, suggested_object_id=unique_id
+    )
+    config = await setup_test(
+        hass,
+        data={"pushy_credentials": DEFAULT_CREDENTIALS},
+    )
+    entity_id = f"{Platform.SENSOR}.{unique_id}"
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == "disconnected"
+
+    listener: PushyNotifications = mqtt_mock.user_data_set.call_args.args[0]
+    listener.on_connect(ReasonCode(2, identifier=0))
+    state = hass.states.get(entity_id)
+    assert state is not None
+    assert state.state == "connected"
+    assert state.attributes["connections"] == 1
+    await cleanup_test(hass, config)
+
+
 async def test_simple_message(
     hass: HomeAssistant,
     mqtt_mock: MqttMockPahoClient,
@@ -0,0 +1,142 @@
+"""The tests for the race file."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.oref_alert.const import (
+    CHANNELS_RACE_ACTION,
+    CONF_AREAS,
+    DOMAIN,
+    Record,
+    RecordAndMetadata,
+    RecordSource,
+    RecordType,
+)
+from custom_components.oref_alert.race import (
+    RACE_MAX_OPEN,
+    RACE_SETTLE_SECONDS,
+    ChannelRaceTracker,
+)
+
+from .utils import mock_urls
+
+if TYPE_CHECKING:
+    from freezegun.api import FrozenDateTimeFactory
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.test_util.aiohttp import (
+        AiohttpClientMocker,
+    )
+
+WINDOW = 180
+
+
+def record(
+    channel: str, timestamp: int, received: float, category: int = 1
+) -> RecordAndMetadata:
+    """Return a record which was received by a channel."""
+    return RecordAndMetadata(
+        raw=Record("area", category, channel, "", ""),
+        timestamp=timestamp,
+        record_type=RecordType.ALERT,
+        expire=None,
+        received=received,
+    )
+
+
+def test_race(freezer: FrozenDateTimeFactory) -> None:
+    """Test the channels' statistics."""
+    freezer.move_to("2025-06-30T15:00:00+0300")
+    now = int(freezer().timestamp())  # pyright: ignore[reportCallIssue]
+    tracker = ChannelRaceTracker(WINDOW)
+    # First alert: the mobile channel is the first, and the website is 2s later.
+    tracker.arrived("a", record(RecordSource.MOBILE, now, now + 1))
+    tracker.arrived("a", record(RecordSource.WEBSITE, now, now + 3))
+    # A repeated arrival of the same channel is ignored.
+    tracker.arrived("a", record(RecordSource.WEBSITE, now, now + 5))
+    # Another category is another race.
+    tracker.arrived("a", record(RecordSource.WEBSITE, now, now + 1, category=2))
+    # Too late to be in a race.
+    tracker.arrived(
+        "a", record(RecordSource.HISTORY, now, now + RACE_SETTLE_SECONDS + 1)
+    )
+    assert tracker.as_dict() == {"races": 0, "open_races": 2, "channels": {}}
+
+    # A later alert of the same area and category settles the previous race.
+    later = now + WINDOW + 1
+    tracker.arrived("a", record(RecordSource.TZEVAADOM, later, later))
+    stats = tracker.as_dict()
+    assert stats["races"] == 1
+    assert stats["open_races"] == 2
+    assert stats["channels"] == {
+        RecordSource.MOBILE: {
+            "delivered": 1,
+            "first": 1,
+            "first_rate": 1.0,
+            "lag_p50": 0,
+            "lag_p95": 0,
+            "lag_max": 0,
+        },
+        RecordSource.WEBSITE: {
+            "delivered": 1,
+            "first": 0,
+            "first_rate": 0.0,
+            "lag_p50": 2,
+            "lag_p95": 2,
+            "lag_max": 2,
+        },
+    }
+
+    # The open races are settled once they are old.
+    freezer.tick(WINDOW + RACE_SETTLE_SECONDS + 2)
+    stats = tracker.as_dict()
+    assert stats["races"] == 3
+    assert stats["open_races"] == 0
+    assert stats["channels"][RecordSource.WEBSITE]["delivered"] == 2
+    assert stats["channels"][RecordSource.WEBSITE]["first_rate"] == 0.5
+    assert stats["channels"][RecordSource.TZEVAADOM]["first"] == 1
+
+
+def test_race_max_open(freezer: FrozenDateTimeFactory) -> None:
+    """Test that the oldest race is settled when there are too many."""
+    freezer.move_to("2025-06-30T15:00:00+0300")
+    now = int(freezer().timestamp())  # pyright: ignore[reportCallIssue]
+    tracker = ChannelRaceTracker(WINDOW)
+    for area in range(RACE_MAX_OPEN + 1):
+        tracker.arrived(str(area), record(RecordSource.MOBILE, now, now))
+    stats = tracker.as_dict()
+    assert stats["races"] == 1
+    assert stats["open_races"] == RACE_MAX_OPEN
+
+
+async def test_channels_race_action(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the channels_race action."""
+    freezer.move_to("2025-06-30T15:00:00+0300")
+    mock_urls(aioclient_mock, "single_alert_real_time.json", None)
+    config_entry = MockConfigEntry(domain=DOMAIN, options={CONF_AREAS: []})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    freezer.tick(RACE_SETTLE_SECONDS + 1)
+    response = await hass.services.async_call(
+        DOMAIN, CHANNELS_RACE_ACTION, blocking=True, return_response=True
+    )
+    assert response is not None
+    assert response["races"] == 1
+    assert response["channels"][RecordSource.WEBSITE]["first"] == 1  # type: ignore[index]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert (
+        await hass.services.async_call(
+            DOMAIN, CHANNELS_RACE_ACTION, blocking=True, return_response=True
+        )
+        == {}
+    )
@@ -0,0 +1,240 @@
+"""Test the capture of the channels' traffic, and its replay."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest.mock import MagicMock, patch
+
+import homeassistant.util.dt as dt_util
+import pytest
+from aiohttp import ClientSession
+from homeassistant.exceptions import ServiceValidationError
+from paho.mqtt.client import MQTTMessage
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.oref_alert.capture import (
+    BufferedResponse,
+    CaptureChannel,
+    TrafficCapture,
+    load_capture,
+    save_capture,
+)
+from custom_components.oref_alert.const import (
+    CAPTURE_ACTION,
+    CONF_AREAS,
+    CONF_DURATION,
+    DOMAIN,
+    IST,
+)
+from custom_components.oref_alert.pushy import PUSHY_CREDENTIALS_KEY
+
+from .replay import async_replay, replay_server
+from .utils import PUSHY_DEFAULT_CREDENTIALS, load_json_fixture, mock_urls
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+    from homeassistant.core import HomeAssistant
+    from pytest_homeassistant_custom_component.test_util.aiohttp import (
+        AiohttpClientMocker,
+    )
+
+    from custom_components.oref_alert import OrefAlertConfigEntry
+
+DEFAULT_OPTIONS = {CONF_AREAS: ["קריית אונו"]}
+# The tests' WebSocket connections are mocked, except for the replay's.
+WS_CONNECT = ClientSession.ws_connect
+
+
+@pytest.fixture(autouse=True)
+def _mock_mqtt() -> Generator[None]:
+    """Mock the MQTT client (the messages are injected)."""
+    with patch(
+        "custom_components.oref_alert.pushy.MQTTClient", return_value=MagicMock()
+    ):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _no_request_throttling() -> Generator[None]:
+    """Allow back-to-back requests (the replay is accelerated)."""
+    with patch("custom_components.oref_alert.coordinator.REQUEST_THROTTLING", 0):
+        yield
+
+
+async def setup_test(
+    hass: HomeAssistant, data: dict[str, Any] | None = None
+) -> OrefAlertConfigEntry:
+    """Set up the integration."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=data or {PUSHY_CREDENTIALS_KEY: PUSHY_DEFAULT_CREDENTIALS},
+        options=DEFAULT_OPTIONS,
+    )
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    return config_entry  # type: ignore[return-value]
+
+
+async def cleanup_test(hass: HomeAssistant, config_entry: MockConfigEntry) -> None:
+    """Remove the integration."""
+    assert await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def async_wait_for(hass: HomeAssistant, condition: Callable[[], bool]) -> None:
+    """Wait for the network I/O to satisfy a condition."""
+    for _ in range(500):
+        if condition():
+            return
+        await hass.async_add_executor_job(time.sleep, 0.01)
+    pytest.fail("Condition was not satisfied")
+
+
+def files(path: Path, pattern: str) -> list[Path]:
+    """Return the files of a directory which match a pattern."""
+    return list(path.glob(pattern))
+
+
+def mqtt_message() -> MQTTMessage:
+    """Return a Pushy message of a current alert."""
+    payload = load_json_fixture("pushy_alert.json")
+    payload["time"] = dt_util.now(IST).isoformat()
+    message = MQTTMessage()
+    message.payload = json.dumps(payload).encode("utf-8")
+    return message
+
+
+def ws_message() -> dict[str, Any]:
+    """Return a Tzeva Adom message of a current alert."""
+    message = load_json_fixture("single_alert_tzevaadom.json")
+    message["data"]["time"] = int(dt_util.now().timestamp())
+    return message
+
+
+async def test_capture_and_replay(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    hass_storage: dict[str, Any],
+    socket_enabled: None,  # noqa: ARG001
+    tmp_path: Path,
+) -> None:
+    """Test capturing the traffic, and replaying it into a new instance."""
+    hass.config.config_dir = str(tmp_path)
+    mock_urls(aioclient_mock, "single_alert_real_time.json", None)
+    config_entry = await setup_test(hass)
+    response = await hass.services.async_call(
+        DOMAIN,
+        CAPTURE_ACTION,
+        {CONF_DURATION: 10},
+        blocking=True,
+        return_response=True,
+    )
+    assert response is not None
+    path = Path(str(response["path"]))
+    assert path.parent == tmp_path
+
+    coordinator = config_entry.runtime_data.coordinator
+    await coordinator.async_refresh()
+    config_entry.runtime_data.pushy.on_message(mqtt_message())
+    await config_entry.runtime_data.tzevaadom._on_message(ws_message())  # noqa: SLF001
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert coordinator.capture is None
+    areas = set(coordinator.data.areas)
+    assert len(areas) == 4
+    # The Pushy topics are already subscribed (so there is no reload).
+    data = dict(config_entry.data)
+    await cleanup_test(hass, config_entry)
+
+    entries = await hass.async_add_executor_job(load_capture, path)
+    assert Counter(entry["channel"] for entry in entries) == {
+        "http": 1,
+        "mqtt": 1,
+        "ws": 1,
+    }
+    assert [entry["t"] for entry in entries] == sorted(entry["t"] for entry in entries)
+
+    # A new instance, which gets the traffic only from the replay.
+    hass_storage.clear()
+    for journal in await hass.async_add_executor_job(files, tmp_path, "*.journal"):
+        await hass.async_add_executor_job(journal.unlink)
+    mock_urls(aioclient_mock, None, None)
+    with patch.object(ClientSession, "ws_connect", WS_CONNECT):
+        async with replay_server() as server:
+            config_entry = await setup_test(hass, data)
+            await server.async_wait_connected()
+            stats = await async_replay(hass, config_entry, server, entries, speed=100)
+            assert stats["entries"] == len(entries)
+            assert (stats["http"], stats["mqtt"], stats["ws"]) == (1, 1, 1)
+            coordinator = config_entry.runtime_data.coordinator
+
+            def replayed() -> bool:
+                async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+                return set(coordinator.data.areas) == areas
+
+            await async_wait_for(hass, replayed)
+            await cleanup_test(hass, config_entry)
+
+
+async def test_capture_in_progress(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test that a single capture is allowed."""
+    hass.config.config_dir = str(tmp_path)
+    config_entry = await setup_test(hass)
+    await hass.services.async_call(
+        DOMAIN, CAPTURE_ACTION, {}, blocking=True, return_response=True
+    )
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, CAPTURE_ACTION, {}, blocking=True, return_response=True
+        )
+    await config_entry.runtime_data.coordinator.async_refresh()
+    # The capture is saved when the integration is unloaded.
+    await cleanup_test(hass, config_entry)
+    (path,) = await hass.async_add_executor_job(
+        files, tmp_path, "oref_alert_capture_*.jsonl.gz"
+    )
+    entries = await hass.async_add_executor_job(load_capture, path)
+    assert Counter(entry["channel"] for entry in entries) == {"http": 1}
+
+
+def test_capture_version(tmp_path: Path) -> None:
+    """Test that a capture of an unknown version is rejected."""
+    path = tmp_path / "capture.jsonl.gz"
+    save_capture(path, [{"version": 2}])
+    with pytest.raises(ValueError, match="Unsupported capture version: 2"):
+        load_capture(path)
+
+
+async def test_capture_size_limit(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test that the entries beyond the capture's size are dropped."""
+    path = tmp_path / "capture.jsonl.gz"
+    capture = TrafficCapture(path)
+    with patch("custom_components.oref_alert.capture.CAPTURE_MAX_SIZE", 5):
+        capture.record(CaptureChannel.WS, "123")
+        capture.record(CaptureChannel.WS, "456")
+        capture.record(CaptureChannel.WS, "78")
+    assert len(capture) == 2
+    assert capture.dropped == 1
+    await capture.async_save(hass)
+    entries = await hass.async_add_executor_job(load_capture, path)
+    assert [entry["payload"] for entry in entries] == ["123", "78"]
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        assert json.loads(file.readline())["dropped"] == 1
+
+
+async def test_buffered_response() -> None:
+    """Test that a captured response is read again."""
+    response = BufferedResponse(MagicMock(status=200, headers={}), b"[1, 2]")
+    assert await response.read() == b"[1, 2]"
+    assert [chunk async for chunk in response.content.iter_any()] == [b"[1, 2]"]
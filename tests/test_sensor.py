@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict
 from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
@@ -14,6 +13,10 @@ from pytest_homeassistant_custom_component.common import (
     async_fire_time_changed,
 )
 
+from custom_components.oref_alert.area_records import (
+    AreaRecords,
+    AreaRecordsSnapshot,
+)
 from custom_components.oref_alert.const import (
     ADD_SENSOR_ACTION,
     ATTR_ALERT,
@@ -53,6 +56,13 @@ TIME_TO_SHELTER_ENTITY_ID = (
 STATUS_ENTITY_ID = f"{Platform.SENSOR}.{OREF_ALERT_UNIQUE_ID}"
 
 
+def snapshot(areas: dict[str, RecordAndMetadata]) -> AreaRecordsSnapshot:
+    """Return a snapshot of the area records."""
+    records = AreaRecords()
+    records.update(areas)
+    return records.snapshot()
+
+
 async def async_setup(
     hass: HomeAssistant, options: dict[str, Any] | None = None
 ) -> str:
@@ -172,14 +182,13 @@ async def test_time_to_shelter_ignores_newer_alert_while_counting_down(
         )
         return RecordAndMetadata(
             raw=record,
-            raw_dict=asdict(record),
-            time=alert_time,
+            timestamp=int(alert_time.timestamp()),
             record_type=RecordType.ALERT,
             expire=now + timedelta(hours=1),
         )
 
     first_alert = build_record_and_metadata(10)
-    coordinator.data = OrefAlertCoordinatorData({"בארי": first_alert})
+    coordinator.data = OrefAlertCoordinatorData(snapshot({"בארי": first_alert}))
     coordinator.async_update_listeners()
     await hass.async_block_till_done(wait_background_tasks=True)
 
@@ -189,7 +198,7 @@ async def test_time_to_shelter_ignores_newer_alert_while_counting_down(
     assert state.attributes[ATTR_ALERT] == first_alert.raw_dict
 
     newer_alert = build_record_and_metadata(2)
-    coordinator.data = OrefAlertCoordinatorData({"בארי": newer_alert})
+    coordinator.data = OrefAlertCoordinatorData(snapshot({"בארי": newer_alert}))
     coordinator.async_update_listeners()
     await hass.async_block_till_done(wait_background_tasks=True)
 
@@ -258,16 +267,17 @@ async def test_status_state_transition_and_cache(
     )
     pre_alert_metadata = RecordAndMetadata(
         raw=pre_alert_record,
-        raw_dict=asdict(pre_alert_record),
-        time=dt_util.parse_datetime(
-            pre_alert_record.alertDate, raise_on_error=True
-        ).replace(tzinfo=IST),
+        timestamp=int(
+            dt_util.parse_datetime(pre_alert_record.alertDate, raise_on_error=True)
+            .replace(tzinfo=IST)
+            .timestamp()
+        ),
         record_type=RecordType.PRE_ALERT,
         expire=dt_util.parse_datetime(
             "2025-01-01 12:19:30", raise_on_error=True
         ).replace(tzinfo=IST),
     )
-    coordinator.data = OrefAlertCoordinatorData({"בארי": pre_alert_metadata})
+    coordinator.data = OrefAlertCoordinatorData(snapshot({"בארי": pre_alert_metadata}))
     coordinator.async_update_listeners()
     await hass.async_block_till_done(wait_background_tasks=True)
     state = hass.states.get(STATUS_ENTITY_ID)
@@ -290,16 +300,17 @@ async def test_status_state_transition_and_cache(
     )
     alert_metadata = RecordAndMetadata(
         raw=alert_record,
-        raw_dict=asdict(alert_record),
-        time=dt_util.parse_datetime(
-            alert_record.alertDate, raise_on_error=True
-        ).replace(tzinfo=IST),
+        timestamp=int(
+            dt_util.parse_datetime(alert_record.alertDate, raise_on_error=True)
+            .replace(tzinfo=IST)
+            .timestamp()
+        ),
         record_type=RecordType.ALERT,
         expire=dt_util.parse_datetime(
             "2025-01-01 23:59:40", raise_on_error=True
         ).replace(tzinfo=IST),
     )
-    coordinator.data = OrefAlertCoordinatorData({"בארי": alert_metadata})
+    coordinator.data = OrefAlertCoordinatorData(snapshot({"בארי": alert_metadata}))
     coordinator.async_update_listeners()
     await hass.async_block_till_done(wait_background_tasks=True)
     state = hass.states.get(STATUS_ENTITY_ID)
@@ -313,7 +324,7 @@ async def test_status_state_transition_and_cache(
         "title": "",
     }
 
-    coordinator.data = OrefAlertCoordinatorData({})
+    coordinator.data = OrefAlertCoordinatorData(snapshot({}))
     coordinator.async_update_listeners()
     await hass.async_block_till_done(wait_background_tasks=True)
     state = hass.states.get(STATUS_ENTITY_ID)
@@ -342,14 +353,15 @@ async def test_status_state_end_record(
     )
     end_metadata = RecordAndMetadata(
         raw=end_record,
-        raw_dict=asdict(end_record),
-        time=dt_util.parse_datetime(end_record.alertDate, raise_on_error=True).replace(
-            tzinfo=IST
+        timestamp=int(
+            dt_util.parse_datetime(end_record.alertDate, raise_on_error=True)
+            .replace(tzinfo=IST)
+            .timestamp()
         ),
         record_type=RecordType.END,
         expire=None,
     )
-    coordinator.data = OrefAlertCoordinatorData({"בארי": end_metadata})
+    coordinator.data = OrefAlertCoordinatorData(snapshot({"בארי": end_metadata}))
     coordinator.async_update_listeners()
     await hass.async_block_till_done(wait_background_tasks=True)
     state = hass.states.get(STATUS_ENTITY_ID)
@@ -366,6 +378,58 @@ async def test_status_state_end_record(
     await async_shutdown(hass, config_id)
 
 
+async def test_status_skips_unrelated_updates(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test status is written only when its area is updated."""
+    freezer.move_to("2025-01-01 12:00:00+03:00")
+    config_id = await async_setup(hass)
+    config = hass.config_entries.async_get_entry(config_id)
+    assert config is not None
+    coordinator = config.runtime_data.coordinator
+    revision = coordinator.data.revision + 1
+    coordinator.data = OrefAlertCoordinatorData(snapshot({}), revision)
+    coordinator.async_update_listeners()
+
+    alert_record = Record(
+        data="בארי",
+        category=1,
+        channel="website-history",
+        alertDate="2025-01-01 11:59:00",
+        title="",
+    )
+    alert_metadata = RecordAndMetadata(
+        raw=alert_record,
+        timestamp=int(
+            dt_util.parse_datetime(alert_record.alertDate, raise_on_error=True)
+            .replace(tzinfo=IST)
+            .timestamp()
+        ),
+        record_type=RecordType.ALERT,
+        expire=None,
+    )
+    coordinator.data = OrefAlertCoordinatorData(
+        snapshot({"בארי": alert_metadata}), revision + 1, changed=frozenset({"אילת"})
+    )
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    state = hass.states.get(STATUS_ENTITY_ID)
+    assert state is not None
+    assert state.state == "ok"
+
+    coordinator.data = OrefAlertCoordinatorData(
+        snapshot({"בארי": alert_metadata}), revision + 2, changed=frozenset({"בארי"})
+    )
+    coordinator.async_update_listeners()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    state = hass.states.get(STATUS_ENTITY_ID)
+    assert state is not None
+    assert state.state == "alert"
+
+    await async_shutdown(hass, config_id)
+
+
 async def test_status_manual_event_end_clears_alert(
     hass: HomeAssistant,
     aioclient_mock: AiohttpClientMocker,
@@ -420,16 +484,17 @@ async def test_status_state_expired_pre_alert(
     )
     old_metadata = RecordAndMetadata(
         raw=old_pre_alert_record,
-        raw_dict=asdict(old_pre_alert_record),
-        time=dt_util.parse_datetime(
-            old_pre_alert_record.alertDate, raise_on_error=True
-        ).replace(tzinfo=IST),
+        timestamp=int(
+            dt_util.parse_datetime(old_pre_alert_record.alertDate, raise_on_error=True)
+            .replace(tzinfo=IST)
+            .timestamp()
+        ),
         record_type=RecordType.PRE_ALERT,
         expire=dt_util.parse_datetime(
             "2025-01-01 11:50:00", raise_on_error=True
         ).replace(tzinfo=IST),
     )
-    coordinator.data = OrefAlertCoordinatorData({"בארי": old_metadata})
+    coordinator.data = OrefAlertCoordinatorData(snapshot({"בארי": old_metadata}))
     coordinator.async_update_listeners()
     await hass.async_block_till_done(wait_background_tasks=True)
     state = hass.states.get(STATUS_ENTITY_ID)
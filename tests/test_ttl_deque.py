@@ -27,10 +27,12 @@ def test_deque(freezer: FrozenDateTimeFactory) -> None:
     assert changed
     assert changed.timestamp() == (now + 60)
     assert list(deque.items()) == [{2: 2}, {1: 1}]
+    assert len(deque) == 2
     freezer.tick(timedelta(minutes=1))
     assert list(deque.items()) == [{2: 2}]
     freezer.tick(timedelta(minutes=1))
     assert not list(deque.items())
+    assert not len(deque)
 
 
 def test_contains_respects_ttl(freezer: FrozenDateTimeFactory) -> None:
@@ -46,3 +48,15 @@ def test_contains_respects_ttl(freezer: FrozenDateTimeFactory) -> None:
 
     freezer.tick(timedelta(minutes=1))
     assert value not in deque
+
+
+def test_add_older(freezer: FrozenDateTimeFactory) -> None:
+    """Test adding older items."""
+    deque = TTLDeque(2)
+    now = datetime.now().astimezone()
+    deque.add(1)
+    assert deque.add_older(2, now - timedelta(minutes=1))
+    assert not deque.add_older(3, now - timedelta(minutes=2))
+    assert list(deque.items()) == [1, 2]
+    freezer.tick(timedelta(minutes=1))
+    assert list(deque.items()) == [1]
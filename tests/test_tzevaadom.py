@@ -7,12 +7,12 @@ import json
 from asyncio import Event
 from collections import deque
 from contextlib import contextmanager
-from dataclasses import asdict
-from datetime import datetime
+from datetime import datetime, timedelta
 from types import SimpleNamespace
 from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, patch
 
+import homeassistant.util.dt as dt_util
 import pytest
 from aiohttp import WSMessage, WSMsgType
 from homeassistant.const import STATE_OK, Platform
@@ -27,6 +27,7 @@ from custom_components.oref_alert.const import (
     DOMAIN,
     IST,
     OREF_ALERT_UNIQUE_ID,
+    Record,
     RecordAndMetadata,
     RecordType,
 )
@@ -173,6 +174,9 @@ async def test_message(  # noqa: PLR0913, PLR0917
     with mock_ws([WSMessage(type=WSMsgType.TEXT, data=data, extra=None)]) as ws:
         config_entry = await setup_test(hass)
         await ws.messages_processed()
+        # The refresh is postponed to coalesce the pushed records.
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+        await hass.async_block_till_done()
         state = hass.states.get(ENTITY_ID)
         assert state is not None
         assert state.state == expected_state
@@ -252,16 +256,22 @@ async def test_duplicate(hass: HomeAssistant) -> None:
     config = MockConfigEntry(domain=DOMAIN, options=DEFAULT_OPTIONS)
     config.runtime_data = SimpleNamespace(
         coordinator=SimpleNamespace(
-            async_refresh=AsyncMock(),
-            add_metadata=lambda record: RecordAndMetadata(
-                raw=record,
-                raw_dict=asdict(record),
-                record_type=RecordType.ALERT,
-                time=datetime.strptime(record.alertDate, "%Y-%m-%d %H:%M:%S").replace(
-                    tzinfo=IST
-                ),
-                expire=None,
-            ),
+            capture=None,
+            profiler=None,
+            async_push_refresh=AsyncMock(),
+            add_metadata_batch=lambda areas, date, title, category, channel, **_: [
+                RecordAndMetadata(
+                    raw=Record(area, category, channel, date, title),
+                    record_type=RecordType.ALERT,
+                    timestamp=int(
+                        datetime.strptime(date, "%Y-%m-%d %H:%M:%S")
+                        .replace(tzinfo=IST)
+                        .timestamp()
+                    ),
+                    expire=None,
+                )
+                for area in areas
+            ],
         ),
     )
     tzevaadom = TzevaAdomNotifications(hass, config)